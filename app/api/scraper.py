@@ -9,6 +9,10 @@ from app.infrastructure.scraper.scraper_runner import ScraperRunner
 
 router = APIRouter(tags=["scraper"])
 
+# Client e scraper condivisi tra le richieste: connessioni riusate dal trasporto di processo.
+http_client = HttpClient()
+runner = ScraperRunner(http_client, TitleScraper())
+
 
 @router.get("/scrape/title")
 def get_scrape_title(url: str) -> dict:
@@ -16,8 +20,5 @@ def get_scrape_title(url: str) -> dict:
     Endpoint di test: estrae il <title> dalla pagina indicata.
     Query: url (string).
     """
-    http_client = HttpClient()
-    scraper = TitleScraper()
-    runner = ScraperRunner(http_client, scraper)
     title = runner.run(url)
     return {"title": title}
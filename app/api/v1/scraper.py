@@ -1,34 +1,140 @@
-"""Endpoint per scraping multi-fonte: GET /scrape/title con parametro source."""
+"""Endpoint per scraping multi-fonte: GET /scrape/title con parametro source, POST /scrape/batch (NDJSON)."""
 
-from fastapi import APIRouter, HTTPException
+import json
+from collections.abc import AsyncIterator, Iterator
 
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
+
+from app.core.config import get_settings
+from app.infrastructure.scraper.async_http_client import AsyncHttpClient
+from app.infrastructure.scraper.circuit_breaker import CircuitOpenError
+from app.infrastructure.scraper.dedupe import build_seen_set
 from app.infrastructure.scraper.engine import ScraperEngine
+from app.infrastructure.scraper.http_cache import build_http_cache
 from app.infrastructure.scraper.http_client import HttpClient
+from app.infrastructure.scraper.parse_cache import build_parse_cache
+from app.infrastructure.scraper.parser_pool import build_parser_pool
+from app.infrastructure.scraper.pipeline import ScraperPipeline
+from app.infrastructure.scraper.result_store import DEFAULT_PAGE_SIZE, build_result_store
 from app.services.scraper_service import ScraperService
 from app.services.scheduled_scraper_service import ScheduledScraperService
 
 
-http_client = HttpClient()
-engine = ScraperEngine(http_client)
-scraper_service = ScraperService(http_client)
-scheduled_service = ScheduledScraperService(http_client)
+http_client = HttpClient(cache=build_http_cache(get_settings()))
+async_http_client = AsyncHttpClient()
+parse_cache = build_parse_cache(get_settings())
+parser_pool = build_parser_pool(get_settings())
+engine = ScraperEngine(
+    http_client,
+    executor=get_settings().scraper_engine_executor,
+    max_workers=get_settings().scraper_engine_max_workers or None,
+    run_timeout=get_settings().scraper_engine_run_timeout_seconds or None,
+    parser_pool=parser_pool,
+    pipeline=ScraperPipeline(build_seen_set(get_settings())),
+    result_store=build_result_store(get_settings()),
+    stage_workers={
+        "fetch": get_settings().scraper_stage_fetch_workers,
+        "parse": get_settings().scraper_stage_parse_workers,
+        "normalize": get_settings().scraper_stage_normalize_workers,
+        "score": get_settings().scraper_stage_score_workers,
+        "persist": get_settings().scraper_stage_persist_workers,
+    },
+    stage_queue_size=get_settings().scraper_stage_queue_size,
+)
+scraper_service = ScraperService(http_client, async_http_client, parse_cache=parse_cache, parser_pool=parser_pool)
+scheduled_service = ScheduledScraperService(
+    http_client,
+    parse_cache=parse_cache,
+    parser_pool=parser_pool,
+    collector=build_result_store(get_settings(), name="scheduled"),
+)
 
 router = APIRouter(prefix="/scrape", tags=["scraper"])
 
 
+def shutdown() -> None:
+    """Allo shutdown dell'app: job schedulati in corso completati, risultati in memoria degli store scritti su disco."""
+    engine.result_store.close()
+    scheduled_service.close()
+    scheduled_service.collector.close()
+
+
+class BatchScrapeRequest(BaseModel):
+    """Body POST /scrape/batch: lista di url, spider (source) e concorrenza opzionale."""
+
+    urls: list[str] = Field(min_length=1)
+    source: str = "title"
+    concurrency: int | None = Field(default=None, ge=1, le=100)
+
+
+async def _ndjson_lines(results: AsyncIterator[dict]) -> AsyncIterator[str]:
+    """Serializza ogni risultato come una riga JSON (NDJSON)."""
+    async for item in results:
+        yield json.dumps(item, default=str) + "\n"
+
+
 @router.get("/title")
-def get_scrape_title(url: str, source: str = "title") -> dict:
-    """Esegue scraping con lo spider indicato da source (es. title, meta). Spider non trovato -> 404."""
+async def get_scrape_title(url: str, source: str = "title") -> dict:
+    """Esegue scraping (asincrono) con lo spider indicato da source (es. title, meta).
+
+    Spider non trovato -> 404; host con circuito aperto -> 503.
+    """
+    try:
+        return await scraper_service.ascrape(source, url)
+    except ValueError:
+        raise HTTPException(status_code=404, detail="Spider not found")
+    except CircuitOpenError as exc:
+        raise HTTPException(status_code=503, detail=str(exc))
+
+
+@router.post("/batch")
+async def post_scrape_batch(body: BatchScrapeRequest) -> StreamingResponse:
+    """Scraping di più url con concorrenza limitata; ogni risultato è inviato come riga NDJSON appena pronto.
+
+    Spider non trovato -> 404; troppi url -> 422.
+    """
+    settings = get_settings()
+    if len(body.urls) > settings.scraper_batch_max_urls:
+        raise HTTPException(status_code=422, detail=f"Too many urls (max {settings.scraper_batch_max_urls})")
+    concurrency = body.concurrency or settings.scraper_batch_concurrency
     try:
-        return scraper_service.scrape(source, url)
+        results = scraper_service.scrape_many(body.source, body.urls, concurrency)
     except ValueError:
         raise HTTPException(status_code=404, detail="Spider not found")
+    return StreamingResponse(_ndjson_lines(results), media_type="application/x-ndjson")
+
+
+def _result_item(seq: int, data) -> dict:
+    """Risultato con il suo cursore: {"seq", "source", "data"} per i record dell'engine."""
+    return {"seq": seq, **data} if isinstance(data, dict) else {"seq": seq, "data": data}
+
+
+def _result_lines(after: int) -> Iterator[str]:
+    for seq, data in engine.result_store.iter_after(after):
+        yield json.dumps(_result_item(seq, data), default=str) + "\n"
+
 
+@router.get("/results", response_model=None)
+def get_results(
+    after: int = Query(default=0, ge=0),
+    limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1),
+    stream: bool = False,
+) -> dict | StreamingResponse:
+    """Risultati dello scraper (engine.result_store) con seq > after, in ordine, paginati a cursore.
 
-@router.get("/results")
-def get_results() -> list:
-    """Restituisce i risultati accumulati dallo scraper (engine.result_store)."""
-    return engine.result_store.all()
+    Pagina: {"results", "next_after", "last_seq"}; limit ridotto a scraper_results_page_max. Per la pagina
+    successiva passare after=next_after. Con stream=true tutti i risultati dopo after come NDJSON.
+    """
+    if stream:
+        return StreamingResponse(_result_lines(after), media_type="application/x-ndjson")
+    page = engine.result_store.read(after, min(limit, get_settings().scraper_results_page_max))
+    return {
+        "results": [_result_item(seq, data) for seq, data in page],
+        "next_after": page[-1][0] if page else after,
+        "last_seq": engine.result_store.last_seq,
+    }
 
 
 @router.post("/start")
@@ -89,6 +89,16 @@ class RedisCacheClient:
         except Exception:
             pass
 
+    def add(self, key: str, value: str, ttl_seconds: int = DEFAULT_TTL_SECONDS) -> bool | None:
+        """Salva solo se la chiave non esiste (SET NX EX, atomico): True se salvata, False se già presente,
+        None se Redis non è disponibile o in errore."""
+        if not self._enabled or not self._client:
+            return None
+        try:
+            return bool(self._client.set(key, value, ex=ttl_seconds, nx=True))
+        except Exception:
+            return None
+
     def delete(self, key: str) -> None:
         """Rimuove chiave dalla cache. Ignora errori."""
         if not self._enabled or not self._client:
@@ -36,6 +36,47 @@ class Settings(BaseSettings):
     # Rate limiting (per user_id JWT): finestra secondi e max richieste per finestra
     rate_limit_window_seconds: int = 60
     rate_limit_max_requests: int = 60
+    # Cache HTTP scraper (GET condizionali ETag/Last-Modified): none | disk | redis; TTL per entrambi i backend
+    scraper_http_cache_backend: str = "none"
+    scraper_http_cache_dir: str = ".cache/http"
+    scraper_http_cache_ttl_seconds: int = 86400
+    # Numero massimo di voci della cache su disco (oltre: eviction delle più vecchie)
+    scraper_http_cache_max_entries: int = 10000
+    # Batch scraping (POST /scrape/batch): fetch concorrenti e numero massimo di url per richiesta
+    scraper_batch_concurrency: int = 10
+    scraper_batch_max_urls: int = 500
+    # Scraping schedulato: pre-warm DNS/connessioni prima di ogni run (secondi di anticipo)
+    scraper_prewarm_enabled: bool = True
+    scraper_prewarm_lead_seconds: float = 2.0
+    # Cache dei risultati di parse() per corpo invariato (hash del contenuto): none | memory | redis
+    scraper_parse_cache_backend: str = "memory"
+    scraper_parse_cache_max_entries: int = 1024
+    scraper_parse_cache_ttl_seconds: int = 86400
+    # Pool di processi per parse() di pagine grandi (0 = parsing sempre inline nel thread chiamante)
+    scraper_parser_pool_workers: int = 0
+    scraper_parser_pool_inline_threshold_bytes: int = 262144
+    scraper_parser_pool_timeout_seconds: float = 30.0
+    # Dedupe dei record nella pipeline per impronta di contenuto: memory | redis (redis = condiviso tra repliche)
+    scraper_dedupe_backend: str = "memory"
+    scraper_dedupe_max_entries: int = 100000
+    scraper_dedupe_ttl_seconds: int = 86400
+    # Result store (GET /scrape/results): ring in memoria; spill dir vuota = i risultati più vecchi sono scartati
+    scraper_results_capacity: int = 10000
+    scraper_results_spill_dir: str = ""
+    scraper_results_segment_records: int = 10000
+    scraper_results_max_segments: int = 100
+    scraper_results_page_max: int = 1000
+    # ScraperEngine: esecuzione degli spider serial | thread | async | process (0 = nessun limite / timeout)
+    scraper_engine_executor: str = "serial"
+    scraper_engine_max_workers: int = 0
+    scraper_engine_run_timeout_seconds: float = 0.0
+    # ScraperEngine.run_many: pipeline a stadi con code limitate (worker per stage, elementi per coda)
+    scraper_stage_queue_size: int = 64
+    scraper_stage_fetch_workers: int = 8
+    scraper_stage_parse_workers: int = 4
+    scraper_stage_normalize_workers: int = 1
+    scraper_stage_score_workers: int = 2
+    scraper_stage_persist_workers: int = 1
 
 
 @lru_cache
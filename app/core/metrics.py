@@ -1,11 +1,13 @@
 """
-Metriche Prometheus custom: health check (liveness/readiness).
+Metriche Prometheus custom: health check (liveness/readiness), scraper.
 Metriche HTTP (request count, duration) gestite da prometheus-fastapi-instrumentator su /metrics.
 """
 
 from __future__ import annotations
 
-from prometheus_client import Counter
+import threading
+
+from prometheus_client import Counter, Gauge, Histogram
 
 HEALTH_CHECKS_TOTAL = Counter(
     "health_checks_total",
@@ -17,3 +19,334 @@ HEALTH_CHECKS_TOTAL = Counter(
 def record_health_check(check_type: str, status: str) -> None:
     """Registra l'esito di un health check (type=liveness|readiness, status=success|failure)."""
     HEALTH_CHECKS_TOTAL.labels(type=check_type, status=status).inc()
+
+
+# Cardinalità label host: oltre il limite i nuovi host confluiscono in OTHER_HOST_LABEL
+SCRAPER_HOST_LABEL_LIMIT = 100
+OTHER_HOST_LABEL = "other"
+
+
+class HostLabelLimiter:
+    """Mappa host -> label Prometheus: i primi `limit` host distinti tengono il proprio nome, gli altri diventano "other"."""
+
+    def __init__(self, limit: int = SCRAPER_HOST_LABEL_LIMIT) -> None:
+        self.limit = limit
+        self._hosts: set[str] = set()
+        self._lock = threading.Lock()
+
+    def label(self, host: str) -> str:
+        """Label da usare per host (vuoto -> "unknown")."""
+        label = self.own_label(host)
+        return label if label is not None else OTHER_HOST_LABEL
+
+    def own_label(self, host: str) -> str | None:
+        """Come label, ma None oltre il limite: per i gauge, dove "other" sovrascriverebbe valori di host diversi."""
+        host = host or "unknown"
+        if host in self._hosts:
+            return host
+        with self._lock:
+            if host in self._hosts:
+                return host
+            if len(self._hosts) >= self.limit:
+                return None
+            self._hosts.add(host)
+            return host
+
+    def reset(self) -> None:
+        """Dimentica gli host già etichettati (uso test)."""
+        with self._lock:
+            self._hosts.clear()
+
+
+scraper_host_labels = HostLabelLimiter()
+
+
+SCRAPER_HTTP_CACHE_TOTAL = Counter(
+    "scraper_http_cache_total",
+    "Scraper conditional GET cache outcomes (hit=304 revalidated, changed=200 with entry, miss=no entry)",
+    ["result"],
+)
+
+
+def record_http_cache(result: str) -> None:
+    """Registra l'esito della cache HTTP dello scraper (result=hit|changed|miss)."""
+    SCRAPER_HTTP_CACHE_TOTAL.labels(result=result).inc()
+
+
+SCRAPER_CIRCUIT_BREAKER_STATE = Gauge(
+    "scraper_circuit_breaker_state",
+    "Scraper per-host circuit breaker state (0=closed, 1=half_open, 2=open)",
+    ["host"],
+)
+SCRAPER_CIRCUIT_BREAKER_REJECTIONS_TOTAL = Counter(
+    "scraper_circuit_breaker_rejections_total",
+    "Scraper requests rejected without contacting the host (circuit open)",
+    ["host"],
+)
+SCRAPER_RETRY_BUDGET_TOKENS = Gauge(
+    "scraper_retry_budget_tokens",
+    "Retries currently allowed by the global scraper retry budget",
+)
+
+
+def set_circuit_breaker_state(host: str, value: int) -> None:
+    """Aggiorna lo stato del circuit breaker per host (0=closed, 1=half_open, 2=open); host oltre il limite label esclusi."""
+    label = scraper_host_labels.own_label(host)
+    if label is not None:
+        SCRAPER_CIRCUIT_BREAKER_STATE.labels(host=label).set(value)
+
+
+def record_circuit_breaker_rejection(host: str) -> None:
+    """Registra una richiesta rifiutata per circuito aperto."""
+    SCRAPER_CIRCUIT_BREAKER_REJECTIONS_TOTAL.labels(host=scraper_host_labels.label(host)).inc()
+
+
+def set_retry_budget_tokens(tokens: float) -> None:
+    """Aggiorna i token disponibili del retry budget globale."""
+    SCRAPER_RETRY_BUDGET_TOKENS.set(tokens)
+
+
+SCRAPER_SINGLEFLIGHT_TOTAL = Counter(
+    "scraper_singleflight_total",
+    "Scrape calls by singleflight role (leader=executed, shared=joined an in-flight call)",
+    ["result"],
+)
+
+
+def record_singleflight(result: str) -> None:
+    """Registra una chiamata singleflight (result=leader|shared)."""
+    SCRAPER_SINGLEFLIGHT_TOTAL.labels(result=result).inc()
+
+
+SCRAPER_PARSE_CACHE_TOTAL = Counter(
+    "scraper_parse_cache_total",
+    "Scraper parse result cache lookups by content hash (tier=memory|redis on hits, none on misses)",
+    ["result", "tier"],
+)
+SCRAPER_PARSE_CACHE_BYTES_SAVED_TOTAL = Counter(
+    "scraper_parse_cache_bytes_saved_total",
+    "Response body bytes not parsed thanks to parse cache hits",
+)
+
+
+def record_parse_cache(result: str, tier: str, saved_bytes: int = 0) -> None:
+    """Registra un lookup nella cache dei parse (result=hit|miss) e i byte di corpo non riparsati."""
+    SCRAPER_PARSE_CACHE_TOTAL.labels(result=result, tier=tier).inc()
+    if saved_bytes > 0:
+        SCRAPER_PARSE_CACHE_BYTES_SAVED_TOTAL.inc(saved_bytes)
+
+
+SCRAPER_PIPELINE_DEDUPE_TOTAL = Counter(
+    "scraper_pipeline_dedupe_total",
+    "Pipeline dedupe checks by content fingerprint (tier=memory|redis on duplicates, none on new records)",
+    ["result", "tier"],
+)
+SCRAPER_PIPELINE_DEDUPE_ENTRIES = Gauge(
+    "scraper_pipeline_dedupe_entries",
+    "Fingerprints held in the in-memory pipeline dedupe set",
+)
+
+
+def record_pipeline_dedupe(result: str, tier: str) -> None:
+    """Registra un controllo di dedupe nella pipeline (result=new|duplicate)."""
+    SCRAPER_PIPELINE_DEDUPE_TOTAL.labels(result=result, tier=tier).inc()
+
+
+def set_pipeline_dedupe_entries(entries: int) -> None:
+    """Aggiorna il numero di impronte nell'insieme di dedupe in memoria."""
+    SCRAPER_PIPELINE_DEDUPE_ENTRIES.set(entries)
+
+
+SCRAPER_RESULT_STORE_EVICTED_TOTAL = Counter(
+    "scraper_result_store_evicted_total",
+    "Results moved out of the in-memory result ring (outcome=spilled to disk segments | dropped)",
+    ["store", "outcome"],
+)
+
+
+def record_result_store_eviction(store: str, outcome: str) -> None:
+    """Registra un risultato uscito dal ring in memoria del result store (outcome=spilled|dropped)."""
+    SCRAPER_RESULT_STORE_EVICTED_TOTAL.labels(store=store, outcome=outcome).inc()
+
+
+SCRAPER_PARSER_POOL_TASKS_TOTAL = Counter(
+    "scraper_parser_pool_tasks_total",
+    "Spider parse() calls by execution mode (inline=below size threshold, process=offloaded to a worker)",
+    ["mode"],
+)
+SCRAPER_PARSER_POOL_QUEUE_DEPTH = Gauge(
+    "scraper_parser_pool_queue_depth",
+    "Parse tasks submitted to the worker pool and not yet completed",
+)
+SCRAPER_PARSER_POOL_SECONDS = Histogram(
+    "scraper_parser_pool_seconds",
+    "parse() time measured inside each pool worker (worker=pid)",
+    ["worker"],
+)
+
+
+def record_parser_pool_task(mode: str) -> None:
+    """Registra una chiamata a parse() tramite ParserPool (mode=inline|process)."""
+    SCRAPER_PARSER_POOL_TASKS_TOTAL.labels(mode=mode).inc()
+
+
+def set_parser_pool_queue_depth(depth: int) -> None:
+    """Aggiorna i task in coda/in corso nel pool di parsing."""
+    SCRAPER_PARSER_POOL_QUEUE_DEPTH.set(depth)
+
+
+def observe_parser_pool_seconds(worker: int, seconds: float) -> None:
+    """Osserva la durata di un parse() eseguito nel worker indicato (pid)."""
+    SCRAPER_PARSER_POOL_SECONDS.labels(worker=str(worker)).observe(seconds)
+
+
+SCRAPER_ENGINE_RUN_FETCHES = Histogram(
+    "scraper_engine_run_fetches",
+    "HTTP fetches issued per ScraperEngine.run (1 shared fetch + one per opted-out spider)",
+    buckets=(0, 1, 2, 3, 5, 10, 20),
+)
+SCRAPER_ENGINE_FETCHES_SAVED_TOTAL = Counter(
+    "scraper_engine_fetches_saved_total",
+    "Spider fetches avoided by handing the shared response body to several spiders",
+)
+
+
+SCRAPER_ENGINE_SPIDER_ERRORS_TOTAL = Counter(
+    "scraper_engine_spider_errors_total",
+    "Spiders excluded from a concurrent ScraperEngine run (reason=error|timeout)",
+    ["spider", "reason"],
+)
+
+
+def record_engine_spider_error(spider: str, reason: str) -> None:
+    """Registra uno spider escluso da un run concorrente dell'engine (reason=error|timeout)."""
+    SCRAPER_ENGINE_SPIDER_ERRORS_TOTAL.labels(spider=spider, reason=reason).inc()
+
+
+def observe_engine_run_fetches(fetches: int, saved: int) -> None:
+    """Osserva le fetch di un run dell'engine e somma quelle evitate grazie al corpo condiviso."""
+    SCRAPER_ENGINE_RUN_FETCHES.observe(fetches)
+    if saved > 0:
+        SCRAPER_ENGINE_FETCHES_SAVED_TOTAL.inc(saved)
+
+
+SCRAPER_STAGE_ITEMS_TOTAL = Counter(
+    "scraper_stage_items_total",
+    "Items processed by each staged pipeline stage (outcome=ok|dropped|error); rate() = stage throughput",
+    ["stage", "outcome"],
+)
+SCRAPER_STAGE_QUEUE_DEPTH = Gauge(
+    "scraper_stage_queue_depth",
+    "Items waiting in the bounded input queue of each staged pipeline stage",
+    ["stage"],
+)
+SCRAPER_STAGE_SECONDS = Histogram(
+    "scraper_stage_seconds",
+    "Time spent by a stage worker on one item (queue wait excluded)",
+    ["stage"],
+)
+
+
+def record_stage_item(stage: str, outcome: str, seconds: float) -> None:
+    """Registra un elemento elaborato da uno stage della pipeline a stadi e il tempo di elaborazione."""
+    SCRAPER_STAGE_ITEMS_TOTAL.labels(stage=stage, outcome=outcome).inc()
+    SCRAPER_STAGE_SECONDS.labels(stage=stage).observe(seconds)
+
+
+def set_stage_queue_depth(stage: str, depth: int) -> None:
+    """Aggiorna il numero di elementi in attesa nella coda di ingresso dello stage."""
+    SCRAPER_STAGE_QUEUE_DEPTH.labels(stage=stage).set(depth)
+
+
+SCRAPER_DNS_CACHE_TOTAL = Counter(
+    "scraper_dns_cache_total",
+    "Scraper DNS cache lookups",
+    ["result"],
+)
+SCRAPER_DNS_RESOLVE_SECONDS = Histogram(
+    "scraper_dns_resolve_seconds",
+    "Time spent resolving hostnames (cache misses only)",
+)
+SCRAPER_CONNECT_SECONDS = Histogram(
+    "scraper_connect_seconds",
+    "Time spent opening new TCP connections for the scraper (DNS excluded)",
+)
+
+
+def record_dns_cache(result: str) -> None:
+    """Registra un lookup nella cache DNS (result=hit|miss)."""
+    SCRAPER_DNS_CACHE_TOTAL.labels(result=result).inc()
+
+
+def observe_dns_resolve_seconds(seconds: float) -> None:
+    """Osserva la latenza di una risoluzione DNS reale."""
+    SCRAPER_DNS_RESOLVE_SECONDS.observe(seconds)
+
+
+def observe_connect_seconds(seconds: float) -> None:
+    """Osserva la latenza di apertura di una nuova connessione."""
+    SCRAPER_CONNECT_SECONDS.observe(seconds)
+
+
+SCRAPER_FETCH_SECONDS = Histogram(
+    "scraper_fetch_seconds",
+    "Scraper fetch latency per host, end to end (retries, sleeps and body read included)",
+    ["host"],
+)
+SCRAPER_TTFB_SECONDS = Histogram(
+    "scraper_ttfb_seconds",
+    "Scraper time to first byte per attempt (request sent -> response headers received)",
+    ["host"],
+)
+SCRAPER_RESPONSE_BYTES = Histogram(
+    "scraper_response_bytes",
+    "Scraper response body bytes read per fetch",
+    ["host"],
+    buckets=(1024, 8192, 32768, 131072, 524288, 2097152, 10485760),
+)
+SCRAPER_RESPONSES_TOTAL = Counter(
+    "scraper_responses_total",
+    "Scraper HTTP attempts by status code (error=transport failure, no response)",
+    ["host", "status"],
+)
+SCRAPER_RETRIES_TOTAL = Counter(
+    "scraper_retries_total",
+    "Scraper retry attempts (reason=status|transport)",
+    ["host", "reason"],
+)
+SCRAPER_SLEEP_SECONDS_TOTAL = Counter(
+    "scraper_sleep_seconds_total",
+    "Total time the scraper spent sleeping before requests (kind=politeness|backoff)",
+    ["host", "kind"],
+)
+
+
+def observe_fetch_seconds(host: str, seconds: float) -> None:
+    """Osserva la durata complessiva di una fetch verso host."""
+    SCRAPER_FETCH_SECONDS.labels(host=scraper_host_labels.label(host)).observe(seconds)
+
+
+def observe_ttfb_seconds(host: str, seconds: float) -> None:
+    """Osserva il time to first byte di un singolo tentativo."""
+    SCRAPER_TTFB_SECONDS.labels(host=scraper_host_labels.label(host)).observe(seconds)
+
+
+def observe_response_bytes(host: str, size: int) -> None:
+    """Osserva i byte di corpo letti da una risposta."""
+    SCRAPER_RESPONSE_BYTES.labels(host=scraper_host_labels.label(host)).observe(size)
+
+
+def record_response_status(host: str, status: int | str) -> None:
+    """Registra l'esito di un tentativo (status HTTP o "error")."""
+    SCRAPER_RESPONSES_TOTAL.labels(host=scraper_host_labels.label(host), status=str(status)).inc()
+
+
+def record_retry(host: str, reason: str) -> None:
+    """Registra un retry (reason=status|transport)."""
+    SCRAPER_RETRIES_TOTAL.labels(host=scraper_host_labels.label(host), reason=reason).inc()
+
+
+def record_sleep_seconds(host: str, kind: str, seconds: float) -> None:
+    """Somma il tempo di attesa (kind=politeness|backoff) prima di una richiesta."""
+    if seconds > 0:
+        SCRAPER_SLEEP_SECONDS_TOTAL.labels(host=scraper_host_labels.label(host), kind=kind).inc(seconds)
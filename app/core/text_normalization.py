@@ -0,0 +1,64 @@
+"""Normalizzazione del testo delle inserzioni (copy): pipeline precompilata condivisa da spider e intelligence.
+
+I tre passaggi storici (spazi, sequenze di 3+ emoji -> spazio, di nuovo spazi) diventano una sola regex
+precompilata per le sequenze lunghe di emoji (senza callback Python) seguita da split/join in C, che
+collassa spazi e trim in un colpo. Prima si applica Unicode NFC (saltata se il testo è già NFC); la vista
+minuscola è calcolata una volta e riusata da chi confronta parole chiave. normalize_many normalizza una
+volta i copy ripetuti nel batch.
+"""
+
+import re
+import unicodedata
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+# Emoji: blocchi Unicode comuni (emoji eccessive da ridurre)
+EMOJI_RANGES = (
+    "\U0001F300-\U0001F9FF\U0001F600-\U0001F64F\U0001F680-\U0001F6FF\U0001F1E0-\U0001F1FF"
+    "\U00002600-\U000026FF\U00002700-\U000027BF"
+)
+# Sequenze fino a questa lunghezza restano nel testo (1–2 emoji), quelle più lunghe diventano uno spazio
+MAX_KEPT_EMOJI_RUN = 2
+_LONG_EMOJI_RUN = re.compile(f"[{EMOJI_RANGES}]{{{MAX_KEPT_EMOJI_RUN + 1},}}")
+
+
+@dataclass(frozen=True, slots=True)
+class NormalizedText:
+    """Testo normalizzato e relativa vista minuscola (per il matching di parole chiave)."""
+
+    text: str
+    lower: str
+
+
+EMPTY = NormalizedText(text="", lower="")
+
+
+def normalize_text(text: str | None) -> str:
+    """NFC, spazi e sequenze di 3+ emoji ridotti a un solo spazio, trim. Non stringa o vuoto -> ""."""
+    if not text or not isinstance(text, str):
+        return ""
+    if not unicodedata.is_normalized("NFC", text):
+        text = unicodedata.normalize("NFC", text)
+    return " ".join(_LONG_EMOJI_RUN.sub(" ", text).split())
+
+
+def normalize_copy(text: str | None) -> NormalizedText:
+    """Come normalize_text, con la vista minuscola."""
+    normalized = normalize_text(text)
+    return NormalizedText(text=normalized, lower=normalized.lower()) if normalized else EMPTY
+
+
+def normalize_many(texts: Iterable[str | None]) -> list[NormalizedText]:
+    """normalize_copy per un batch (stesso ordine); i testi ripetuti nel batch sono normalizzati una volta."""
+    seen: dict[str, NormalizedText] = {}
+    results: list[NormalizedText] = []
+    append = results.append
+    for text in texts:
+        if not text or not isinstance(text, str):
+            append(EMPTY)
+            continue
+        normalized = seen.get(text)
+        if normalized is None:
+            normalized = seen[text] = normalize_copy(text)
+        append(normalized)
+    return results
@@ -1,8 +1,13 @@
-"""HTTP client per scraping – richieste GET con timeout e User-Agent."""
+"""HTTP client per scraping – richieste GET con timeout e User-Agent.
+
+Usa il trasporto condiviso dello scraper (TransportRegistry): stesse connessioni keep-alive
+di app.infrastructure.scraper.http_client.HttpClient, senza retry né anti-fingerprinting.
+"""
 
-import requests
 from requests.exceptions import RequestException, Timeout, ConnectionError as RequestsConnectionError
 
+from app.infrastructure.scraper.transport import TransportRegistry, default_transport
+
 
 DEFAULT_TIMEOUT = 10
 DEFAULT_USER_AGENT = "SpyAdsPro-Web/1.0 (scraper)"
@@ -11,10 +16,16 @@ DEFAULT_USER_AGENT = "SpyAdsPro-Web/1.0 (scraper)"
 class HttpClient:
     """Client HTTP base per fetching di pagine (es. scraping)."""
 
-    def __init__(self, timeout: int = DEFAULT_TIMEOUT, user_agent: str | None = None) -> None:
+    def __init__(
+        self,
+        timeout: int = DEFAULT_TIMEOUT,
+        user_agent: str | None = None,
+        transport: TransportRegistry | None = None,
+    ) -> None:
         self.timeout = timeout
         self.user_agent = user_agent or DEFAULT_USER_AGENT
         self._headers = {"User-Agent": self.user_agent}
+        self._session = (transport if transport is not None else default_transport).new_session()
 
     def get(self, url: str) -> str:
         """
@@ -25,7 +36,7 @@ class HttpClient:
         :raises requests.exceptions.RequestException: In caso di errore di rete, timeout o HTTP 4xx/5xx.
         """
         try:
-            response = requests.get(
+            response = self._session.get(
                 url,
                 headers=self._headers,
                 timeout=self.timeout,
@@ -3,17 +3,42 @@
 import threading
 import time
 
+from app.core.logging import get_logger
+
+LOG = get_logger("app")
+
+DEFAULT_WARMUP_LEAD_SECONDS = 2.0
+
 
 class SimpleScheduler:
     """Esegue un job periodicamente in un thread separato."""
 
-    def start(self, interval_seconds: int, job) -> None:
-        """Avvia un thread separato che esegue job() ogni interval_seconds secondi."""
+    def start(
+        self,
+        interval_seconds: int,
+        job,
+        warmup=None,
+        warmup_lead_seconds: float = DEFAULT_WARMUP_LEAD_SECONDS,
+    ) -> None:
+        """Avvia un thread separato che esegue job() ogni interval_seconds secondi.
+
+        warmup opzionale: eseguito warmup_lead_seconds prima di ogni esecuzione successiva del job
+        (es. DNS e connessioni pronte); un suo errore viene loggato e non blocca il job.
+        """
 
         def run_loop() -> None:
             while True:
                 job()
-                time.sleep(interval_seconds)
+                if warmup is None:
+                    time.sleep(interval_seconds)
+                    continue
+                lead = min(warmup_lead_seconds, interval_seconds)
+                time.sleep(interval_seconds - lead)
+                try:
+                    warmup()
+                except Exception as exc:
+                    LOG.warning("Scheduler warmup failed: %s", exc)
+                time.sleep(lead)
 
         thread = threading.Thread(target=run_loop, daemon=True)
         thread.start()
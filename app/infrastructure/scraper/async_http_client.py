@@ -0,0 +1,211 @@
+"""HTTP client asincrono (httpx): stesso contratto di HttpClient, senza bloccare l'event loop.
+
+Retry su 403/429/5xx con exponential backoff + jitter, rotazione User-Agent per richiesta,
+distanziamento per-host tramite HostPoliteness (attese non bloccanti).
+Pensato per endpoint `async def` e per molte fetch concorrenti sullo stesso event loop.
+"""
+
+import asyncio
+import random
+import time
+from collections.abc import AsyncIterator, Callable
+
+import httpx
+
+from app.core.logging import get_logger
+from app.core.metrics import (
+    observe_fetch_seconds,
+    observe_response_bytes,
+    observe_ttfb_seconds,
+    record_response_status,
+    record_retry,
+    record_sleep_seconds,
+)
+from app.infrastructure.scraper.circuit_breaker import (
+    HostCircuitBreaker,
+    RetryBudget,
+    default_circuit_breaker,
+    default_retry_budget,
+)
+from app.infrastructure.scraper.http_client import (
+    BLOCK_STATUS_CODES,
+    DEFAULT_TIMEOUT,
+    MAX_RETRIES,
+    RETRY_STATUS_CODES,
+    SESSION_DEFAULT_HEADERS,
+    USER_AGENTS,
+    _exponential_backoff_with_jitter,
+)
+from app.infrastructure.scraper.politeness import HostPoliteness, default_politeness
+from app.infrastructure.scraper.streaming import (
+    MAX_BODY_BYTES,
+    MAX_HEAD_BYTES,
+    STREAM_CHUNK_SIZE,
+    BodyAccumulator,
+)
+from app.infrastructure.scraper.transport import TransportRegistry, default_transport
+from app.infrastructure.scraper.urls import host_of
+
+LOG = get_logger("app")
+
+
+class _SlotReleasingStream(httpx.AsyncByteStream):
+    """Corpo della risposta che libera lo slot per host alla chiusura (non prima della lettura del corpo)."""
+
+    def __init__(self, stream: httpx.AsyncByteStream, release: Callable[[], None]) -> None:
+        self._stream = stream
+        self._release: Callable[[], None] | None = release
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self) -> None:
+        try:
+            await self._stream.aclose()
+        finally:
+            release, self._release = self._release, None
+            if release is not None:
+                release()
+
+
+class AsyncHttpClient:
+    """Esegue GET asincrone tramite httpx.AsyncClient; headers e timeout configurabili."""
+
+    def __init__(
+        self,
+        timeout: int = DEFAULT_TIMEOUT,
+        headers: dict | None = None,
+        transport: httpx.AsyncBaseTransport | None = None,
+        politeness: HostPoliteness | None = None,
+        registry: TransportRegistry | None = None,
+        circuit_breaker: HostCircuitBreaker | None = None,
+        retry_budget: RetryBudget | None = None,
+        max_body_bytes: int = MAX_BODY_BYTES,
+        max_head_bytes: int = MAX_HEAD_BYTES,
+    ) -> None:
+        self.timeout = timeout
+        self.max_body_bytes = max_body_bytes
+        self.max_head_bytes = max_head_bytes
+        self.politeness = politeness if politeness is not None else default_politeness
+        self._headers = dict(headers) if headers else {}
+        self._user_agents = list(USER_AGENTS)
+        self._transport = transport
+        self.registry = registry if registry is not None else default_transport
+        self.circuit_breaker = circuit_breaker if circuit_breaker is not None else default_circuit_breaker
+        self.retry_budget = retry_budget if retry_budget is not None else default_retry_budget
+        self._client: httpx.AsyncClient | None = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """AsyncClient condiviso del registry; client dedicato solo se è stato iniettato un transport."""
+        if self._transport is None:
+            return self.registry.async_client()
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                follow_redirects=True,
+                timeout=self.timeout,
+                transport=self._transport,
+            )
+        return self._client
+
+    def _request_headers(self) -> dict:
+        """Headers per singola richiesta: default sessione + User-Agent ruotato + headers custom."""
+        return {
+            **SESSION_DEFAULT_HEADERS,
+            "User-Agent": random.choice(self._user_agents),
+            **self._headers,
+        }
+
+    async def _backoff(self, host: str, attempt: int, reason: str) -> None:
+        """Attesa non bloccante prima del retry, contabilizzata nelle metriche."""
+        delay = _exponential_backoff_with_jitter(attempt)
+        record_retry(host, reason)
+        record_sleep_seconds(host, "backoff", delay)
+        await asyncio.sleep(delay)
+
+    async def _send(self, client: httpx.AsyncClient, url: str) -> httpx.Response:
+        """Invia la GET in streaming occupando uno slot per host, liberato dall'aclose della risposta; registra il TTFB."""
+        slot = self.registry.host_slot(url)
+        await slot.acquire()
+        try:
+            request = client.build_request("GET", url, headers=self._request_headers(), timeout=self.timeout)
+            started = time.perf_counter()
+            response = await client.send(request, stream=True)
+        except BaseException:
+            slot.release()
+            raise
+        response.stream = _SlotReleasingStream(response.stream, slot.release)
+        observe_ttfb_seconds(host_of(url), time.perf_counter() - started)
+        return response
+
+    async def fetch_with_retry(self, url: str, max_retries: int = MAX_RETRIES) -> httpx.Response:
+        """GET in streaming con retry su 403/429/5xx e errori di trasporto (backoff con jitter, attese non bloccanti).
+
+        Circuit breaker per-host e retry budget condivisi con le sessioni sync.
+        Restituisce la risposta con corpo ancora da leggere: il chiamante deve chiuderla (aclose), che libera
+        anche lo slot per host (connessioni concorrenti limitate fino alla fine della lettura del corpo).
+        """
+        client = self._get_client()
+        host = host_of(url)
+        self.retry_budget.record_request()
+        for attempt in range(max_retries):
+            probe = self.circuit_breaker.before_request(url)
+            try:
+                record_sleep_seconds(host, "politeness", await self.politeness.wait(url))
+                can_retry = attempt < max_retries - 1
+                try:
+                    response = await self._send(client, url)
+                except httpx.TransportError:
+                    record_response_status(host, "error")
+                    self.circuit_breaker.record_failure(url)
+                    if can_retry and self.retry_budget.try_acquire():
+                        await self._backoff(host, attempt, "transport")
+                        continue
+                    raise
+                record_response_status(host, response.status_code)
+                if response.status_code in BLOCK_STATUS_CODES or response.status_code in RETRY_STATUS_CODES:
+                    self.circuit_breaker.record_failure(url)
+                    await response.aclose()
+                    if can_retry and self.retry_budget.try_acquire():
+                        await self._backoff(host, attempt, "status")
+                        continue
+                    response.raise_for_status()
+                self.circuit_breaker.record_success(url)
+                if response.is_error:
+                    await response.aclose()
+                    response.raise_for_status()
+                return response
+            except BaseException:
+                # Prova half-open senza esito (cancellazione, errore inatteso): lo slot non resta occupato
+                self.circuit_breaker.release_probe(url, probe)
+                raise
+        raise RuntimeError("fetch_with_retry exhausted retries without returning")
+
+    async def get(self, url: str, head_only: bool = False) -> str:
+        """GET verso url con retry; corpo letto a chunk (stop a </head> se head_only). Solleva httpx.HTTPStatusError su 4xx/5xx."""
+        host = host_of(url)
+        started = time.perf_counter()
+        try:
+            response = await self.fetch_with_retry(url)
+            accumulator = BodyAccumulator(
+                head_only=head_only,
+                max_bytes=self.max_head_bytes if head_only else self.max_body_bytes,
+            )
+            try:
+                async for chunk in response.aiter_bytes(STREAM_CHUNK_SIZE):
+                    if accumulator.feed(chunk):
+                        break
+            finally:
+                await response.aclose()
+        finally:
+            observe_fetch_seconds(host, time.perf_counter() - started)
+        observe_response_bytes(host, accumulator.size)
+        if accumulator.truncated:
+            LOG.warning("async http client: body from %s truncated at %d bytes", host, accumulator.max_bytes)
+        return accumulator.text(response.encoding)
+
+    async def aclose(self) -> None:
+        """Chiude l'AsyncClient dedicato (se creato); quello condiviso resta al registry."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
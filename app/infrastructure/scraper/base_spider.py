@@ -1,20 +1,87 @@
 """Classe base astratta per spider: contratto parse(response) -> dict. Nessun fetch né parsing qui."""
 
+import asyncio
 from abc import ABC, abstractmethod
 
+from app.infrastructure.scraper.async_http_client import AsyncHttpClient
 from app.infrastructure.scraper.http_client import HttpClient
+from app.infrastructure.scraper.parse_cache import ParseCache, body_digest, parse_cache_key
+from app.infrastructure.scraper.parser_pool import ParserPool
 
 
 class BaseSpider(ABC):
-    """Contratto per spider: riceve http_client, espone parse(response) da implementare."""
+    """Contratto per spider: riceve http_client (e opzionale async_http_client), espone parse(response) da implementare.
 
-    def __init__(self, http_client: HttpClient) -> None:
+    head_only=True: lo spider usa solo la sezione <head>, la fetch si ferma a </head> (streaming).
+    version: parte della chiave della parse_cache; incrementare quando cambia l'output di parse().
+    parser_pool: se presente, parse() di pagine grandi eseguito in un processo worker (spider picklable).
+    shared_fetch=False: lo spider esegue una propria richiesta (header diversi, POST con token nascosti);
+    ScraperEngine chiama run(url) invece di passargli il corpo scaricato una volta per tutti.
+    """
+
+    head_only: bool = False
+    version: str = "1"
+    shared_fetch: bool = True
+
+    def __init__(
+        self,
+        http_client: HttpClient,
+        async_http_client: AsyncHttpClient | None = None,
+        parse_cache: ParseCache | None = None,
+        parser_pool: ParserPool | None = None,
+    ) -> None:
         self.http_client = http_client
+        self.async_http_client = async_http_client
+        self.parse_cache = parse_cache
+        self.parser_pool = parser_pool
+
+    def __getstate__(self) -> dict:
+        """Stato inviato ai worker del ParserPool: senza client HTTP, cache e pool (non serializzabili)."""
+        state = self.__dict__.copy()
+        for name in ("http_client", "async_http_client", "parse_cache", "parser_pool"):
+            state[name] = None
+        return state
 
     def run(self, url: str) -> dict:
         """Esegue fetch con http_client e delega a parse(html). Restituisce dati strutturati."""
-        html = self.http_client.get(url)
-        return self.parse(html)
+        html = self.http_client.get(url, head_only=self.head_only)
+        return self.process(html, url)
+
+    async def arun(self, url: str) -> dict:
+        """Come run() ma asincrono: fetch con async_http_client (o http_client in un thread se assente)."""
+        if self.async_http_client is not None:
+            html = await self.async_http_client.get(url, head_only=self.head_only)
+        else:
+            html = await asyncio.to_thread(self.http_client.get, url, self.head_only)
+        if self.parser_pool is not None:
+            # Attesa del worker fuori dall'event loop
+            return await asyncio.to_thread(self.process, html, url)
+        return self.process(html, url)
+
+    def process(self, response: str, url: str) -> dict:
+        """Parsing del corpo già scaricato e post-elaborazione con l'url di origine.
+
+        Con parse_cache: corpo già visto (stesso spider e versione) -> parse() saltato, risultato riusato.
+        """
+        if self.parse_cache is None:
+            return self.finalize(self._parse(response), url)
+        digest, size = body_digest(response)
+        key = parse_cache_key(self, digest)
+        hit, result = self.parse_cache.get(key, size)
+        if not hit:
+            result = self._parse(response)
+            self.parse_cache.set(key, result)
+        return self.finalize(result, url)
+
+    def _parse(self, response: str):
+        """parse() inline o tramite parser_pool se configurato."""
+        if self.parser_pool is None:
+            return self.parse(response)
+        return self.parser_pool.parse(self, response)
+
+    def finalize(self, result, url: str):
+        """Hook per completare il risultato di parse() con l'url (default: invariato)."""
+        return result
 
     @abstractmethod
     def parse(self, response: str) -> dict:
@@ -0,0 +1,219 @@
+"""Circuit breaker per-host e retry budget globale, condivisi da tutte le sessioni dello scraper.
+
+Dopo failure_threshold errori consecutivi (403/429/5xx o timeout) verso un host, il circuito si apre:
+per cooldown_seconds le chiamate a quell'host falliscono subito (CircuitOpenError). Scaduto il
+cooldown passa a half-open: una sola richiesta di prova decide se richiudere o riaprire.
+Il RetryBudget limita i retry complessivi a una frazione delle richieste (niente tempeste di retry).
+Solo gli host con fallimenti recenti hanno un circuito: un successo lo rimuove e oltre MAX_TRACKED_HOSTS
+i circuiti chiusi vengono scartati (memoria limitata, come HostPoliteness).
+"""
+
+import threading
+import time
+from enum import Enum
+from typing import Callable
+
+from app.core.metrics import record_circuit_breaker_rejection, set_circuit_breaker_state, set_retry_budget_tokens
+from app.infrastructure.scraper.urls import host_of
+
+DEFAULT_FAILURE_THRESHOLD = 5
+DEFAULT_COOLDOWN_SECONDS = 30.0
+DEFAULT_RETRY_RATIO = 0.2
+DEFAULT_MIN_RETRIES_PER_SECOND = 1.0
+DEFAULT_MAX_RETRY_TOKENS = 20.0
+# Oltre questa soglia i circuiti chiusi (sotto soglia di fallimenti) vengono rimossi (memoria limitata)
+MAX_TRACKED_HOSTS = 10_000
+
+
+class CircuitState(str, Enum):
+    CLOSED = "closed"
+    HALF_OPEN = "half_open"
+    OPEN = "open"
+
+
+# Valore numerico esposto sul gauge Prometheus
+STATE_GAUGE_VALUES = {CircuitState.CLOSED: 0, CircuitState.HALF_OPEN: 1, CircuitState.OPEN: 2}
+
+
+class CircuitOpenError(RuntimeError):
+    """Circuito aperto per l'host: richiesta rifiutata senza contattare il server."""
+
+    def __init__(self, host: str, retry_after: float) -> None:
+        self.host = host
+        self.retry_after = retry_after
+        super().__init__(f"Circuit open for host '{host}', retry after {retry_after:.1f}s")
+
+
+class _HostCircuit:
+    """Stato del circuito di un singolo host."""
+
+    __slots__ = ("state", "failures", "opened_at", "probe")
+
+    def __init__(self) -> None:
+        self.state = CircuitState.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        # Token della richiesta di prova in corso (half-open), None se lo slot è libero
+        self.probe: object | None = None
+
+
+class HostCircuitBreaker:
+    """Circuit breaker per-host (closed/open/half-open); thread-safe."""
+
+    def __init__(
+        self,
+        failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+        cooldown_seconds: float = DEFAULT_COOLDOWN_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.failure_threshold = failure_threshold
+        self.cooldown_seconds = cooldown_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._circuits: dict[str, _HostCircuit] = {}
+
+    def _set_state(self, host: str, circuit: _HostCircuit, state: CircuitState) -> None:
+        circuit.state = state
+        set_circuit_breaker_state(host, STATE_GAUGE_VALUES[state])
+
+    def state(self, url: str) -> CircuitState:
+        """Stato corrente del circuito per l'host di url."""
+        circuit = self._circuits.get(host_of(url))
+        return circuit.state if circuit is not None else CircuitState.CLOSED
+
+    def before_request(self, url: str) -> object | None:
+        """Da chiamare prima di ogni richiesta: solleva CircuitOpenError se l'host è in cooldown.
+
+        Se la richiesta è la prova half-open restituisce un token da passare a release_probe quando la
+        richiesta termina senza record_success / record_failure (cancellazione, errore inatteso); altrimenti None.
+        """
+        host = host_of(url)
+        with self._lock:
+            circuit = self._circuits.get(host)
+            if circuit is None or circuit.state is CircuitState.CLOSED:
+                return None
+            now = self._clock()
+            if circuit.state is CircuitState.OPEN:
+                remaining = circuit.opened_at + self.cooldown_seconds - now
+                if remaining > 0:
+                    record_circuit_breaker_rejection(host)
+                    raise CircuitOpenError(host, remaining)
+                self._set_state(host, circuit, CircuitState.HALF_OPEN)
+            if circuit.probe is not None:
+                record_circuit_breaker_rejection(host)
+                raise CircuitOpenError(host, 0.0)
+            circuit.probe = object()
+            return circuit.probe
+
+    def release_probe(self, url: str, probe: object | None) -> None:
+        """Prova interrotta senza esito: libera lo slot (il circuito resta half-open, la prossima richiesta prova).
+
+        No-op se probe è None o se lo slot è già stato liberato da record_success / record_failure.
+        """
+        if probe is None:
+            return
+        with self._lock:
+            circuit = self._circuits.get(host_of(url))
+            if circuit is not None and circuit.probe is probe:
+                circuit.probe = None
+
+    def _prune(self) -> None:
+        """Rimuove i circuiti chiusi senza prova in corso (si perde solo un conteggio sotto soglia)."""
+        idle = [h for h, c in self._circuits.items() if c.state is CircuitState.CLOSED and c.probe is None]
+        for host in idle:
+            del self._circuits[host]
+
+    def record_success(self, url: str) -> None:
+        """Risposta valida dall'host: chiude il circuito e lo rimuove (fallimenti azzerati)."""
+        host = host_of(url)
+        with self._lock:
+            circuit = self._circuits.pop(host, None)
+            if circuit is not None and circuit.state is not CircuitState.CLOSED:
+                self._set_state(host, circuit, CircuitState.CLOSED)
+
+    def record_failure(self, url: str) -> None:
+        """403/429/5xx o timeout: incrementa i fallimenti; apre il circuito oltre soglia o se la prova fallisce."""
+        host = host_of(url)
+        with self._lock:
+            circuit = self._circuits.get(host)
+            if circuit is None:
+                if len(self._circuits) >= MAX_TRACKED_HOSTS:
+                    self._prune()
+                circuit = self._circuits[host] = _HostCircuit()
+            circuit.failures += 1
+            circuit.probe = None
+            if circuit.state is CircuitState.HALF_OPEN or circuit.failures >= self.failure_threshold:
+                circuit.opened_at = self._clock()
+                self._set_state(host, circuit, CircuitState.OPEN)
+
+    def reset(self) -> None:
+        """Richiude tutti i circuiti (uso test / amministrazione)."""
+        with self._lock:
+            for host, circuit in self._circuits.items():
+                if circuit.state is not CircuitState.CLOSED:
+                    set_circuit_breaker_state(host, STATE_GAUGE_VALUES[CircuitState.CLOSED])
+            self._circuits.clear()
+
+
+class RetryBudget:
+    """Budget globale dei retry: ogni richiesta deposita `ratio` token, ogni retry ne consuma uno.
+
+    Un minimo di min_retries_per_second token viene comunque ricaricato nel tempo, fino a max_tokens.
+    """
+
+    def __init__(
+        self,
+        ratio: float = DEFAULT_RETRY_RATIO,
+        min_retries_per_second: float = DEFAULT_MIN_RETRIES_PER_SECOND,
+        max_tokens: float = DEFAULT_MAX_RETRY_TOKENS,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.ratio = ratio
+        self.min_retries_per_second = min_retries_per_second
+        self.max_tokens = max_tokens
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._tokens = max_tokens
+        self._updated_at = clock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        elapsed = max(0.0, now - self._updated_at)
+        self._tokens = min(self.max_tokens, self._tokens + elapsed * self.min_retries_per_second)
+        self._updated_at = now
+
+    @property
+    def tokens(self) -> float:
+        """Token disponibili (retry consentiti) in questo momento."""
+        with self._lock:
+            self._refill()
+            return self._tokens
+
+    def record_request(self) -> None:
+        """Nuova richiesta (primo tentativo): deposita ratio token."""
+        with self._lock:
+            self._refill()
+            self._tokens = min(self.max_tokens, self._tokens + self.ratio)
+            set_retry_budget_tokens(self._tokens)
+
+    def try_acquire(self) -> bool:
+        """Consuma un token per un retry; False se il budget è esaurito."""
+        with self._lock:
+            self._refill()
+            if self._tokens < 1.0:
+                return False
+            self._tokens -= 1.0
+            set_retry_budget_tokens(self._tokens)
+            return True
+
+    def reset(self) -> None:
+        """Ripristina il budget pieno."""
+        with self._lock:
+            self._tokens = self.max_tokens
+            self._updated_at = self._clock()
+            set_retry_budget_tokens(self._tokens)
+
+
+# Istanze di processo condivise da tutte le sessioni (sync e async)
+default_circuit_breaker = HostCircuitBreaker()
+default_retry_budget = RetryBudget()
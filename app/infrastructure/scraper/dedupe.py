@@ -0,0 +1,132 @@
+"""Deduplicazione dei record della pipeline per impronta di contenuto, con memoria limitata.
+
+Impronta: BLAKE2b a 16 byte sui campi canonici (source, url canonico, title, description, creative_url,
+ad_id, copy_text, start_date; gli ultimi quattro anche da ad_intelligence, ad_id "unknown" ignorato);
+i campi volatili (fetched_at, collected_at, ...) sono esclusi, quindi lo stesso contenuto
+raccolto in run diversi ha la stessa impronta. Insieme dei visti: LRU con TTL in memoria (max_entries
+impronte da 16 byte) e tier Redis opzionale (SET NX con TTL) condiviso tra repliche e persistente ai riavvii.
+"""
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+
+from app.cache.redis_client import RedisCacheClient, get_redis_client
+from app.core.config import Settings
+from app.core.metrics import record_pipeline_dedupe, set_pipeline_dedupe_entries
+from app.infrastructure.scraper.urls import canonical_url
+
+DIGEST_SIZE = 16
+DEFAULT_MAX_ENTRIES = 100_000
+DEFAULT_TTL_SECONDS = 86_400
+REDIS_KEY_PREFIX = "scraper:seen:"
+CANONICAL_FIELDS = ("source", "url", "title", "description", "creative_url", "ad_id", "copy_text", "start_date")
+UNKNOWN_AD_ID = "unknown"
+VOLATILE_FIELDS = frozenset({"fetched_at", "collected_at", "scraped_at", "timestamp"})
+
+
+def _canonical_payload(data: dict) -> dict:
+    """Record piatto su cui calcolare l'impronta: i dict {source, data} usano il source esterno e data."""
+    nested = data.get("data")
+    if isinstance(nested, dict):
+        return {**nested, "source": data.get("source") or nested.get("source")}
+    return data
+
+
+def fingerprint(data: dict) -> bytes:
+    """Impronta stabile (DIGEST_SIZE byte) del contenuto del record, indipendente dai campi volatili.
+
+    Se nessun campo canonico è valorizzato si usa l'intero record (chiavi ordinate, senza campi volatili).
+    """
+    payload = _canonical_payload(data)
+    intelligence = payload.get("ad_intelligence")
+    if not isinstance(intelligence, dict):
+        intelligence = {}
+    values = {
+        "source": payload.get("source"),
+        "url": payload.get("url") or payload.get("landing_url"),
+        "title": payload.get("title"),
+        "description": payload.get("description"),
+        "creative_url": payload.get("creative_url") or intelligence.get("creative_url"),
+        "ad_id": payload.get("ad_id") or intelligence.get("ad_id"),
+        "copy_text": payload.get("copy_text") or intelligence.get("copy_text"),
+        "start_date": payload.get("start_date") or intelligence.get("start_date"),
+    }
+    # Sentinella del parser Meta quando l'id non è stato trovato: non distingue le inserzioni
+    if values["ad_id"] == UNKNOWN_AD_ID:
+        values["ad_id"] = None
+    if values["url"]:
+        values["url"] = canonical_url(values["url"])
+    if any(values[name] for name in CANONICAL_FIELDS if name != "source"):
+        canonical = [values[name] for name in CANONICAL_FIELDS]
+    else:
+        canonical = {key: value for key, value in payload.items() if key not in VOLATILE_FIELDS}
+    raw = json.dumps(canonical, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+    return hashlib.blake2b(raw.encode("utf-8", errors="surrogatepass"), digest_size=DIGEST_SIZE).digest()
+
+
+class SeenSet:
+    """Impronte già viste: LRU in memoria con TTL (thread-safe) e tier Redis opzionale condiviso."""
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        ttl_seconds: int = DEFAULT_TTL_SECONDS,
+        redis_client: RedisCacheClient | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._redis = redis_client
+        self._clock = clock
+        self._entries: OrderedDict[bytes, float] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def check_and_add(self, digest: bytes) -> bool:
+        """True se l'impronta è già stata vista (duplicato); altrimenti la registra e restituisce False."""
+        now = self._clock()
+        with self._lock:
+            expires_at = self._entries.get(digest)
+            if expires_at is not None and expires_at > now:
+                self._entries.move_to_end(digest)
+                record_pipeline_dedupe("duplicate", "memory")
+                return True
+            self._remember(digest, now)
+        if self._redis is not None and self._redis.add(REDIS_KEY_PREFIX + digest.hex(), "1", self.ttl_seconds) is False:
+            record_pipeline_dedupe("duplicate", "redis")
+            return True
+        record_pipeline_dedupe("new", "none")
+        return False
+
+    def _remember(self, digest: bytes, now: float) -> None:
+        if self.max_entries <= 0:
+            return
+        self._entries[digest] = now + self.ttl_seconds
+        self._entries.move_to_end(digest)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        set_pipeline_dedupe_entries(len(self._entries))
+
+    def clear(self) -> None:
+        """Svuota il tier in memoria (uso test / amministrazione)."""
+        with self._lock:
+            self._entries.clear()
+        set_pipeline_dedupe_entries(0)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def build_seen_set(settings: Settings) -> SeenSet:
+    """Factory da config: scraper_dedupe_backend = memory | redis (redis = LRU + tier Redis condiviso)."""
+    redis_client = None
+    if settings.scraper_dedupe_backend.lower() == "redis":
+        redis_client = get_redis_client(host=settings.redis_host, port=settings.redis_port, enabled=True)
+    return SeenSet(
+        max_entries=settings.scraper_dedupe_max_entries,
+        ttl_seconds=settings.scraper_dedupe_ttl_seconds,
+        redis_client=redis_client,
+    )
@@ -0,0 +1,118 @@
+"""Cache DNS con TTL per il trasporto dello scraper e connessioni urllib3 che la usano.
+
+getaddrinfo() non espone il TTL del record: la cache applica un TTL configurabile (default 60s),
+così un host risolto resta valido tra un run schedulato e il successivo senza ignorare cambi di IP.
+Latenza di risoluzione e di connessione sono misurate separatamente (metriche Prometheus).
+"""
+
+import ipaddress
+import socket
+import threading
+import time
+from typing import Callable
+
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+from app.core.metrics import observe_connect_seconds, observe_dns_resolve_seconds, record_dns_cache
+
+DEFAULT_DNS_TTL_SECONDS = 60.0
+MAX_CACHED_HOSTS = 10_000
+
+
+def _is_ip_literal(host: str) -> bool:
+    try:
+        ipaddress.ip_address(host.strip("[]"))
+        return True
+    except ValueError:
+        return False
+
+
+class DnsCache:
+    """Cache (host, porta) -> indirizzi risolti con scadenza; thread-safe."""
+
+    def __init__(
+        self,
+        ttl_seconds: float = DEFAULT_DNS_TTL_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+        resolver: Callable[..., list] = socket.getaddrinfo,
+    ) -> None:
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._resolver = resolver
+        self._lock = threading.Lock()
+        self._entries: dict[tuple[str, int], tuple[float, list]] = {}
+
+    def resolve(self, host: str, port: int) -> list:
+        """Risultati getaddrinfo (SOCK_STREAM) per host:porta, dalla cache se non scaduti."""
+        key = (host.lower(), port)
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is not None and entry[0] > now:
+            record_dns_cache("hit")
+            return entry[1]
+        record_dns_cache("miss")
+        start = time.perf_counter()
+        addresses = self._resolver(host, port, 0, socket.SOCK_STREAM)
+        observe_dns_resolve_seconds(time.perf_counter() - start)
+        with self._lock:
+            if len(self._entries) >= MAX_CACHED_HOSTS:
+                self._entries = {k: v for k, v in self._entries.items() if v[0] > now}
+            self._entries[key] = (now + self.ttl_seconds, addresses)
+        return addresses
+
+    def invalidate(self, host: str, port: int) -> None:
+        """Rimuove la voce (es. dopo un errore di connessione verso l'indirizzo in cache)."""
+        with self._lock:
+            self._entries.pop((host.lower(), port), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class _CachedDnsConnectionMixin:
+    """Connessione urllib3 che risolve l'host tramite DnsCache e misura il tempo di connect.
+
+    Solo l'indirizzo di connessione (_dns_host) cambia: Host header, SNI e verifica certificato
+    continuano a usare il nome originale.
+    """
+
+    dns_cache: DnsCache
+
+    def _new_conn(self):
+        hostname = self._dns_host
+        ip = None
+        if not _is_ip_literal(hostname):
+            try:
+                ip = self.dns_cache.resolve(hostname, self.port)[0][4][0]
+            except (OSError, IndexError):
+                ip = None  # urllib3 risolve da sé e solleva NameResolutionError se serve
+        start = time.perf_counter()
+        try:
+            if ip is not None:
+                self._dns_host = ip
+            sock = super()._new_conn()
+        except Exception:
+            if ip is not None:
+                self.dns_cache.invalidate(hostname, self.port)
+            raise
+        finally:
+            self._dns_host = hostname
+        observe_connect_seconds(time.perf_counter() - start)
+        return sock
+
+
+def pool_classes_for(dns_cache: DnsCache) -> dict:
+    """Classi pool urllib3 (per schema) le cui connessioni usano dns_cache."""
+    http_conn = type("CachedDnsHTTPConnection", (_CachedDnsConnectionMixin, HTTPConnection), {"dns_cache": dns_cache})
+    https_conn = type("CachedDnsHTTPSConnection", (_CachedDnsConnectionMixin, HTTPSConnection), {"dns_cache": dns_cache})
+    return {
+        "http": type("CachedDnsHTTPConnectionPool", (HTTPConnectionPool,), {"ConnectionCls": http_conn}),
+        "https": type("CachedDnsHTTPSConnectionPool", (HTTPSConnectionPool,), {"ConnectionCls": https_conn}),
+    }
+
+
+# Cache DNS di processo usata dal trasporto di default
+default_dns_cache = DnsCache()
@@ -1,22 +1,129 @@
-"""ScraperEngine: esecuzione spider passato come parametro, normalizzazione e pipeline."""
+"""ScraperEngine: esecuzione spider passato come parametro, normalizzazione e pipeline.
 
+Executor: serial (default, spider uno dopo l'altro, eccezioni propagate) oppure concorrente:
+thread (ThreadPoolExecutor), async (asyncio: arun degli spider con client async, altrimenti pool di thread
+dell'engine) e process (parse() nei worker di ParserPool, orchestrato da thread). In modalità concorrente fetch e parse degli spider si sovrappongono
+(tempo per url ~ spider più lento), con timeout per run; pipeline, normalizzazione e intelligence restano
+in ordine di registrazione nel thread chiamante (dedupe deterministico, ordine dei risultati stabile).
+Uno spider che fallisce o supera il timeout è escluso dal run senza perdere i risultati degli altri; il
+timeout decorre dall'avvio di ciascuno spider nel worker (non dall'accodamento). Un worker trattenuto da uno
+spider scaduto non torna disponibile: il run successivo usa un pool nuovo e il vecchio termina da solo.
+run_many(urls): pipeline a stadi fetch -> parse -> normalize -> score -> persist con code limitate e worker
+per stage (StagedPipeline), così un salvataggio lento non ferma le fetch degli url successivi.
+"""
+
+import asyncio
+import threading
+import time
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+
+from app.core.logging import get_logger
+from app.core.metrics import observe_engine_run_fetches, record_engine_spider_error
 from app.infrastructure.scraper.http_client import HttpClient
 from app.infrastructure.scraper.normalizer import ScraperNormalizer
+from app.infrastructure.scraper.parser_pool import ParserPool
 from app.infrastructure.scraper.pipeline import ScraperPipeline
 from app.infrastructure.scraper.result_store import ResultStore
+from app.infrastructure.scraper.staged_pipeline import DEFAULT_QUEUE_SIZE, Stage, StagedPipeline
 from app.services.intelligence.intelligence_engine import IntelligenceEngine
 
+LOG = get_logger("app")
+
+EXECUTOR_SERIAL = "serial"
+EXECUTOR_THREAD = "thread"
+EXECUTOR_ASYNC = "async"
+EXECUTOR_PROCESS = "process"
+EXECUTORS = (EXECUTOR_SERIAL, EXECUTOR_THREAD, EXECUTOR_ASYNC, EXECUTOR_PROCESS)
+STAGE_FETCH = "fetch"
+STAGE_PARSE = "parse"
+STAGE_NORMALIZE = "normalize"
+STAGE_SCORE = "score"
+STAGE_PERSIST = "persist"
+# Worker per stage di run_many: I/O (fetch) più largo; normalize singolo per un dedupe deterministico
+DEFAULT_STAGE_WORKERS = {STAGE_FETCH: 8, STAGE_PARSE: 4, STAGE_NORMALIZE: 1, STAGE_SCORE: 2, STAGE_PERSIST: 1}
+ERROR_EXCEPTION = "error"
+ERROR_TIMEOUT = "timeout"
+# Intervallo massimo tra due controlli delle scadenze mentre uno spider è ancora in coda nel pool
+QUEUED_POLL_SECONDS = 0.05
+
+
+class _SpiderTimeout(Exception):
+    """Spider oltre run_timeout (dal proprio avvio) nell'executor async."""
+
+
+class _SpiderFailed:
+    """Esito di uno spider fallito o scaduto in modalità concorrente (escluso dal run)."""
+
+    def __init__(self, reason: str, detail: str) -> None:
+        self.reason = reason
+        self.detail = detail
+
+
+class _WorkerPool:
+    """Pool di thread dell'engine con i future abbandonati (scaduti ma con il worker ancora occupato)."""
+
+    def __init__(self, workers: int) -> None:
+        self.workers = workers
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="scraper-engine")
+        self._abandoned: set[Future] = set()
+        self._lock = threading.Lock()
+
+    def abandon(self, future: Future) -> None:
+        """Annulla il future; se è già in esecuzione il suo worker resta occupato e viene contato in busy()."""
+        if not future.cancel():
+            with self._lock:
+                self._abandoned.add(future)
+
+    def busy(self) -> int:
+        """Worker ancora occupati da spider abbandonati."""
+        with self._lock:
+            self._abandoned = {future for future in self._abandoned if not future.done()}
+            return len(self._abandoned)
+
 
 class ScraperEngine:
-    """Esegue più spider registrati, aggrega risultati in pipeline e result_store."""
+    """Esegue più spider registrati, aggrega risultati in pipeline e result_store.
 
-    def __init__(self, http_client: HttpClient) -> None:
+    executor: serial | thread | async | process; max_workers limita i thread (default: uno per spider);
+    run_timeout: secondi massimi per gli spider di un run (None = nessun limite, solo modalità concorrenti);
+    pipeline: dedupe condivisibile (default: ScraperPipeline con SeenSet in memoria);
+    result_store: ring dei risultati (default: ResultStore senza spill);
+    stage_workers / stage_queue_size: worker per stage e dimensione delle code di run_many.
+    """
+
+    def __init__(
+        self,
+        http_client: HttpClient,
+        executor: str = EXECUTOR_SERIAL,
+        max_workers: int | None = None,
+        run_timeout: float | None = None,
+        parser_pool: ParserPool | None = None,
+        pipeline: ScraperPipeline | None = None,
+        result_store: ResultStore | None = None,
+        stage_workers: dict[str, int] | None = None,
+        stage_queue_size: int = DEFAULT_QUEUE_SIZE,
+    ) -> None:
+        if executor not in EXECUTORS:
+            raise ValueError(f"Unknown ScraperEngine executor: {executor!r} (expected one of {EXECUTORS})")
         self._http_client = http_client
+        self.executor = executor
+        self.max_workers = max_workers
+        self.run_timeout = run_timeout
+        self._parser_pool = parser_pool
+        self._thread_pool: _WorkerPool | None = None
+        self._pool_lock = threading.Lock()
+        self.stage_workers = {**DEFAULT_STAGE_WORKERS, **(stage_workers or {})}
+        self.stage_queue_size = stage_queue_size
         self.normalizer = ScraperNormalizer()
-        self.pipeline = ScraperPipeline()
-        self.result_store = ResultStore()
+        self.pipeline = pipeline if pipeline is not None else ScraperPipeline()
+        self.result_store = result_store if result_store is not None else ResultStore()
         self.intelligence_engine = IntelligenceEngine()
         self.spiders: list = []
+        # Fetch HTTP dell'ultimo run (1 condivisa + una per spider con shared_fetch=False)
+        self.last_run_fetches = 0
+        # Spider esclusi dall'ultimo run concorrente: nome classe -> motivo (error: ... / timeout)
+        self.last_run_errors: dict[str, str] = {}
 
     def register_spider(self, spider) -> None:
         """Aggiunge lo spider alla lista degli spider registrati."""
@@ -37,27 +144,311 @@ class ScraperEngine:
         return {}
 
     def run(self, url: str) -> list:
-        """Esegue tutti gli spider registrati; output sempre con schema {source, data}. Duplicati (pipeline None) esclusi."""
-        results_list: list = []
-        for spider in self.spiders:
-            result = spider.run(url)
-            data = self._to_dict(result)
-            processed = self.pipeline.process(data)
-            if processed is None:
-                continue
-            if "data" not in processed:
-                stable = {"source": spider.__class__.__name__, "data": processed}
+        """Esegue tutti gli spider registrati; output sempre con schema {source, data}. Duplicati (pipeline None) esclusi.
+
+        L'url è scaricato una sola volta e lo stesso corpo passa a ogni spider (process / parse_batches);
+        gli spider con shared_fetch=False (o senza process) fanno la propria richiesta con run(url).
+        Spider multi_ad (es. MetaSpider): record consegnati alla pipeline a batch (N annunci per pagina).
+        """
+        if self.executor == EXECUTOR_ASYNC:
+            return asyncio.run(self.arun(url))
+        html = self._shared_fetch(url)
+        if self.executor == EXECUTOR_SERIAL:
+            outputs = (self._execute(spider, html, url) for spider in self.spiders)
+        else:
+            outputs = self._execute_threads(html, url)
+        return self._consume(outputs)
+
+    async def arun(self, url: str) -> list:
+        """Come run() con esecuzione asincrona degli spider (usabile da un event loop già attivo)."""
+        _, (fetch,) = self._submit([(self._shared_fetch, url)])
+        html = await asyncio.wrap_future(fetch)
+        tasks = [asyncio.ensure_future(self._execute_async(spider, html, url)) for spider in self.spiders]
+        if tasks:
+            # Ogni task applica run_timeout dal proprio avvio (_execute_async)
+            await asyncio.wait(tasks)
+        outputs = []
+        for spider, task in zip(self.spiders, tasks):
+            if isinstance(task.exception(), _SpiderTimeout):
+                outputs.append(self._failed(spider, ERROR_TIMEOUT, f"exceeded {self.run_timeout}s"))
+            elif task.exception() is not None:
+                outputs.append(self._failed(spider, ERROR_EXCEPTION, repr(task.exception())))
             else:
-                stable = processed
-            normalized = self.normalizer.normalize(
-                stable["data"],
-                source=stable.get("source") or spider.__class__.__name__,
+                outputs.append(task.result())
+        return self._consume(outputs)
+
+    def run_many(self, urls: Iterable[str], persist: Callable[[dict], None] | None = None) -> list:
+        """Più url nella pipeline a stadi fetch -> parse -> normalize -> score -> persist (StagedPipeline).
+
+        Gli stage lavorano su url diversi in parallelo: la fetch dell'url successivo non attende il salvataggio
+        del precedente; con code piene la pressione risale fino alla lettura di urls. Executor process: parse()
+        nei worker di ParserPool. persist (es. salvataggio su DB) è chiamato per ogni risultato dopo il
+        result_store. Risultati raggruppati per url in ordine di completamento, per url nell'ordine di run().
+        """
+        if self.executor == EXECUTOR_PROCESS and self._parser_pool is None:
+            self._parser_pool = ParserPool(max_workers=self.max_workers)
+        self.last_run_errors = {}
+        fetches: list[int] = []
+
+        def fetch(url: str) -> tuple[str, str | None]:
+            html, count = self._fetch(url)
+            fetches.append(count)
+            return url, html
+
+        def parse(fetched: tuple[str, str | None]) -> list:
+            url, html = fetched
+            outputs = []
+            for spider in self.spiders:
+                try:
+                    outputs.append(self._execute_materialized(spider, html, url))
+                except Exception as exc:
+                    outputs.append(self._failed(spider, ERROR_EXCEPTION, repr(exc)))
+            return outputs
+
+        def normalize(outputs: list) -> list[list[dict]] | None:
+            return list(self._normalized(outputs)) or None
+
+        def score(groups: list[list[dict]]) -> list[list[dict]]:
+            return [self._score(stables) for stables in groups]
+
+        def save(groups: list[list[dict]]) -> list[dict]:
+            results = [stable for stables in groups for stable in self._persist(stables)]
+            if persist is not None:
+                for stable in results:
+                    persist(stable)
+            return results
+
+        stages = [
+            Stage(name, fn, self.stage_workers[name], self.stage_queue_size)
+            for name, fn in (
+                (STAGE_FETCH, fetch),
+                (STAGE_PARSE, parse),
+                (STAGE_NORMALIZE, normalize),
+                (STAGE_SCORE, score),
+                (STAGE_PERSIST, save),
             )
-            if normalized is not None:
-                stable["data"] = normalized
-            data = stable["data"]
-            intelligence = self.intelligence_engine.evaluate(data)
+        ]
+        results_list: list = []
+        StagedPipeline(stages, sink=results_list.extend).run(urls)
+        self.last_run_fetches = sum(fetches)
+        return results_list
+
+    def close(self) -> None:
+        """Chiude il pool di thread dell'engine (ricreato al run successivo)."""
+        with self._pool_lock:
+            if self._thread_pool is not None:
+                self._thread_pool.executor.shutdown(wait=False, cancel_futures=True)
+                self._thread_pool = None
+
+    def _shared_fetch(self, url: str) -> str | None:
+        """Fetch unica dell'url per gli spider che condividono il corpo; azzera lo stato dell'ultimo run."""
+        self.last_run_errors = {}
+        html, self.last_run_fetches = self._fetch(url)
+        return html
+
+    def _fetch(self, url: str) -> tuple[str | None, int]:
+        """(corpo condiviso o None se nessuno spider lo usa, fetch HTTP dell'url inclusi gli spider con fetch propria)."""
+        shared = [spider for spider in self.spiders if self._uses_shared_fetch(spider)]
+        opted_out = len(self.spiders) - len(shared)
+        if not shared:
+            observe_engine_run_fetches(opted_out, saved=0)
+            return None, opted_out
+        # Corpo completo se almeno uno spider va oltre <head>
+        html = self._http_client.get(url, head_only=all(getattr(spider, "head_only", False) for spider in shared))
+        observe_engine_run_fetches(1 + opted_out, saved=len(shared) - 1)
+        return html, 1 + opted_out
+
+    def _execute(self, spider, html: str | None, url: str):
+        """Output di uno spider: risultato singolo o iterabile di batch (multi_ad)."""
+        uses_shared = html is not None and self._uses_shared_fetch(spider)
+        if getattr(spider, "multi_ad", False):
+            return spider.parse_batches(html, url) if uses_shared else spider.run_batches(url)
+        if not uses_shared:
+            return spider.run(url)
+        if self.executor == EXECUTOR_PROCESS and self._parser_pool is not None:
+            return spider.finalize(self._parser_pool.parse(spider, html), url)
+        return spider.process(html, url)
+
+    def _execute_materialized(self, spider, html: str | None, url: str):
+        """_execute con i batch multi_ad già materializzati (parsing completo nel worker)."""
+        output = self._execute(spider, html, url)
+        return list(output) if getattr(spider, "multi_ad", False) else output
+
+    async def _execute_async(self, spider, html: str | None, url: str):
+        """Spider con fetch propria e client async: arun(); altrimenti esecuzione nel pool di thread dell'engine.
+
+        Pool dell'engine (non l'executor di default del loop, usato da asyncio.to_thread in arun() senza client
+        async o con parser_pool): asyncio.run non attende gli spider scaduti. Oltre run_timeout dall'avvio dello
+        spider solleva _SpiderTimeout.
+        """
+        uses_shared = html is not None and self._uses_shared_fetch(spider)
+        if (
+            not uses_shared
+            and not getattr(spider, "multi_ad", False)
+            and getattr(spider, "async_http_client", None) is not None
+            and getattr(spider, "parser_pool", None) is None
+        ):
+            task = asyncio.ensure_future(spider.arun(url))
+            done, _ = await asyncio.wait([task], timeout=self.run_timeout)
+            if not done:
+                task.cancel()
+                raise _SpiderTimeout()
+            return task.result()
+        starts: list[float | None] = [None]
+        pool, (future,) = self._submit([(self._timed, starts, 0, spider, html, url)])
+        wrapped = asyncio.wrap_future(future)
+        try:
+            while not wrapped.done():
+                if self.run_timeout is None:
+                    await asyncio.wait([wrapped])
+                    break
+                started = starts[0]
+                if started is None:
+                    # In coda: scade solo se tutti i worker sono occupati da spider abbandonati
+                    if pool.busy() >= pool.workers:
+                        raise _SpiderTimeout()
+                    timeout = QUEUED_POLL_SECONDS
+                else:
+                    timeout = started + self.run_timeout - time.monotonic()
+                    if timeout <= 0:
+                        raise _SpiderTimeout()
+                await asyncio.wait([wrapped], timeout=timeout)
+            return wrapped.result()
+        except (asyncio.CancelledError, _SpiderTimeout):
+            wrapped.cancel()
+            pool.abandon(future)
+            raise
+
+    def _execute_threads(self, html: str | None, url: str) -> list:
+        """Spider eseguiti nel pool di thread (process: parse() nei worker di ParserPool); esiti in ordine."""
+        if self.executor == EXECUTOR_PROCESS and self._parser_pool is None:
+            self._parser_pool = ParserPool(max_workers=self.max_workers)
+        starts: list[float | None] = [None] * len(self.spiders)
+        pool, futures = self._submit(
+            [(self._timed, starts, index, spider, html, url) for index, spider in enumerate(self.spiders)]
+        )
+        expired = self._wait_started(pool, futures, starts)
+        outputs = []
+        for spider, future in zip(self.spiders, futures):
+            if future in expired:
+                outputs.append(self._failed(spider, ERROR_TIMEOUT, f"exceeded {self.run_timeout}s"))
+            elif future.exception() is not None:
+                outputs.append(self._failed(spider, ERROR_EXCEPTION, repr(future.exception())))
+            else:
+                outputs.append(future.result())
+        return outputs
+
+    def _timed(self, starts: list[float | None], index: int, spider, html: str | None, url: str):
+        """_execute_materialized nel worker, registrando l'istante di avvio per il timeout dello spider."""
+        starts[index] = time.monotonic()
+        return self._execute_materialized(spider, html, url)
+
+    def _wait_started(self, pool: _WorkerPool, futures: list[Future], starts: list[float | None]) -> set[Future]:
+        """Attende i future con run_timeout contato dall'avvio di ciascuno; restituisce quelli scaduti (abbandonati).
+
+        Uno spider ancora in coda non scade, salvo che tutti i worker del pool siano occupati da spider abbandonati.
+        """
+        if self.run_timeout is None:
+            wait(futures)
+            return set()
+        expired: set[Future] = set()
+        while True:
+            now = time.monotonic()
+            deadlines = []
+            queued = []
+            for future, started in zip(futures, starts):
+                if future.done() or future in expired:
+                    continue
+                if started is None:
+                    queued.append(future)
+                elif now >= started + self.run_timeout:
+                    expired.add(future)
+                    pool.abandon(future)
+                else:
+                    deadlines.append(started + self.run_timeout)
+            if queued and not deadlines and pool.busy() >= pool.workers:
+                for future in queued:
+                    expired.add(future)
+                    pool.abandon(future)
+                return expired
+            if not queued and not deadlines:
+                return expired
+            timeout = min(deadlines) - now if deadlines else QUEUED_POLL_SECONDS
+            if queued:
+                timeout = min(timeout, QUEUED_POLL_SECONDS)
+            wait([future for future in futures if future not in expired], timeout=timeout, return_when=FIRST_COMPLETED)
+
+    def _submit(self, calls: list[tuple]) -> tuple[_WorkerPool, list[Future]]:
+        """Accoda le chiamate (fn, *args) nel pool dell'engine (default: un thread per spider).
+
+        Se il pool ha worker occupati da spider scaduti viene sostituito: il vecchio termina i lavori in corso
+        e si chiude da solo, così gli spider dei run successivi non attendono dietro a worker bloccati.
+        """
+        with self._pool_lock:
+            pool = self._thread_pool
+            busy = pool.busy() if pool is not None else 0
+            if busy:
+                LOG.warning("scraper engine: %d workers held by timed-out spiders, starting a new pool", busy)
+                pool.executor.shutdown(wait=False)
+                pool = None
+            if pool is None:
+                pool = self._thread_pool = _WorkerPool(self.max_workers or max(1, len(self.spiders)))
+            return pool, [pool.executor.submit(*call) for call in calls]
+
+    def _failed(self, spider, reason: str, detail: str) -> _SpiderFailed:
+        """Registra lo spider escluso dal run (log, metrica, last_run_errors)."""
+        name = spider.__class__.__name__
+        self.last_run_errors[name] = f"{reason}: {detail}"
+        record_engine_spider_error(name, reason)
+        LOG.warning("scraper engine: spider %s excluded from run (%s: %s)", name, reason, detail)
+        return _SpiderFailed(reason, detail)
+
+    def _consume(self, outputs) -> list:
+        """Pipeline, normalizzazione e intelligence degli output in ordine di registrazione degli spider."""
+        results_list: list = []
+        for stables in self._normalized(outputs):
+            results_list.extend(self._persist(self._score(stables)))
+        return results_list
+
+    def _normalized(self, outputs) -> Iterator[list[dict]]:
+        """Per ogni batch (multi_ad) o risultato singolo: dedupe nella pipeline e schema stabile normalizzato."""
+        for spider, output in zip(self.spiders, outputs):
+            if isinstance(output, _SpiderFailed):
+                continue
+            batches = output if getattr(spider, "multi_ad", False) else [[self._to_dict(output)]]
+            for batch in batches:
+                processed_batch = self.pipeline.process_batch(batch)
+                if processed_batch:
+                    yield [self._stable(spider, processed) for processed in processed_batch]
+
+    @staticmethod
+    def _uses_shared_fetch(spider) -> bool:
+        """True se lo spider accetta il corpo condiviso (BaseSpider con shared_fetch attivo)."""
+        return getattr(spider, "shared_fetch", False) and hasattr(spider, "process")
+
+    def _score(self, stables: list[dict]) -> list[dict]:
+        """Intelligence valutata con evaluate_many sui dati normalizzati (copy normalizzati insieme)."""
+        datas = [stable["data"] for stable in stables]
+        for data, intelligence in zip(datas, self.intelligence_engine.evaluate_many(datas)):
             data.update(intelligence)
+        return stables
+
+    def _persist(self, stables: list[dict]) -> list[dict]:
+        """Salvataggio nel result_store."""
+        for stable in stables:
             self.result_store.add(stable)
-            results_list.append(stable)
-        return results_list
+        return stables
+
+    def _stable(self, spider, processed: dict) -> dict:
+        """Schema stabile {source, data} con data normalizzato."""
+        if "data" not in processed:
+            stable = {"source": spider.__class__.__name__, "data": processed}
+        else:
+            stable = processed
+        normalized = self.normalizer.normalize(
+            stable["data"],
+            source=stable.get("source") or spider.__class__.__name__,
+        )
+        if normalized is not None:
+            stable["data"] = normalized
+        return stable
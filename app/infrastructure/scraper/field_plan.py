@@ -0,0 +1,68 @@
+"""Piano di estrazione multi-campo da JSON annidato: una sola visita per blob, chiavi per priorità.
+
+FieldPlan compila le chiavi di tutti i campi in un indice chiave -> (campo, priorità): a ogni dict si
+scorrono le sue chiavi una volta sola, invece di ripetere la ricerca ricorsiva per ogni campo.
+Semantica di ricerca (per campo) identica alla visita in pre-ordine con priorità delle chiavi:
+vince il primo nodo che contiene una delle chiavi; valore None -> campo non trovato in quel sotto-albero.
+"""
+
+from collections.abc import Iterable
+from typing import Any
+
+# Oltre questa profondità i nodi non vengono visitati (JSON patologici / ricorsione Python)
+DEFAULT_MAX_DEPTH = 64
+
+
+class FieldPlan:
+    """Campi da estrarre (nome -> chiavi in ordine di priorità), compilati in un indice per chiave."""
+
+    def __init__(self, fields: dict[str, tuple[str, ...]], max_depth: int = DEFAULT_MAX_DEPTH) -> None:
+        self.fields = dict(fields)
+        self.max_depth = max_depth
+        self._index: dict[str, list[tuple[str, int]]] = {}
+        for name, keys in self.fields.items():
+            for priority, key in enumerate(keys):
+                self._index.setdefault(key, []).append((name, priority))
+
+    def extract(self, obj: Any, fields: Iterable[str] | None = None) -> dict[str, Any]:
+        """Valori trovati per i campi richiesti (default: tutti); i campi assenti non compaiono nel dict."""
+        requested = tuple(dict.fromkeys(self.fields if fields is None else fields))
+        unknown = set(requested) - set(self.fields)
+        if unknown:
+            raise ValueError(f"Unknown plan fields: {sorted(unknown)}")
+        found: dict[str, Any] = {}
+        if requested:
+            self._walk(obj, requested, 0, found, len(requested))
+        return found
+
+    def _walk(self, node: Any, active: tuple[str, ...], depth: int, found: dict[str, Any], total: int) -> bool:
+        """Visita in pre-ordine; True quando tutti i campi sono stati trovati (stop immediato)."""
+        if depth > self.max_depth:
+            return False
+        if isinstance(node, dict):
+            hits: dict[str, tuple[int, str]] = {}
+            for key in node:
+                for name, priority in self._index.get(key, ()):
+                    if name in active and (name not in hits or priority < hits[name][0]):
+                        hits[name] = (priority, key)
+            for name, (_, key) in hits.items():
+                if node[key] is not None:
+                    found[name] = node[key]
+            if hits:
+                if len(found) == total:
+                    return True
+                # Campo trovato qui (o None: non cercato nel sotto-albero, come la ricerca ricorsiva storica)
+                active = tuple(name for name in active if name not in hits)
+            children = node.values()
+        elif isinstance(node, list):
+            children = node
+        else:
+            return False
+        for child in children:
+            if isinstance(child, (dict, list)):
+                remaining = tuple(name for name in active if name not in found)
+                if not remaining:
+                    return False
+                if self._walk(child, remaining, depth + 1, found, total):
+                    return True
+        return False
@@ -0,0 +1,154 @@
+"""Estrazione a singola passata (html.parser.HTMLParser, senza DOM) di title, meta, canonical e input hidden.
+
+Gli eventi del parser alimentano direttamente il risultato: nessun albero viene costruito e la lettura
+si interrompe appena i campi richiesti sono completi. I campi del <head> (title, meta, canonical) si
+considerano completi a </head> o all'apertura di <body>; gli input hidden richiedono l'intero documento.
+"""
+
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from html.parser import HTMLParser
+
+FIELD_TITLE = "title"
+FIELD_META = "meta"
+FIELD_CANONICAL = "canonical"
+FIELD_HIDDEN_INPUTS = "hidden_inputs"
+HEAD_FIELDS = frozenset({FIELD_TITLE, FIELD_META, FIELD_CANONICAL})
+ALL_FIELDS = HEAD_FIELDS | {FIELD_HIDDEN_INPUTS}
+
+
+@dataclass
+class HeadData:
+    """Campi estratti: meta per name/property (lowercase, vince la prima), hidden inputs name -> value (vince l'ultimo)."""
+
+    title: str | None = None
+    meta: dict[str, str | None] = field(default_factory=dict)
+    canonical: str | None = None
+    hidden_inputs: dict[str, str] = field(default_factory=dict)
+
+    @property
+    def description(self) -> str | None:
+        """Contenuto di meta name="description" (senza spazi esterni); None se assente o vuoto."""
+        content = self.meta.get("description")
+        return content.strip() if content else None
+
+
+class _StopParsing(Exception):
+    """Interrompe feed() quando i campi richiesti sono completi."""
+
+
+class _HeadEventParser(HTMLParser):
+    """Handler SAX-like: aggiorna HeadData a ogni tag e solleva _StopParsing a campi completi."""
+
+    def __init__(self, fields: frozenset[str], meta_names: frozenset[str] | None) -> None:
+        super().__init__(convert_charrefs=True)
+        self.fields = fields
+        self.meta_names = meta_names
+        self.data = HeadData()
+        self._head_done = False
+        self._in_title = False
+        self._title_done = False
+        self._title_parts: list[str] = []
+
+    def _complete(self, name: str) -> bool:
+        if name == FIELD_HIDDEN_INPUTS:
+            return False
+        if self._head_done:
+            return True
+        if name == FIELD_TITLE:
+            return self._title_done
+        if name == FIELD_CANONICAL:
+            return self.data.canonical is not None
+        return self.meta_names is not None and self.meta_names.issubset(self.data.meta)
+
+    def _maybe_stop(self) -> None:
+        if all(self._complete(name) for name in self.fields):
+            raise _StopParsing
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        if tag == "input":
+            if FIELD_HIDDEN_INPUTS in self.fields:
+                self._hidden_input(dict(attrs))
+            return
+        if self._head_done:
+            return
+        if tag == "meta":
+            if FIELD_META in self.fields:
+                self._meta(dict(attrs))
+        elif tag == "link":
+            if FIELD_CANONICAL in self.fields and self.data.canonical is None:
+                attributes = dict(attrs)
+                if "canonical" in (attributes.get("rel") or "").lower().split():
+                    self.data.canonical = attributes.get("href")
+                    self._maybe_stop()
+        elif tag == "title":
+            if FIELD_TITLE in self.fields and not self._title_done:
+                self._in_title = True
+        elif tag == "body":
+            self._end_head()
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag == "title" and self._in_title:
+            self._close_title()
+            self._maybe_stop()
+        elif tag == "head":
+            self._end_head()
+
+    def handle_data(self, data: str) -> None:
+        if self._in_title:
+            self._title_parts.append(data)
+
+    def _close_title(self) -> None:
+        self._in_title = False
+        self._title_done = True
+        self.data.title = "".join(part.strip() for part in self._title_parts)
+
+    def finish(self) -> HeadData:
+        """Chiude un <title> rimasto aperto a fine documento e restituisce i dati."""
+        if self._in_title:
+            self._close_title()
+        return self.data
+
+    def _end_head(self) -> None:
+        if not self._head_done:
+            self._head_done = True
+            self._maybe_stop()
+
+    def _meta(self, attributes: dict[str, str | None]) -> None:
+        key = attributes.get("name") or attributes.get("property")
+        if not key:
+            return
+        key = key.lower()
+        if self.meta_names is not None and key not in self.meta_names:
+            return
+        if key not in self.data.meta:
+            self.data.meta[key] = attributes.get("content")
+            self._maybe_stop()
+
+    def _hidden_input(self, attributes: dict[str, str | None]) -> None:
+        if (attributes.get("type") or "").lower() != "hidden":
+            return
+        name = attributes.get("name")
+        value = attributes.get("value")
+        if name is not None and value is not None:
+            self.data.hidden_inputs[name] = value
+
+
+def extract_head(
+    html: str,
+    fields: Iterable[str] = HEAD_FIELDS,
+    meta_names: Iterable[str] | None = None,
+) -> HeadData:
+    """Estrae i campi richiesti (FIELD_*) in una passata; meta_names limita i meta raccolti e anticipa lo stop."""
+    requested = frozenset(fields)
+    unknown = requested - ALL_FIELDS
+    if unknown:
+        raise ValueError(f"Unknown head extractor fields: {sorted(unknown)}")
+    names = frozenset(name.lower() for name in meta_names) if meta_names is not None else None
+    parser = _HeadEventParser(requested, names)
+    try:
+        parser.feed(html)
+        parser.close()
+    except _StopParsing:
+        pass
+    return parser.finish()
@@ -1,39 +1,123 @@
-"""Parser HTML: BeautifulSoup con html.parser. Nessuna richiesta HTTP né DB."""
+"""Parser HTML con backend selezionabile: BeautifulSoup (html.parser o lxml) o albero lxml.html nativo.
 
+Stessa API (find_by_tag, find_by_class, find_all_by_attribute, get_title, extract_text) su tutti i backend.
+Con il backend nativo gli elementi sono lxml.html.HtmlElement: per attributi e testo usare
+element.get(attr) ed extract_text(element), comuni a tutti i backend. Nessuna richiesta HTTP né DB.
+"""
+
+from collections.abc import Iterator
+
+import lxml.html
 from bs4 import BeautifulSoup
 from bs4.element import Tag
+from lxml import etree
+
+BACKEND_HTML_PARSER = "html.parser"
+BACKEND_BS4_LXML = "lxml"
+BACKEND_LXML = "lxml.html"
+BACKENDS = (BACKEND_HTML_PARSER, BACKEND_BS4_LXML, BACKEND_LXML)
+# Default storico (oggetti bs4 Tag) per i consumer esistenti
+DEFAULT_BACKEND = BACKEND_HTML_PARSER
+# Come bs4: testo di script/style/template escluso da extract_text, attributi multi-valore confrontati per token
+SKIP_TEXT_TAGS = frozenset({"script", "style", "template"})
+MULTI_VALUED_ATTRIBUTES = frozenset({"class", "rel", "rev"})
+
+# XPath: classe come token di @class (stessa semantica di class_ in bs4)
+_CLASS_XPATH = "descendant-or-self::{tag}[contains(concat(' ', normalize-space(@class), ' '), concat(' ', $name, ' '))]"
+
+
+def _lxml_document(html: str):
+    """Albero lxml.html del documento; None se vuoto (bs4 in quel caso restituisce un albero vuoto)."""
+    try:
+        try:
+            return lxml.html.document_fromstring(html)
+        except ValueError:
+            # Stringa con dichiarazione di encoding (<?xml ... encoding=...?>): lxml accetta solo bytes
+            return lxml.html.document_fromstring(html.encode("utf-8"), parser=lxml.html.HTMLParser(encoding="utf-8"))
+    except etree.ParserError:
+        # Documento vuoto, anche dopo la sola dichiarazione XML
+        return None
+
+
+def _visible_text(element) -> Iterator[str]:
+    """Testo del sottoalbero lxml senza script/style/template discendenti e commenti (tail inclusi)."""
+    if element.text:
+        yield element.text
+    for child in element:
+        if isinstance(child.tag, str) and child.tag not in SKIP_TEXT_TAGS:
+            yield from _visible_text(child)
+        if child.tail:
+            yield child.tail
+
+
+def _attribute_matches(raw: str | None, attribute: str, value: str) -> bool:
+    """Valore esatto; per gli attributi multi-valore anche un singolo token (es. rel="canonical alternate")."""
+    if raw is None:
+        return False
+    if attribute not in MULTI_VALUED_ATTRIBUTES:
+        return raw == value
+    tokens = raw.split()
+    return value in tokens or value == " ".join(tokens)
 
 
 class HtmlParser:
     """Parsing HTML da stringa: trova elementi per tag/classe, estrae testo. Indipendente e riutilizzabile."""
 
-    def __init__(self, html: str) -> None:
-        self._soup = BeautifulSoup(html, "html.parser")
+    def __init__(self, html: str, backend: str = DEFAULT_BACKEND) -> None:
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown HtmlParser backend: {backend!r} (expected one of {BACKENDS})")
+        self.backend = backend
+        self._soup = None
+        self._root = None
+        if backend == BACKEND_LXML:
+            self._root = _lxml_document(html)
+        else:
+            self._soup = BeautifulSoup(html, backend)
+
+    def _iter(self, tag: str) -> list:
+        """Elementi con il tag indicato nell'albero lxml (ordine di documento)."""
+        if self._root is None:
+            return []
+        return list(self._root.iter(tag.lower()))
 
     def find_by_tag(self, tag: str) -> list[Tag]:
         """Restituisce tutti gli elementi con il tag indicato."""
-        return self._soup.find_all(tag)
+        if self._soup is not None:
+            return self._soup.find_all(tag)
+        return self._iter(tag)
 
     def find_all_by_tag(self, tag_name: str) -> list:
         """Restituisce tutti i tag trovati con find_all(tag_name); lista vuota se non trovati."""
-        return self._soup.find_all(tag_name)
+        return self.find_by_tag(tag_name)
 
     def find_all_by_attribute(self, tag: str, attribute: str, value: str) -> list:
         """Restituisce tutti gli elementi con tag e attributo=valore; lista vuota se non trovati."""
-        return self._soup.find_all(tag, attrs={attribute: value})
+        if self._soup is not None:
+            return self._soup.find_all(tag, attrs={attribute: value})
+        attribute = attribute.lower()
+        return [el for el in self._iter(tag) if _attribute_matches(el.get(attribute), attribute, value)]
 
     def find_by_class(self, class_name: str, tag: str | None = None) -> list[Tag]:
         """Restituisce tutti gli elementi con la classe indicata; opzionale filtro per tag."""
-        if tag is None:
-            return self._soup.find_all(class_=class_name)
-        return self._soup.find_all(tag, class_=class_name)
+        if self._soup is not None:
+            if tag is None:
+                return self._soup.find_all(class_=class_name)
+            return self._soup.find_all(tag, class_=class_name)
+        if self._root is None:
+            return []
+        return self._root.xpath(_CLASS_XPATH.format(tag=tag.lower() if tag else "*"), name=class_name)
 
     def get_title(self) -> str | None:
         """Restituisce il contenuto del tag <title> se presente, None altrimenti."""
-        title = self._soup.find("title")
-        return title.get_text(strip=True) if title else None
+        if self._soup is not None:
+            title = self._soup.find("title")
+        else:
+            title = next(self._root.iter("title"), None) if self._root is not None else None
+        return self.extract_text(title) if title is not None else None
 
     @staticmethod
-    def extract_text(element: Tag) -> str:
+    def extract_text(element) -> str:
         """Estrae il testo da un elemento (es. risultato di find_by_tag / find_by_class)."""
-        return element.get_text(strip=True)
+        if isinstance(element, Tag):
+            return element.get_text(strip=True)
+        return "".join(part.strip() for part in _visible_text(element))
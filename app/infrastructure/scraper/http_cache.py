@@ -0,0 +1,190 @@
+"""Cache HTTP per GET condizionali (ETag / Last-Modified) sotto lo scraper HttpClient.
+
+Salva validator e corpo per url; alla richiesta successiva invia If-None-Match / If-Modified-Since
+e su 304 restituisce il corpo in cache. Backend su disco (file JSON) o Redis (opzionale, degradabile),
+entrambi limitati: TTL per voce (expiry Redis, mtime del file su disco) e numero massimo di file su disco.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from abc import ABC, abstractmethod
+from dataclasses import asdict, dataclass
+
+from app.cache.redis_client import RedisCacheClient, get_redis_client
+from app.core.config import Settings
+
+DEFAULT_CACHE_DIR = ".cache/http"
+DEFAULT_TTL_SECONDS = 86_400
+DEFAULT_DISK_MAX_ENTRIES = 10_000
+# Oltre max_entries l'eviction scende a questa frazione, così la scansione della directory non avviene a ogni set
+DISK_EVICT_TARGET_RATIO = 0.9
+ENTRY_SUFFIX = ".json"
+REDIS_KEY_PREFIX = "scraper:http:"
+
+
+@dataclass
+class CachedResponse:
+    """Corpo e validator di una risposta 200 già scaricata."""
+
+    body: str
+    etag: str | None = None
+    last_modified: str | None = None
+
+    def conditional_headers(self) -> dict:
+        """Headers per la GET condizionale (solo i validator disponibili)."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+def cache_key(url: str, head_only: bool = False) -> str:
+    """Chiave cache per url; le fetch head_only (corpo parziale) hanno una voce separata."""
+    return f"{url}#head" if head_only else url
+
+
+def _key_digest(key: str) -> str:
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+
+class HttpCache(ABC):
+    """Contratto backend cache HTTP: get/set per chiave (url). Errori mai propagati al fetch."""
+
+    @abstractmethod
+    def get(self, key: str) -> CachedResponse | None:
+        """Restituisce la voce in cache o None."""
+
+    @abstractmethod
+    def set(self, key: str, entry: CachedResponse) -> None:
+        """Salva (o sostituisce) la voce in cache."""
+
+
+class DiskHttpCache(HttpCache):
+    """Cache su filesystem: un file JSON per chiave (sha256), scrittura atomica.
+
+    Voci più vecchie di ttl_seconds (mtime) sono scadute e rimosse alla lettura; oltre max_entries file
+    vengono rimossi gli scaduti e poi i più vecchi fino a DISK_EVICT_TARGET_RATIO * max_entries.
+    """
+
+    def __init__(
+        self,
+        directory: str = DEFAULT_CACHE_DIR,
+        ttl_seconds: int = DEFAULT_TTL_SECONDS,
+        max_entries: int = DEFAULT_DISK_MAX_ENTRIES,
+    ) -> None:
+        self.directory = directory
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        self._entries = len(self._scan())
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{_key_digest(key)}{ENTRY_SUFFIX}")
+
+    def _expired(self, mtime: float) -> bool:
+        return self.ttl_seconds > 0 and time.time() - mtime > self.ttl_seconds
+
+    def _scan(self) -> list[tuple[float, str]]:
+        """(mtime, path) delle voci su disco, dalla più vecchia."""
+        entries = []
+        with os.scandir(self.directory) as it:
+            for item in it:
+                if item.name.endswith(ENTRY_SUFFIX):
+                    try:
+                        entries.append((item.stat().st_mtime, item.path))
+                    except OSError:
+                        continue
+        entries.sort()
+        return entries
+
+    def _remove(self, path: str) -> None:
+        try:
+            os.remove(path)
+        except OSError:
+            return
+        with self._lock:
+            self._entries -= 1
+
+    def _evict(self) -> None:
+        """Rimuove le voci scadute e poi le più vecchie fino alla soglia target."""
+        try:
+            entries = self._scan()
+        except OSError:
+            return
+        with self._lock:
+            self._entries = len(entries)
+        excess = len(entries) - int(self.max_entries * DISK_EVICT_TARGET_RATIO)
+        for index, (mtime, path) in enumerate(entries):
+            if index >= excess and not self._expired(mtime):
+                break
+            self._remove(path)
+
+    def get(self, key: str) -> CachedResponse | None:
+        path = self._path(key)
+        try:
+            with open(path, encoding="utf-8") as fh:
+                if not self._expired(os.fstat(fh.fileno()).st_mtime):
+                    return CachedResponse(**json.load(fh))
+        except (OSError, ValueError, TypeError):
+            return None
+        self._remove(path)
+        return None
+
+    def set(self, key: str, entry: CachedResponse) -> None:
+        path = self._path(key)
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as fh:
+                json.dump(asdict(entry), fh)
+            is_new = not os.path.exists(path)
+            os.replace(tmp_path, path)
+        except OSError:
+            return
+        if is_new:
+            with self._lock:
+                self._entries += 1
+                full = self._entries > self.max_entries
+            if full:
+                self._evict()
+
+
+class RedisHttpCache(HttpCache):
+    """Cache su Redis (RedisCacheClient): valore JSON con TTL; silenziosa se Redis non disponibile."""
+
+    def __init__(self, client: RedisCacheClient, ttl_seconds: int = DEFAULT_TTL_SECONDS) -> None:
+        self._client = client
+        self.ttl_seconds = ttl_seconds
+
+    def get(self, key: str) -> CachedResponse | None:
+        raw = self._client.get(REDIS_KEY_PREFIX + _key_digest(key))
+        if raw is None:
+            return None
+        try:
+            return CachedResponse(**json.loads(raw))
+        except (ValueError, TypeError):
+            return None
+
+    def set(self, key: str, entry: CachedResponse) -> None:
+        self._client.set(REDIS_KEY_PREFIX + _key_digest(key), json.dumps(asdict(entry)), ttl_seconds=self.ttl_seconds)
+
+
+def build_http_cache(settings: Settings) -> HttpCache | None:
+    """Factory da config: scraper_http_cache_backend = none | disk | redis."""
+    backend = settings.scraper_http_cache_backend.lower()
+    if backend == "disk":
+        return DiskHttpCache(
+            settings.scraper_http_cache_dir,
+            ttl_seconds=settings.scraper_http_cache_ttl_seconds,
+            max_entries=settings.scraper_http_cache_max_entries,
+        )
+    if backend == "redis":
+        client = get_redis_client(host=settings.redis_host, port=settings.redis_port, enabled=True)
+        return RedisHttpCache(client, ttl_seconds=settings.scraper_http_cache_ttl_seconds)
+    return None
@@ -5,19 +5,47 @@ exponential backoff + jitter, e integrazione con HttpClient/fetch_page.
 """
 
 import random
+import threading
 import time
+from dataclasses import dataclass
+
 import requests
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
 
+from app.core.logging import get_logger
+from app.core.metrics import (
+    observe_fetch_seconds,
+    observe_response_bytes,
+    observe_ttfb_seconds,
+    record_http_cache,
+    record_response_status,
+    record_retry,
+    record_sleep_seconds,
+)
+from app.infrastructure.scraper.circuit_breaker import (
+    HostCircuitBreaker,
+    RetryBudget,
+    default_circuit_breaker,
+    default_retry_budget,
+)
+from app.infrastructure.scraper.http_cache import CachedResponse, HttpCache, cache_key as http_cache_key
+from app.infrastructure.scraper.politeness import HostPoliteness, default_politeness
+from app.infrastructure.scraper.streaming import (
+    MAX_BODY_BYTES,
+    MAX_HEAD_BYTES,
+    STREAM_CHUNK_SIZE,
+    BodyAccumulator,
+)
+from app.infrastructure.scraper.transport import TransportRegistry, default_transport
+from app.infrastructure.scraper.urls import host_of
+
+LOG = get_logger("app")
 
 DEFAULT_TIMEOUT = 10
 MAX_RETRIES = 3
 RETRY_DELAY_SECONDS = 1
+SUCCESS_STATUS_CODES = (200, 304)
 RETRY_STATUS_CODES = (500, 502, 503, 504)
 BLOCK_STATUS_CODES = (403, 429)
-DELAY_BEFORE_REQUEST_MIN = 1.0
-DELAY_BEFORE_REQUEST_MAX = 3.0
 BACKOFF_BASE = 2
 BACKOFF_JITTER_MAX = 2.0
 BACKOFF_CAP_SEC = 60
@@ -63,35 +91,40 @@ def _exponential_backoff_with_jitter(attempt: int) -> float:
     return base_delay + jitter
 
 
-def _human_delay(min_sec: float = DELAY_BEFORE_REQUEST_MIN, max_sec: float = DELAY_BEFORE_REQUEST_MAX) -> None:
-    """Delay casuale per simulare comportamento umano (riduce rilevamento bot)."""
-    time.sleep(random.uniform(min_sec, max_sec))
-
-
 class RealisticSession:
-    """Sessione HTTP persistente: cookie e stato in memoria, headers realistici, fetch_with_retry per 403/429."""
+    """Sessione HTTP persistente: cookie e stato in memoria, headers realistici, fetch_with_retry per 403/429.
 
-    def __init__(self) -> None:
-        self.session = requests.Session()
+    Il distanziamento tra richieste è per-host (HostPoliteness condivisa): host diversi non si attendono.
+    Le connessioni arrivano dal TransportRegistry di processo; gli headers sono per richiesta
+    (nessuna mutazione di stato condiviso), quindi la sessione è usabile da più thread.
+    """
+
+    def __init__(
+        self,
+        politeness: HostPoliteness | None = None,
+        transport: TransportRegistry | None = None,
+        circuit_breaker: HostCircuitBreaker | None = None,
+        retry_budget: RetryBudget | None = None,
+    ) -> None:
+        self.politeness = politeness if politeness is not None else default_politeness
+        self.circuit_breaker = circuit_breaker if circuit_breaker is not None else default_circuit_breaker
+        self.retry_budget = retry_budget if retry_budget is not None else default_retry_budget
+        self.transport = transport if transport is not None else default_transport
+        self.session = self.transport.new_session()
         self._user_agents = list(USER_AGENTS)
-        self.session.headers["User-Agent"] = random.choice(self._user_agents)
-        self.session.headers.update(SESSION_DEFAULT_HEADERS)
-        retry = Retry(
-            total=MAX_RETRIES,
-            backoff_factor=0.5,
-            status_forcelist=list(RETRY_STATUS_CODES),
-        )
-        adapter = HTTPAdapter(max_retries=retry)
-        self.session.mount("http://", adapter)
-        self.session.mount("https://", adapter)
+        self._headers: dict = dict(SESSION_DEFAULT_HEADERS)
 
     @property
-    def headers(self):
-        """Espone gli headers della sessione (per compatibilità con fetch_page e HttpClient)."""
-        return self.session.headers
+    def headers(self) -> dict:
+        """Headers di default della sessione (per compatibilità con fetch_page e HttpClient)."""
+        return self._headers
+
+    def _next_user_agent(self) -> str:
+        return random.choice(self._user_agents)
 
-    def _rotate_user_agent(self) -> None:
-        self.session.headers["User-Agent"] = random.choice(self._user_agents)
+    def _request_headers(self, headers: dict | None) -> dict:
+        """Headers della singola richiesta: default sessione + User-Agent ruotato + custom (sovrascrivono)."""
+        return {**self._headers, "User-Agent": self._next_user_agent(), **(headers or {})}
 
     def get(
         self,
@@ -104,12 +137,19 @@ class RealisticSession:
         """GET tramite sessione: headers di default + eventuali custom (sovrascrivono), timeout, redirect. Rilancia RequestException."""
         return self.session.get(
             url,
-            headers=headers,
+            headers=self._request_headers(headers),
             timeout=timeout,
             allow_redirects=allow_redirects,
             **kwargs,
         )
 
+    def _backoff(self, host: str, attempt: int, reason: str) -> None:
+        """Attesa prima del retry (backoff con jitter), contabilizzata nelle metriche."""
+        delay = _exponential_backoff_with_jitter(attempt)
+        record_retry(host, reason)
+        record_sleep_seconds(host, "backoff", delay)
+        time.sleep(delay)
+
     def fetch_with_retry(
         self,
         url: str,
@@ -117,49 +157,169 @@ class RealisticSession:
         timeout: int = DEFAULT_TIMEOUT,
         **kwargs,
     ) -> requests.Response:
-        """GET con retry su 403/429 usando exponential backoff con jitter (comportamento umano)."""
+        """GET con retry su 403/429/5xx e timeout (exponential backoff con jitter), politeness per-host.
+
+        Prima di ogni tentativo consulta il circuit breaker dell'host (CircuitOpenError se aperto);
+        ogni retry consuma un token del RetryBudget globale: a budget esaurito l'errore è propagato subito.
+        Per tentativo registra TTFB e status; retry e attese (politeness, backoff) finiscono nelle metriche per host.
+        L'attesa di politeness è un time.sleep che occupa il thread chiamante per tutto il gap dell'host:
+        con molti url sullo stesso host nel pool di worker conviene AsyncHttpClient (asyncio.sleep) o
+        raggruppare gli url per host a monte.
+        """
+        host = host_of(url)
+        self.retry_budget.record_request()
         for attempt in range(max_retries):
-            self._rotate_user_agent()
-            _human_delay(DELAY_BEFORE_REQUEST_MIN, DELAY_BEFORE_REQUEST_MAX)
-            response = self.get(url, timeout=timeout, allow_redirects=True, **kwargs)
-            if response.status_code == 200:
-                time.sleep(random.uniform(0.3, 0.7))
-                return response
-            if response.status_code in BLOCK_STATUS_CODES:
-                if attempt < max_retries - 1:
-                    delay = _exponential_backoff_with_jitter(attempt)
+            probe = self.circuit_breaker.before_request(url)
+            try:
+                delay = self.politeness.reserve(url)
+                if delay > 0:
+                    record_sleep_seconds(host, "politeness", delay)
                     time.sleep(delay)
-                    continue
-                response.raise_for_status()
-            if response.status_code in RETRY_STATUS_CODES:
-                if attempt < max_retries - 1:
-                    time.sleep(_exponential_backoff_with_jitter(attempt))
-                    continue
-                response.raise_for_status()
-            response.raise_for_status()
+                can_retry = attempt < max_retries - 1
+                started = time.perf_counter()
+                try:
+                    response = self.get(url, timeout=timeout, allow_redirects=True, **kwargs)
+                except requests.RequestException:
+                    record_response_status(host, "error")
+                    self.circuit_breaker.record_failure(url)
+                    if can_retry and self.retry_budget.try_acquire():
+                        self._backoff(host, attempt, "transport")
+                        continue
+                    raise
+                observe_ttfb_seconds(host, time.perf_counter() - started)
+                record_response_status(host, response.status_code)
+                if response.status_code in BLOCK_STATUS_CODES or response.status_code in RETRY_STATUS_CODES:
+                    self.circuit_breaker.record_failure(url)
+                    if can_retry and self.retry_budget.try_acquire():
+                        response.close()
+                        self._backoff(host, attempt, "status")
+                        continue
+                    _raise_for_status(response)
+                self.circuit_breaker.record_success(url)
+                if response.status_code in SUCCESS_STATUS_CODES:
+                    return response
+                _raise_for_status(response)
+                return response
+            except BaseException:
+                # Prova half-open senza esito (cancellazione, errore inatteso): lo slot non resta occupato
+                self.circuit_breaker.release_probe(url, probe)
+                raise
         raise RuntimeError("fetch_with_retry exhausted retries without returning")
 
 
+def _raise_for_status(response: requests.Response) -> None:
+    """raise_for_status chiudendo prima la risposta: con stream=True la connessione torna al pool."""
+    try:
+        response.raise_for_status()
+    except requests.HTTPError:
+        response.close()
+        raise
+
+
+_shared_session: RealisticSession | None = None
+_shared_session_lock = threading.Lock()
+
+
+def _get_shared_session() -> RealisticSession:
+    """RealisticSession di modulo per fetch_page (creata una sola volta)."""
+    global _shared_session
+    with _shared_session_lock:
+        if _shared_session is None:
+            _shared_session = RealisticSession()
+        return _shared_session
+
+
 def fetch_page(url: str, headers: dict | None = None) -> str:
-    """GET verso url; headers opzionali (sovrascrivono DEFAULT_HEADERS), timeout 10s. Usa RealisticSession e retry."""
-    session = RealisticSession()
-    session.headers.update(headers or {})
-    response = session.fetch_with_retry(url, timeout=DEFAULT_TIMEOUT)
+    """GET verso url; headers opzionali (sovrascrivono i default), timeout 10s. Sessione condivisa e retry."""
+    response = _get_shared_session().fetch_with_retry(url, timeout=DEFAULT_TIMEOUT, headers=headers)
     return response.text
 
 
+@dataclass
+class FetchResult:
+    """Esito di HttpClient.fetch: corpo, status HTTP, flag not_modified (304 servito dalla cache) e truncated
+    (corpo tagliato al limite max_body_bytes / max_head_bytes: parziale, non salvato in cache)."""
+
+    text: str
+    status_code: int
+    not_modified: bool = False
+    truncated: bool = False
+
+
 class HttpClient:
-    """Esegue richieste HTTP GET tramite RealisticSession; headers e timeout configurabili."""
+    """Esegue richieste HTTP GET tramite RealisticSession; headers e timeout configurabili. Thread-safe.
+
+    Con cache (HttpCache) le GET diventano condizionali: su 304 il corpo arriva dalla cache.
+    Il corpo è letto in streaming con limite max_body_bytes; con head_only la lettura si ferma a </head>.
+    """
 
-    def __init__(self, timeout: int = DEFAULT_TIMEOUT, headers: dict | None = None) -> None:
+    def __init__(
+        self,
+        timeout: int = DEFAULT_TIMEOUT,
+        headers: dict | None = None,
+        cache: HttpCache | None = None,
+        max_body_bytes: int = MAX_BODY_BYTES,
+        max_head_bytes: int = MAX_HEAD_BYTES,
+    ) -> None:
         self.timeout = timeout
         self._headers = dict(headers) if headers else {}
         self.session: RealisticSession = RealisticSession()
-        self.session.headers.update(self._headers)
-
-    def get(self, url: str) -> str:
-        """GET verso url tramite RealisticSession.fetch_with_retry; restituisce response.text."""
-        for key, value in self._headers.items():
-            self.session.headers[key] = value
-        response = self.session.fetch_with_retry(url, timeout=self.timeout)
-        return response.text
+        self.cache = cache
+        self.max_body_bytes = max_body_bytes
+        self.max_head_bytes = max_head_bytes
+
+    def _read_text(self, response: requests.Response, head_only: bool, host: str) -> tuple[str, bool]:
+        """Legge il corpo a chunk (stop a </head> o al limite); (testo decodificato, True se tagliato al limite)."""
+        accumulator = BodyAccumulator(
+            head_only=head_only,
+            max_bytes=self.max_head_bytes if head_only else self.max_body_bytes,
+        )
+        for chunk in response.iter_content(chunk_size=STREAM_CHUNK_SIZE):
+            if accumulator.feed(chunk):
+                break
+        observe_response_bytes(host, accumulator.size)
+        if accumulator.truncated:
+            LOG.warning("http client: body from %s truncated at %d bytes", host, accumulator.max_bytes)
+        return accumulator.text(response.encoding), accumulator.truncated
+
+    def fetch(self, url: str, head_only: bool = False) -> FetchResult:
+        """GET (condizionale se c'è una voce in cache) tramite fetch_with_retry; restituisce FetchResult.
+
+        La durata complessiva (retry, attese e lettura del corpo inclusi) è osservata per host.
+        """
+        started = time.perf_counter()
+        try:
+            return self._fetch(url, head_only)
+        finally:
+            observe_fetch_seconds(host_of(url), time.perf_counter() - started)
+
+    def _fetch(self, url: str, head_only: bool) -> FetchResult:
+        cache_key = http_cache_key(url, head_only)
+        entry = self.cache.get(cache_key) if self.cache is not None else None
+        headers = {**self._headers, **entry.conditional_headers()} if entry else self._headers
+        response = self.session.fetch_with_retry(url, timeout=self.timeout, headers=headers, stream=True)
+        try:
+            if self.cache is not None and response.status_code == 304 and entry is not None:
+                record_http_cache("hit")
+                return FetchResult(text=entry.body, status_code=304, not_modified=True)
+            text, truncated = self._read_text(response, head_only, host_of(url))
+        finally:
+            response.close()
+        result = FetchResult(text=text, status_code=response.status_code, truncated=truncated)
+        if self.cache is None:
+            return result
+        record_http_cache("changed" if entry is not None else "miss")
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        # Corpo parziale mai in cache: un 304 successivo servirebbe la pagina tagliata
+        if (etag or last_modified) and not truncated:
+            self.cache.set(cache_key, CachedResponse(body=text, etag=etag, last_modified=last_modified))
+        return result
+
+    def get(self, url: str, head_only: bool = False) -> str:
+        """GET verso url tramite fetch() (headers per richiesta); restituisce il corpo come stringa."""
+        return self.fetch(url, head_only=head_only).text
+
+    def prewarm(self, urls: list[str], connections_per_host: int = 1) -> int:
+        """Risolve gli host e apre connessioni nel pool condiviso prima delle fetch; restituisce le connessioni aperte."""
+        return sum(self.session.transport.prewarm(url, connections_per_host) for url in urls)
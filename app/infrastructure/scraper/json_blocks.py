@@ -0,0 +1,94 @@
+"""Scanner lineare dei blocchi JSON incorporati nell'HTML (stato iniziale JS, ld+json, script application/json).
+
+Un'unica passata cerca i marker (assegnazioni window.X = {...} e tag <script> JSON); il JSON è decodificato
+sul posto con json.JSONDecoder.raw_decode a partire dall'offset del marker, senza sottostringhe intermedie,
+e la scansione riprende dopo la fine del blocco decodificato (nessuna rilettura degli script grandi).
+"""
+
+import json
+import re
+from collections.abc import Iterator
+from dataclasses import dataclass
+from typing import Any
+
+# Variabili globali di stato iniziale note (assegnate come window.<nome> = {...})
+EMBEDDED_STATE_VARIABLES = (
+    "_sharedData",
+    "__INITIAL_STATE__",
+    "__PRELOADED_STATE__",
+    "__APOLLO_STATE__",
+    "__NUXT__",
+)
+KIND_LD_JSON = "ld+json"
+KIND_NEXT_DATA = "__NEXT_DATA__"
+# Script application/json con attributo data-sjs (payload server-side delle pagine Meta, es. Ad Library)
+KIND_SJS = "sjs"
+
+# Due cursori con prefisso letterale ("<" e "window."): la ricerca salta direttamente ai candidati
+_SCRIPT_TAG = re.compile(r"<(?i:script)\b(?P<attrs>[^>]*)>")
+_STATE_PREFIX = "window."
+_STATE_ASSIGNMENT = re.compile(
+    r"window\.(?P<state>" + "|".join(re.escape(name) for name in EMBEDDED_STATE_VARIABLES) + r")\s*=\s*"
+)
+_TYPE_ATTR = re.compile(r"""\btype\s*=\s*["']?\s*([^"'\s>]+)""", re.IGNORECASE)
+_ID_ATTR = re.compile(r"""\bid\s*=\s*["']?([^"'\s>]+)""", re.IGNORECASE)
+_SJS_ATTR = re.compile(r"\bdata-sjs\b", re.IGNORECASE)
+_WHITESPACE = re.compile(r"\s*")
+_DECODER = json.JSONDecoder()
+
+
+@dataclass(frozen=True)
+class JsonBlock:
+    """Blocco JSON decodificato: kind (nome variabile di stato o tipo di script) e offset nel documento."""
+
+    kind: str
+    offset: int
+    data: Any
+
+
+def _script_kind(attrs: str) -> str | None:
+    """Tipo di blocco per un tag <script> (None se non contiene JSON noto)."""
+    match = _TYPE_ATTR.search(attrs)
+    script_type = match.group(1).lower() if match else ""
+    if script_type == "application/ld+json":
+        return KIND_LD_JSON
+    if script_type != "application/json":
+        return None
+    id_match = _ID_ATTR.search(attrs)
+    if id_match and id_match.group(1) == KIND_NEXT_DATA:
+        return KIND_NEXT_DATA
+    if _SJS_ATTR.search(attrs):
+        return KIND_SJS
+    return None
+
+
+def iter_json_blocks(html: str, kinds: frozenset[str] | None = None) -> Iterator[JsonBlock]:
+    """Blocchi JSON in ordine di documento; kinds limita i tipi (default: tutti). JSON non valido è saltato."""
+    script = _SCRIPT_TAG.search(html)
+    state = html.find(_STATE_PREFIX)
+    while script is not None or state >= 0:
+        if script is not None and (state < 0 or script.start() < state):
+            pos = start = script.end()
+            kind = _script_kind(script.group("attrs"))
+        else:
+            assignment = _STATE_ASSIGNMENT.match(html, state)
+            pos = state + len(_STATE_PREFIX)
+            kind = assignment.group("state") if assignment is not None else None
+            start = assignment.end() if assignment is not None else pos
+        if kind is not None and (kinds is None or kind in kinds):
+            start = _WHITESPACE.match(html, start).end()
+            try:
+                data, pos = _DECODER.raw_decode(html, start)
+            except json.JSONDecodeError:
+                pass
+            else:
+                yield JsonBlock(kind=kind, offset=start, data=data)
+        if script is not None and script.start() < pos:
+            script = _SCRIPT_TAG.search(html, pos)
+        if 0 <= state < pos:
+            state = html.find(_STATE_PREFIX, pos)
+
+
+def extract_json_blocks(html: str, kinds: frozenset[str] | None = None) -> list[JsonBlock]:
+    """Come iter_json_blocks, in lista."""
+    return list(iter_json_blocks(html, kinds))
@@ -1,84 +1,83 @@
 """
 Meta Spider – estrazione dati inserzioni Meta (Social Media Scraping 2026).
-Usa RealisticSession, estrazione JSON da script (regex), mapping su AdIntelligence, pulizia copy.
+Usa RealisticSession, estrazione JSON da script (scanner lineare), mapping su AdIntelligence, pulizia copy.
 """
 
-import json
-import re
+from collections.abc import Iterable, Iterator
 from datetime import date
+from itertools import islice
 from typing import Any
 
+from pydantic import ValidationError
+
+from app.core.text_normalization import normalize_text
+from app.infrastructure.scraper.async_http_client import AsyncHttpClient
 from app.infrastructure.scraper.base_spider import BaseSpider
+from app.infrastructure.scraper.field_plan import FieldPlan
 from app.infrastructure.scraper.http_client import HttpClient
+from app.infrastructure.scraper.json_blocks import KIND_LD_JSON, JsonBlock, iter_json_blocks
+from app.infrastructure.scraper.parse_cache import ParseCache
+from app.infrastructure.scraper.parser_pool import ParserPool
 from app.models.marketing_intelligence import AdIntelligence, PlatformEnum
 
 
-# Pattern per blocchi JSON nel sorgente HTML (invisibilità: nessun CSS fragile)
-PATTERN_SHARED_DATA = re.compile(
-    r"window\._sharedData\s*=\s*(\{.*?\});",
-    re.DOTALL,
-)
-PATTERN_LD_JSON = re.compile(
-    r'<script[^>]*type\s*=\s*["\']application/ld\+json["\'][^>]*>(.*?)</script>',
-    re.DOTALL | re.IGNORECASE,
+# Blocchi JSON nel sorgente HTML (invisibilità: nessun CSS fragile). Priorità nel mapping:
+# _sharedData, poi ld+json, poi gli altri stati incorporati (EMBEDDED_STATE_VARIABLES, __NEXT_DATA__, sjs)
+JSON_BLOCK_PRIORITY = {"_sharedData": 0, KIND_LD_JSON: 1}
+
+# Campi dell'inserzione -> chiavi JSON in ordine di priorità (una sola visita per blob)
+AD_FIELD_PLAN = FieldPlan(
+    {
+        "ad_id": ("ad_id", "id", "adId", "ad_snapshot_id", "pk", "media_id", "campaign_id"),
+        "copy_text": (
+            "copy_text", "copy", "caption", "text", "message", "body",
+            "ad_copy", "ad_snapshot_body", "description",
+        ),
+        "creative_url": (
+            "creative_url", "creative_url_url", "image_url", "video_url",
+            "thumbnail_url", "display_url", "media_url",
+        ),
+        "start_date": (
+            "start_date", "start_time", "created_time", "timestamp",
+            "created_at", "startDate", "launch_date",
+        ),
+    }
 )
 
-# Emoji: blocchi Unicode comuni (emoji eccessive da ridurre)
-EMOJI_PATTERN = re.compile(
-    r"[\U0001F300-\U0001F9FF\U0001F600-\U0001F64F\U0001F680-\U0001F6FF\U0001F1E0-\U0001F1FF\U00002600-\U000026FF\U00002700-\U000027BF]+",
-    re.UNICODE,
+# Modalità multi-ad: un oggetto è un'inserzione se contiene una di queste chiavi (id inserzione, non id generici)
+AD_RECORD_ID_KEYS = ("ad_archive_id", "adArchiveID", "ad_id", "adId", "ad_snapshot_id")
+# Campi del singolo record (Ad Library: snapshot.body.text, snapshot.images[].original_image_url, ...)
+AD_RECORD_PLAN = FieldPlan(
+    {
+        "copy_text": ("copy_text", "ad_copy", "ad_snapshot_body", "caption", "message", "text", "copy", "description"),
+        "creative_url": (
+            "creative_url", "image_url", "original_image_url", "resized_image_url",
+            "video_hd_url", "video_sd_url", "video_url", "video_preview_image_url",
+            "thumbnail_url", "display_url", "media_url",
+        ),
+        "start_date": (
+            "start_date", "start_time", "created_time", "timestamp",
+            "created_at", "startDate", "launch_date",
+        ),
+    }
 )
+AD_BATCH_SIZE = 50
+# Profondità massima di ricerca dei record nei blocchi JSON
+AD_RECORD_MAX_DEPTH = 64
 
 
-def _clean_copy_text(text: str | None) -> str:
-    """Pulisce il testo del copy: emoji eccessive e spazi bianchi superflui."""
-    if not text or not isinstance(text, str):
-        return ""
-    # Normalizza spazi (multipli/newline/tab -> singolo spazio) e trim
-    cleaned = re.sub(r"\s+", " ", text).strip()
-    # Riduce sequenze di 3+ emoji a uno spazio (mantiene 1–2 emoji)
-    cleaned = EMOJI_PATTERN.sub(lambda m: " " if len(m.group()) > 2 else m.group(), cleaned)
-    # Nuova normalizzazione spazi dopo rimozione emoji
-    cleaned = re.sub(r"\s+", " ", cleaned).strip()
-    return cleaned
+def _extract_json_blocks(html: str) -> list[dict[str, Any]]:
+    """Blocchi JSON del sorgente HTML (window._sharedData, ld+json, altri stati incorporati) in una passata.
 
+    Ordine: _sharedData, poi ld+json, poi gli altri marker; a parità di tipo, ordine di documento.
+    """
+    return _by_priority(iter_json_blocks(html))
 
-def _extract_json_blocks(html: str) -> list[dict[str, Any]]:
-    """Cerca nel sorgente HTML blocchi JSON (window._sharedData o application/ld+json) via regex."""
-    blocks: list[dict[str, Any]] = []
-    # window._sharedData = {...};
-    for match in PATTERN_SHARED_DATA.finditer(html):
-        try:
-            raw = match.group(1).strip()
-            blocks.append(json.loads(raw))
-        except (json.JSONDecodeError, IndexError):
-            continue
-    # <script type="application/ld+json">...</script>
-    for match in PATTERN_LD_JSON.finditer(html):
-        try:
-            raw = match.group(1).strip()
-            blocks.append(json.loads(raw))
-        except (json.JSONDecodeError, IndexError):
-            continue
-    return blocks
-
-
-def _find_in_nested(obj: Any, *keys: str) -> Any:
-    """Cerca ricorsivamente una chiave in dict/list annidati; restituisce il primo valore trovato."""
-    if isinstance(obj, dict):
-        for key in keys:
-            if key in obj:
-                return obj[key]
-        for v in obj.values():
-            found = _find_in_nested(v, *keys)
-            if found is not None:
-                return found
-    elif isinstance(obj, list):
-        for item in obj:
-            found = _find_in_nested(item, *keys)
-            if found is not None:
-                return found
-    return None
+
+def _by_priority(blocks: Iterable[JsonBlock]) -> list[Any]:
+    """Dati dei blocchi ordinati per JSON_BLOCK_PRIORITY (ordine di documento a parità di tipo)."""
+    fallback = len(JSON_BLOCK_PRIORITY)
+    return [block.data for block in sorted(blocks, key=lambda block: JSON_BLOCK_PRIORITY.get(block.kind, fallback))]
 
 
 def _parse_date_from_value(value: Any) -> date | None:
@@ -110,42 +109,36 @@ def _map_blocks_to_ad_intelligence(blocks: list[dict[str, Any]]) -> AdIntelligen
     start_date: date | None = None
 
     for blob in blocks:
-        if ad_id is None:
-            ad_id = _find_in_nested(
-                blob,
-                "ad_id", "id", "adId", "ad_snapshot_id",
-                "pk", "media_id", "campaign_id",
+        missing = [
+            name
+            for name, value in (
+                ("ad_id", ad_id), ("copy_text", copy_text), ("creative_url", creative_url), ("start_date", start_date),
             )
+            if value is None
+        ]
+        if not missing:
+            break
+        found = AD_FIELD_PLAN.extract(blob, missing)
+
+        if ad_id is None:
+            ad_id = found.get("ad_id")
             if isinstance(ad_id, (int, float)):
                 ad_id = str(int(ad_id))
             elif ad_id is not None and not isinstance(ad_id, str):
                 ad_id = str(ad_id)
 
         if copy_text is None:
-            raw = _find_in_nested(
-                blob,
-                "copy_text", "copy", "caption", "text", "message", "body",
-                "ad_copy", "ad_snapshot_body", "description",
-            )
+            raw = found.get("copy_text")
             if raw is not None and isinstance(raw, str):
-                copy_text = _clean_copy_text(raw)
+                copy_text = normalize_text(raw)
 
         if creative_url is None:
-            raw = _find_in_nested(
-                blob,
-                "creative_url", "creative_url_url", "image_url", "video_url",
-                "thumbnail_url", "display_url", "media_url",
-            )
+            raw = found.get("creative_url")
             if raw is not None and isinstance(raw, str):
                 creative_url = raw
 
         if start_date is None:
-            raw = _find_in_nested(
-                blob,
-                "start_date", "start_time", "created_time", "timestamp",
-                "created_at", "startDate", "launch_date",
-            )
-            start_date = _parse_date_from_value(raw)
+            start_date = _parse_date_from_value(found.get("start_date"))
 
     ad_id = ad_id or "unknown"
     start_date = start_date or date.today()
@@ -159,17 +152,124 @@ def _map_blocks_to_ad_intelligence(blocks: list[dict[str, Any]]) -> AdIntelligen
     )
 
 
+def _iter_ad_records(obj: Any) -> Iterator[tuple[dict, str]]:
+    """Oggetti con forma di inserzione (dict con una chiave di AD_RECORD_ID_KEYS), in pre-ordine.
+
+    Non scende dentro un record già trovato (sotto-oggetti dello stesso annuncio); restituisce (record, chiave id).
+    """
+    stack: list[tuple[Any, int]] = [(obj, 0)]
+    while stack:
+        node, depth = stack.pop()
+        if depth > AD_RECORD_MAX_DEPTH:
+            continue
+        if isinstance(node, dict):
+            id_key = next((key for key in AD_RECORD_ID_KEYS if isinstance(node.get(key), (str, int))), None)
+            if id_key is not None:
+                yield node, id_key
+                continue
+            children = node.values()
+        elif isinstance(node, list):
+            children = node
+        else:
+            continue
+        stack.extend((child, depth + 1) for child in reversed(list(children)) if isinstance(child, (dict, list)))
+
+
+def _record_to_ad_intelligence(record: dict, id_key: str) -> AdIntelligence | None:
+    """Mappa un singolo record in AdIntelligence; None se i dati non sono validi (es. start_date futura)."""
+    found = AD_RECORD_PLAN.extract(record)
+    raw_copy = found.get("copy_text")
+    raw_creative = found.get("creative_url")
+    try:
+        return AdIntelligence(
+            ad_id=str(record[id_key]),
+            platform=PlatformEnum.META,
+            start_date=_parse_date_from_value(found.get("start_date")) or date.today(),
+            copy_text=(normalize_text(raw_copy) or None) if isinstance(raw_copy, str) else None,
+            creative_url=raw_creative if isinstance(raw_creative, str) else None,
+        )
+    except ValidationError:
+        return None
+
+
+def iter_ads(html: str) -> Iterator[AdIntelligence]:
+    """Stream di tutte le inserzioni nei blocchi JSON della pagina, mappate una alla volta (deduplica per ad_id).
+
+    Se nessun oggetto ha forma di inserzione, restituisce il risultato della modalità singola quando ha un ad_id.
+    """
+    seen: set[str] = set()
+    blocks: list[JsonBlock] = []
+    for block in iter_json_blocks(html):
+        blocks.append(block)
+        for record, id_key in _iter_ad_records(block.data):
+            ad_id = str(record[id_key])
+            if ad_id in seen:
+                continue
+            seen.add(ad_id)
+            ad = _record_to_ad_intelligence(record, id_key)
+            if ad is not None:
+                yield ad
+    if not seen and blocks:
+        fallback = _map_blocks_to_ad_intelligence(_by_priority(blocks))
+        if fallback.ad_id != "unknown":
+            yield fallback
+
+
 class MetaSpider(BaseSpider):
-    """Spider per inserzioni Meta: RealisticSession, estrazione JSON da script (regex), output AdIntelligence."""
+    """Spider per inserzioni Meta: RealisticSession, estrazione JSON da script (scanner lineare), output AdIntelligence.
 
-    def __init__(self, http_client: HttpClient) -> None:
-        super().__init__(http_client)
+    Costruttore con l'ordine posizionale di BaseSpider (come per gli spider creati dal registry);
+    multi_ad=True (solo keyword): ogni inserzione presente nei blocchi JSON diventa un record (una fetch -> N
+    annunci), consegnati all'engine in batch da batch_size tramite run_batches().
+    """
+
+    def __init__(
+        self,
+        http_client: HttpClient,
+        async_http_client: AsyncHttpClient | None = None,
+        parse_cache: ParseCache | None = None,
+        parser_pool: ParserPool | None = None,
+        *,
+        multi_ad: bool = False,
+        batch_size: int = AD_BATCH_SIZE,
+    ) -> None:
+        super().__init__(http_client, async_http_client, parse_cache=parse_cache, parser_pool=parser_pool)
+        self.multi_ad = multi_ad
+        self.batch_size = batch_size
+        if multi_ad:
+            # Output di parse() diverso dalla modalità singola: chiave di parse_cache distinta
+            self.version = f"{self.version}-multi"
 
     def parse(self, response: str) -> dict:
-        """Estrae blocchi JSON dal HTML (window._sharedData / ld+json) e mappa in AdIntelligence."""
+        """Estrae blocchi JSON dal HTML (window._sharedData / ld+json / stati incorporati) e mappa in AdIntelligence."""
+        if self.multi_ad:
+            ads = [ad.model_dump() for ad in iter_ads(response)]
+            return {"ads": ads, "ads_found": len(ads)}
         blocks = _extract_json_blocks(response)
         ad_intelligence = _map_blocks_to_ad_intelligence(blocks)
         return {
             "ad_intelligence": ad_intelligence.model_dump() if ad_intelligence else None,
             "json_blocks_found": len(blocks),
         }
+
+    def iter_records(self, response: str, url: str) -> Iterator[dict]:
+        """Un record per inserzione (schema pipeline: source, url, title, description, ad_intelligence)."""
+        for ad in iter_ads(response):
+            yield {
+                "source": "meta_ads",
+                "url": url,
+                "title": None,
+                "description": ad.copy_text,
+                "ad_intelligence": ad.model_dump(),
+            }
+
+    def parse_batches(self, response: str, url: str) -> Iterator[list[dict]]:
+        """Record delle inserzioni a gruppi di batch_size, mappati solo quando il batch viene richiesto."""
+        records = self.iter_records(response, url)
+        while batch := list(islice(records, self.batch_size)):
+            yield batch
+
+    def run_batches(self, url: str) -> Iterator[list[dict]]:
+        """Una sola fetch della pagina, poi i batch di record di tutte le inserzioni trovate."""
+        html = self.http_client.get(url, head_only=self.head_only)
+        yield from self.parse_batches(html, url)
@@ -7,13 +7,17 @@ class ScraperNormalizer:
     """Normalizza l'output degli spider in struttura standard per Meta Ads, TikTok Ads, landing, ecc."""
 
     def normalize(self, data: dict, source: str) -> dict | None:
-        """Restituisce un dict con source, title, description, url, fetched_at. Se data è None restituisce None."""
+        """Restituisce un dict con source, title, description, url, fetched_at (+ ad_intelligence per i record
+        di inserzioni). Se data è None restituisce None."""
         if data is None:
             return None
-        return {
+        normalized = {
             "source": source,
             "title": data.get("title"),
             "description": data.get("description"),
-            "url": data.get("url"),
+            "url": data.get("url") or data.get("landing_url"),
             "fetched_at": datetime.utcnow().isoformat(),
         }
+        if data.get("ad_intelligence") is not None:
+            normalized["ad_intelligence"] = data["ad_intelligence"]
+        return normalized
@@ -0,0 +1,136 @@
+"""Cache dei risultati di parse() per corpo invariato: chiave (classe spider, versione spider, SHA-256 del corpo).
+
+Tier in-process LRU (sempre attivo se max_entries > 0) e tier Redis opzionale condiviso tra repliche.
+Su hit BaseSpider.process salta parse(): il risultato strutturato è riusato (copia), poi finalize(url).
+Valori Redis in JSON (ScrapeResult e date codificati), mai pickle: Redis non è una fonte fidata di codice.
+"""
+
+import copy
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from dataclasses import asdict
+from datetime import date, datetime
+from typing import Any
+
+from app.cache.redis_client import RedisCacheClient, get_redis_client
+from app.core.config import Settings
+from app.core.metrics import record_parse_cache
+from app.infrastructure.scraper.models import ScrapeResult
+
+DEFAULT_MAX_ENTRIES = 1024
+DEFAULT_TTL_SECONDS = 86_400
+REDIS_KEY_PREFIX = "scraper:parse:"
+
+
+def body_digest(body: str) -> tuple[str, int]:
+    """SHA-256 (hex) del corpo in UTF-8 e relativa dimensione in byte."""
+    data = body.encode("utf-8", errors="surrogatepass")
+    return hashlib.sha256(data).hexdigest(), len(data)
+
+
+def parse_cache_key(spider, digest: str) -> str:
+    """Chiave per (classe spider, versione spider, digest del corpo)."""
+    spider_class = type(spider)
+    return f"{spider_class.__module__}.{spider_class.__qualname__}:{getattr(spider, 'version', '0')}:{digest}"
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, ScrapeResult):
+        return {"__scrape_result__": asdict(value)}
+    if isinstance(value, datetime):
+        return {"__datetime__": value.isoformat()}
+    if isinstance(value, date):
+        return {"__date__": value.isoformat()}
+    raise TypeError(f"Unsupported parse result type: {type(value).__name__}")
+
+
+def _json_object_hook(obj: dict) -> Any:
+    if "__scrape_result__" in obj:
+        return ScrapeResult(**obj["__scrape_result__"])
+    if "__datetime__" in obj:
+        return datetime.fromisoformat(obj["__datetime__"])
+    if "__date__" in obj:
+        return date.fromisoformat(obj["__date__"])
+    return obj
+
+
+class ParseCache:
+    """LRU in memoria (thread-safe) con tier Redis opzionale; i valori restituiti sono sempre copie."""
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        redis_client: RedisCacheClient | None = None,
+        ttl_seconds: int = DEFAULT_TTL_SECONDS,
+    ) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._redis = redis_client
+        self._entries: OrderedDict[str, Any] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str, size: int = 0) -> tuple[bool, Any]:
+        """(True, risultato) su hit in memoria o Redis, (False, None) su miss; size = byte di corpo risparmiati."""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                value = self._entries[key]
+                record_parse_cache("hit", "memory", size)
+                return True, copy.deepcopy(value)
+        if self._redis is not None:
+            raw = self._redis.get(REDIS_KEY_PREFIX + key)
+            if raw is not None:
+                try:
+                    value = json.loads(raw, object_hook=_json_object_hook)
+                except (ValueError, TypeError):
+                    value = None
+                if value is not None:
+                    self._remember(key, value)
+                    record_parse_cache("hit", "redis", size)
+                    return True, copy.deepcopy(value)
+        record_parse_cache("miss", "none", 0)
+        return False, None
+
+    def set(self, key: str, value: Any) -> None:
+        """Salva una copia del risultato in memoria e, se configurato, su Redis (tipi non serializzabili: solo memoria)."""
+        self._remember(key, copy.deepcopy(value))
+        if self._redis is not None:
+            try:
+                raw = json.dumps(value, default=_json_default)
+            except (TypeError, ValueError):
+                return
+            self._redis.set(REDIS_KEY_PREFIX + key, raw, ttl_seconds=self.ttl_seconds)
+
+    def _remember(self, key: str, value: Any) -> None:
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Svuota il tier in memoria (uso test / amministrazione)."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def build_parse_cache(settings: Settings) -> ParseCache | None:
+    """Factory da config: scraper_parse_cache_backend = none | memory | redis (redis = LRU + tier Redis)."""
+    backend = settings.scraper_parse_cache_backend.lower()
+    if backend not in ("memory", "redis"):
+        return None
+    redis_client = None
+    if backend == "redis":
+        redis_client = get_redis_client(host=settings.redis_host, port=settings.redis_port, enabled=True)
+    return ParseCache(
+        max_entries=settings.scraper_parse_cache_max_entries,
+        redis_client=redis_client,
+        ttl_seconds=settings.scraper_parse_cache_ttl_seconds,
+    )
@@ -0,0 +1,152 @@
+"""Offload di parse() su un pool di processi: parsing CPU-bound fuori dal GIL del processo API.
+
+Lo spider (senza client HTTP né cache, vedi BaseSpider.__getstate__) e il corpo come bytes UTF-8 sono
+inviati a un worker già riscaldato (parser e moduli spider importati all'avvio del processo).
+Sotto inline_threshold_bytes il parsing resta nel thread chiamante: per pagine piccole serializzazione
+e IPC costano più del parsing. Worker avviati in modo lazy alla prima pagina grande (spawn, sicuro con thread).
+"""
+
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any
+
+from app.core.config import Settings
+from app.core.metrics import observe_parser_pool_seconds, record_parser_pool_task, set_parser_pool_queue_depth
+
+DEFAULT_INLINE_THRESHOLD_BYTES = 256 * 1024
+DEFAULT_TIMEOUT_SECONDS = 30.0
+MODE_INLINE = "inline"
+MODE_PROCESS = "process"
+# Moduli importati dall'initializer dei worker (costo di import pagato una volta per processo)
+WARM_MODULES = (
+    "lxml.html",
+    "bs4",
+    "app.infrastructure.scraper.html_parser",
+    "app.infrastructure.scraper.head_extractor",
+    "app.infrastructure.scraper.meta_spider",
+    "app.infrastructure.scraper.spiders.title_spider",
+    "app.infrastructure.scraper.spiders.meta_title_spider",
+)
+
+
+def _warm_worker(modules: tuple[str, ...]) -> None:
+    """Initializer del worker: importa parser e spider prima del primo task."""
+    import importlib
+
+    for module in modules:
+        importlib.import_module(module)
+
+
+def _worker_pid() -> int:
+    return os.getpid()
+
+
+def _parse_in_worker(spider, body: bytes) -> tuple[Any, int, float]:
+    """Eseguito nel worker: parse() sul corpo decodificato; restituisce (risultato, pid, secondi)."""
+    started = time.perf_counter()
+    result = spider.parse(body.decode("utf-8", errors="surrogatepass"))
+    return result, os.getpid(), time.perf_counter() - started
+
+
+class ParserPool:
+    """ProcessPoolExecutor di worker riscaldati per parse(); pagine sotto soglia parse inline.
+
+    stats() espone per worker (pid) numero di task e secondi di parsing; queue_depth i task in attesa/in corso.
+    """
+
+    def __init__(
+        self,
+        max_workers: int | None = None,
+        inline_threshold_bytes: int = DEFAULT_INLINE_THRESHOLD_BYTES,
+        timeout_seconds: float = DEFAULT_TIMEOUT_SECONDS,
+        warm_modules: tuple[str, ...] = WARM_MODULES,
+    ) -> None:
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.inline_threshold_bytes = inline_threshold_bytes
+        self.timeout_seconds = timeout_seconds
+        self._warm_modules = warm_modules
+        self._executor: ProcessPoolExecutor | None = None
+        self._lock = threading.Lock()
+        self._queue_depth = 0
+        self._worker_stats: dict[int, dict[str, float]] = {}
+
+    @property
+    def queue_depth(self) -> int:
+        """Task inviati ai worker e non ancora completati."""
+        return self._queue_depth
+
+    def stats(self) -> dict[int, dict[str, float]]:
+        """Per pid del worker: {"tasks": n, "seconds": totale secondi di parse}."""
+        with self._lock:
+            return {pid: dict(values) for pid, values in self._worker_stats.items()}
+
+    def parse(self, spider, body: str) -> Any:
+        """spider.parse(body) inline sotto soglia, altrimenti in un worker (TimeoutError oltre timeout_seconds)."""
+        data = body.encode("utf-8", errors="surrogatepass")
+        if len(data) < self.inline_threshold_bytes:
+            record_parser_pool_task(MODE_INLINE)
+            return spider.parse(body)
+        future = self.submit(spider, data)
+        result, _, _ = future.result(timeout=self.timeout_seconds)
+        return result
+
+    def submit(self, spider, data: bytes) -> Future:
+        """Invia parse() di un corpo (bytes UTF-8) a un worker; il Future restituisce (risultato, pid, secondi)."""
+        executor = self._ensure_executor()
+        with self._lock:
+            self._queue_depth += 1
+            set_parser_pool_queue_depth(self._queue_depth)
+        record_parser_pool_task(MODE_PROCESS)
+        future = executor.submit(_parse_in_worker, spider, data)
+        future.add_done_callback(self._on_done)
+        return future
+
+    def warm(self) -> list[int]:
+        """Avvia tutti i worker (initializer incluso) prima del traffico; restituisce i pid avviati."""
+        executor = self._ensure_executor()
+        futures = [executor.submit(_worker_pid) for _ in range(self.max_workers)]
+        return sorted({future.result(timeout=self.timeout_seconds) for future in futures})
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Chiude i worker; il pool si riavvia in modo lazy al successivo offload."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
+
+    def _ensure_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_warm_worker,
+                    initargs=(self._warm_modules,),
+                )
+            return self._executor
+
+    def _on_done(self, future: Future) -> None:
+        with self._lock:
+            self._queue_depth -= 1
+            set_parser_pool_queue_depth(self._queue_depth)
+            if future.cancelled() or future.exception() is not None:
+                return
+            _, pid, seconds = future.result()
+            stats = self._worker_stats.setdefault(pid, {"tasks": 0, "seconds": 0.0})
+            stats["tasks"] += 1
+            stats["seconds"] += seconds
+        observe_parser_pool_seconds(pid, seconds)
+
+
+def build_parser_pool(settings: Settings) -> ParserPool | None:
+    """Factory da config: None se scraper_parser_pool_workers = 0 (parsing sempre inline)."""
+    if settings.scraper_parser_pool_workers <= 0:
+        return None
+    return ParserPool(
+        max_workers=settings.scraper_parser_pool_workers,
+        inline_threshold_bytes=settings.scraper_parser_pool_inline_threshold_bytes,
+        timeout_seconds=settings.scraper_parser_pool_timeout_seconds,
+    )
@@ -1,16 +1,20 @@
-"""Pipeline dati tra engine e service. Deduplicazione in memoria per singola esecuzione."""
+"""Pipeline dati tra engine e service. Deduplicazione per impronta di contenuto con memoria limitata."""
+
+from app.infrastructure.scraper.dedupe import SeenSet, fingerprint
 
 
 class ScraperPipeline:
-    """Pipeline: process(data) con deduplicazione in memoria; restituisce None se duplicato."""
+    """Pipeline: process(data) con deduplicazione (SeenSet condivisibile); restituisce None se duplicato."""
 
-    def __init__(self) -> None:
-        self._seen_hashes = set()
+    def __init__(self, seen: SeenSet | None = None) -> None:
+        self.seen = seen if seen is not None else SeenSet()
 
     def process(self, data: dict) -> dict | None:
-        """Se il dato è già stato visto restituisce None, altrimenti lo registra e restituisce data."""
-        key = str(data)
-        if key in self._seen_hashes:
+        """Se il dato è già stato visto (stessa impronta) restituisce None, altrimenti lo registra e restituisce data."""
+        if self.seen.check_and_add(fingerprint(data)):
             return None
-        self._seen_hashes.add(key)
         return data
+
+    def process_batch(self, batch: list[dict]) -> list[dict]:
+        """Applica process() a ogni elemento del batch; restituisce solo i non duplicati, in ordine."""
+        return [data for data in batch if self.process(data) is not None]
@@ -0,0 +1,84 @@
+"""Politeness per-host: intervallo minimo tra richieste allo stesso dominio, senza sleep globali.
+
+Ogni host ha il proprio orario dell'ultima richiesta e il proprio gap minimo: richieste verso host
+diversi partono subito, quelle verso lo stesso host vengono distanziate. reserve() calcola l'attesa
+senza dormire; il chiamante decide come attendere (asyncio.sleep nel client async, time.sleep
+bloccante in RealisticSession).
+"""
+
+import asyncio
+import random
+import threading
+import time
+from typing import Callable
+
+from app.infrastructure.scraper.urls import host_of
+
+DEFAULT_MIN_GAP_SEC = 1.0
+DEFAULT_MAX_GAP_SEC = 3.0
+# Oltre questa soglia gli host inattivi vengono rimossi (memoria limitata)
+MAX_TRACKED_HOSTS = 10_000
+
+
+class HostPoliteness:
+    """Registro per-host di ultima richiesta e gap minimo; thread-safe, condivisibile tra sessioni."""
+
+    def __init__(
+        self,
+        min_gap: float = DEFAULT_MIN_GAP_SEC,
+        max_gap: float = DEFAULT_MAX_GAP_SEC,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.min_gap = min_gap
+        self.max_gap = max_gap
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._last_request: dict[str, float] = {}
+        self._gap: dict[str, float] = {}
+        self._host_gaps: dict[str, tuple[float, float]] = {}
+
+    def set_host_gap(self, host: str, min_gap: float, max_gap: float | None = None) -> None:
+        """Imposta un gap specifico per un host (es. dominio più sensibile al rate limiting)."""
+        with self._lock:
+            self._host_gaps[host.lower()] = (min_gap, max_gap if max_gap is not None else min_gap)
+
+    def _draw_gap(self, host: str) -> float:
+        low, high = self._host_gaps.get(host, (self.min_gap, self.max_gap))
+        return random.uniform(low, high)
+
+    def _prune(self, now: float) -> None:
+        """Rimuove gli host il cui gap è già trascorso (nessun vincolo residuo)."""
+        expired = [h for h, last in self._last_request.items() if last + self._gap.get(h, 0.0) <= now]
+        for host in expired:
+            self._last_request.pop(host, None)
+            self._gap.pop(host, None)
+
+    def reserve(self, url: str) -> float:
+        """Prenota lo slot per la prossima richiesta verso l'host di url; restituisce i secondi da attendere (0 se subito)."""
+        host = host_of(url)
+        with self._lock:
+            now = self._clock()
+            last = self._last_request.get(host)
+            start = now if last is None else max(now, last + self._gap.get(host, 0.0))
+            if last is None and len(self._last_request) >= MAX_TRACKED_HOSTS:
+                self._prune(now)
+            self._last_request[host] = start
+            self._gap[host] = self._draw_gap(host)
+            return start - now
+
+    def reset(self) -> None:
+        """Dimentica gli slot prenotati (uso test / amministrazione); i gap per-host restano."""
+        with self._lock:
+            self._last_request.clear()
+            self._gap.clear()
+
+    async def wait(self, url: str) -> float:
+        """Attende (senza bloccare thread) lo slot per l'host di url; restituisce i secondi attesi."""
+        delay = self.reserve(url)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return delay
+
+
+# Istanza di processo condivisa da tutte le sessioni (sync e async)
+default_politeness = HostPoliteness()
@@ -1,21 +1,13 @@
-"""Memorizzazione temporanea in memoria dei risultati di scraping."""
+"""Memorizzazione dei risultati dello scraping schedulato (ResultStore limitato, lettura a cursore)."""
 
+from pathlib import Path
 
-class ResultCollector:
-    """Accumula risultati di scraping in una lista; per uso con scheduler prima di DB/Redis."""
+from app.infrastructure.scraper.result_store import DEFAULT_CAPACITY, ResultStore
 
-    def __init__(self) -> None:
-        self._results: list = []
 
-    def add(self, data: dict) -> None:
-        """Aggiunge data alla lista solo se non None."""
-        if data is not None:
-            self._results.append(data)
+class ResultCollector(ResultStore):
+    """Accumula risultati dello scheduler: ring in memoria con spill opzionale su disco (store 'scheduled')."""
 
-    def all(self) -> list:
-        """Restituisce la lista dei risultati."""
-        return self._results
-
-    def clear(self) -> None:
-        """Svuota la lista."""
-        self._results.clear()
+    def __init__(self, capacity: int = DEFAULT_CAPACITY, spill_dir: str | Path | None = None, **kwargs) -> None:
+        kwargs.setdefault("name", "scheduled")
+        super().__init__(capacity=capacity, spill_dir=spill_dir, **kwargs)
@@ -1,21 +1,251 @@
-"""Memorizzazione temporanea in memoria dei risultati di scraping. Nessun DB, cache o filesystem."""
+"""Memorizzazione dei risultati di scraping con memoria limitata e lettura a cursore.
+
+Ogni risultato riceve un numero di sequenza crescente (seq, da 1). In memoria resta un ring degli ultimi
+`capacity` risultati; con spill_dir i risultati più vecchi sono accodati (a blocchi di spill_batch) in
+segmenti NDJSON compressi gzip (results-<primo seq>.ndjson.gz, una riga {"seq", "data"} per risultato),
+ruotati ogni segment_records righe e mantenuti al massimo max_segments. Senza spill_dir i più vecchi sono
+scartati. read(after, limit) legge in ordine di seq da segmenti, blocco in attesa di spill e ring.
+Con spill_dir il seq massimo assegnabile (high-water mark) è registrato su disco a blocchi di SEQ_RESERVE:
+dopo un riavvio, anche senza close(), i nuovi seq partono oltre quelli già dati ai client. close() allo
+shutdown scrive anche ring e blocco in attesa e registra il seq esatto (numerazione senza salti).
+"""
+
+import gzip
+import json
+import os
+import threading
+from collections import deque
+from collections.abc import Iterator
+from dataclasses import dataclass
+from itertools import islice
+from pathlib import Path
+from typing import Any
+
+from app.core.config import Settings
+from app.core.logging import get_logger
+from app.core.metrics import record_result_store_eviction
+
+LOG = get_logger("app")
+
+DEFAULT_CAPACITY = 10_000
+DEFAULT_SPILL_BATCH = 256
+DEFAULT_SEGMENT_RECORDS = 10_000
+DEFAULT_MAX_SEGMENTS = 100
+DEFAULT_PAGE_SIZE = 100
+SEGMENT_GLOB = "results-*.ndjson.gz"
+SEQ_FILE = "results.seq"
+SEQ_RESERVE = 1024
+
+
+@dataclass
+class _Segment:
+    path: Path
+    first_seq: int
+    last_seq: int
+
+    @property
+    def records(self) -> int:
+        return self.last_seq - self.first_seq + 1
+
+
+def _segment_path(spill_dir: Path, first_seq: int) -> Path:
+    return spill_dir / f"results-{first_seq:012d}.ndjson.gz"
+
+
+def _read_segment(path: Path, after: int, until: int) -> Iterator[tuple[int, Any]]:
+    """Righe del segmento con after < seq <= until; segmento rimosso o blocco finale incompleto -> stop."""
+    try:
+        with gzip.open(path, "rt", encoding="utf-8") as fh:
+            for line in fh:
+                record = json.loads(line)
+                seq = record["seq"]
+                if seq > after:
+                    yield seq, record["data"]
+                if seq >= until:
+                    return
+    except FileNotFoundError:
+        return
+    except (EOFError, gzip.BadGzipFile, ValueError) as exc:
+        LOG.warning("result store: truncated segment %s (%s)", path, exc)
 
 
 class ResultStore:
-    """Accumula risultati di scraping in una lista in memoria per la sessione di scraping."""
+    """Ring in memoria (thread-safe) con spill opzionale su segmenti NDJSON gzip e lettura per cursore (seq)."""
 
-    def __init__(self) -> None:
-        self._results: list = []
+    def __init__(
+        self,
+        capacity: int = DEFAULT_CAPACITY,
+        spill_dir: str | Path | None = None,
+        spill_batch: int = DEFAULT_SPILL_BATCH,
+        segment_records: int = DEFAULT_SEGMENT_RECORDS,
+        max_segments: int = DEFAULT_MAX_SEGMENTS,
+        name: str = "engine",
+    ) -> None:
+        if capacity < 1:
+            raise ValueError("ResultStore capacity must be >= 1")
+        self.capacity = capacity
+        self.spill_dir = Path(spill_dir) if spill_dir else None
+        self.spill_batch = max(1, spill_batch)
+        self.segment_records = max(1, segment_records)
+        self.max_segments = max_segments
+        self.name = name
+        self._ring: deque[tuple[int, Any]] = deque()
+        self._pending: list[tuple[int, Any]] = []
+        self._segments: list[_Segment] = []
+        self._lock = threading.Lock()
+        self._next_seq = 1
+        self._seq_reserved = 0
+        if self.spill_dir is not None:
+            self.spill_dir.mkdir(parents=True, exist_ok=True)
+            self._load_segments()
+            self._load_seq_mark()
 
-    def add(self, data: dict) -> None:
-        """Aggiunge data alla lista solo se non è None."""
-        if data is not None:
-            self._results.append(data)
+    def _load_segments(self) -> None:
+        """Riprende i segmenti di un'esecuzione precedente: i cursori restano validi dopo un riavvio."""
+        paths = sorted(self.spill_dir.glob(SEGMENT_GLOB))
+        firsts = [int(path.name.split("-", 1)[1].split(".", 1)[0]) for path in paths]
+        for index, (path, first_seq) in enumerate(zip(paths, firsts)):
+            if index + 1 < len(firsts):
+                last_seq = firsts[index + 1] - 1
+            else:
+                last_seq = first_seq - 1
+                for last_seq, _ in _read_segment(path, 0, float("inf")):
+                    pass
+            if last_seq >= first_seq:
+                self._segments.append(_Segment(path, first_seq, last_seq))
+        if self._segments:
+            self._next_seq = self._segments[-1].last_seq + 1
+
+    def _load_seq_mark(self) -> None:
+        """Riprende l'high-water mark: i seq rimasti solo in memoria prima del riavvio non vengono riusati."""
+        try:
+            self._seq_reserved = int((self.spill_dir / SEQ_FILE).read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as exc:
+            LOG.warning("result store: unreadable seq mark in %s (%s)", self.spill_dir, exc)
+            return
+        self._next_seq = max(self._next_seq, self._seq_reserved + 1)
+
+    def _write_seq_mark(self, seq: int) -> None:
+        """Registra su disco (sostituzione atomica) il seq massimo assegnabile."""
+        path = self.spill_dir / SEQ_FILE
+        tmp = path.with_name(path.name + ".tmp")
+        try:
+            tmp.write_text(str(seq), encoding="utf-8")
+            os.replace(tmp, path)
+        except OSError as exc:
+            LOG.warning("result store: seq mark write to %s failed (%s)", path, exc)
+        self._seq_reserved = seq
+
+    def add(self, data: Any) -> int | None:
+        """Aggiunge data (se non None) e restituisce il suo seq; oltre capacity il più vecchio va in spill."""
+        if data is None:
+            return None
+        with self._lock:
+            seq = self._next_seq
+            self._next_seq += 1
+            if self.spill_dir is not None and seq > self._seq_reserved:
+                self._write_seq_mark(seq - 1 + SEQ_RESERVE)
+            self._ring.append((seq, data))
+            if len(self._ring) > self.capacity:
+                evicted = self._ring.popleft()
+                if self.spill_dir is None:
+                    record_result_store_eviction(self.name, "dropped")
+                else:
+                    self._pending.append(evicted)
+                    record_result_store_eviction(self.name, "spilled")
+                    if len(self._pending) >= self.spill_batch:
+                        self._flush_pending()
+            return seq
+
+    def _flush_pending(self) -> None:
+        """Scrive il blocco in attesa come membro gzip accodato all'ultimo segmento (ruotato se pieno)."""
+        pending = self._pending
+        while pending:
+            segment = self._segments[-1] if self._segments else None
+            if segment is None or segment.records >= self.segment_records:
+                segment = _Segment(_segment_path(self.spill_dir, pending[0][0]), pending[0][0], pending[0][0] - 1)
+                self._segments.append(segment)
+            chunk = pending[: self.segment_records - segment.records]
+            lines = "".join(json.dumps({"seq": seq, "data": data}, default=str) + "\n" for seq, data in chunk)
+            try:
+                with gzip.open(segment.path, "ab") as fh:
+                    fh.write(lines.encode("utf-8"))
+            except OSError as exc:
+                LOG.warning("result store: spill to %s failed (%s), %d results dropped", segment.path, exc, len(chunk))
+                if segment.records == 0:
+                    self._segments.pop()
+            else:
+                segment.last_seq = chunk[-1][0]
+            pending = pending[len(chunk):]
+        self._pending = []
+        while self.max_segments > 0 and len(self._segments) > self.max_segments:
+            self._segments.pop(0).path.unlink(missing_ok=True)
+
+    def flush(self) -> None:
+        """Scrive su disco i risultati in attesa di spill."""
+        with self._lock:
+            if self._pending:
+                self._flush_pending()
+
+    def close(self) -> None:
+        """Allo shutdown (con spill_dir): ring e blocco in attesa su disco e seq esatto come high-water mark."""
+        if self.spill_dir is None:
+            return
+        with self._lock:
+            self._pending.extend(self._ring)
+            self._ring.clear()
+            if self._pending:
+                self._flush_pending()
+            self._write_seq_mark(self._next_seq - 1)
+
+    def iter_after(self, after: int = 0, limit: int | None = None) -> Iterator[tuple[int, Any]]:
+        """(seq, data) con seq > after in ordine crescente; limit limita la copia del ring (None = tutto)."""
+        with self._lock:
+            segments = [(segment.path, segment.last_seq) for segment in self._segments if segment.last_seq > after]
+            pending = [entry for entry in self._pending if entry[0] > after]
+            start = max(0, after + 1 - self._ring[0][0]) if self._ring else 0
+            ring = list(islice(self._ring, start, None if limit is None else start + limit))
+        for path, last_seq in segments:
+            yield from _read_segment(path, after, last_seq)
+        yield from pending
+        yield from ring
+
+    def read(self, after: int = 0, limit: int = DEFAULT_PAGE_SIZE) -> list[tuple[int, Any]]:
+        """Pagina di al più limit risultati con seq > after; il cursore successivo è il seq dell'ultimo."""
+        return list(islice(self.iter_after(after, limit), limit))
+
+    @property
+    def last_seq(self) -> int:
+        """Seq dell'ultimo risultato aggiunto (0 se nessuno)."""
+        return self._next_seq - 1
 
     def all(self) -> list:
-        """Restituisce la lista completa dei risultati."""
-        return self._results
+        """Restituisce i risultati ancora in memoria (ring); per lo storico completo usare read()."""
+        with self._lock:
+            return [data for _, data in self._ring]
 
     def clear(self) -> None:
-        """Svuota la lista."""
-        self._results.clear()
+        """Svuota ring, blocco in attesa e segmenti su disco; la numerazione seq prosegue."""
+        with self._lock:
+            self._ring.clear()
+            self._pending = []
+            for segment in self._segments:
+                segment.path.unlink(missing_ok=True)
+            self._segments = []
+
+    def __len__(self) -> int:
+        return len(self._ring) + len(self._pending) + sum(segment.records for segment in self._segments)
+
+
+def build_result_store(settings: Settings, name: str = "engine") -> ResultStore:
+    """Factory da config: ring di scraper_results_capacity; spill in <scraper_results_spill_dir>/<name> se impostato."""
+    spill_dir = Path(settings.scraper_results_spill_dir) / name if settings.scraper_results_spill_dir else None
+    return ResultStore(
+        capacity=settings.scraper_results_capacity,
+        spill_dir=spill_dir,
+        segment_records=settings.scraper_results_segment_records,
+        max_segments=settings.scraper_results_max_segments,
+        name=name,
+    )
@@ -0,0 +1,179 @@
+"""Spider dichiarativi: mappa campo AdSchema -> selettore (CSS con soupsieve o XPath con lxml).
+
+I selettori sono compilati una volta per processo (alla definizione della classe, cache per query) e
+valutati sullo stesso albero, costruito una sola volta per risposta:
+- CSS: una sola visita degli elementi in ordine di documento; ogni campo prende il primo elemento che
+  soddisfa il suo selettore (come select_one) e la visita termina quando tutti i campi sono trovati;
+- XPath: espressioni etree.XPath precompilate valutate in C sull'unico albero lxml.html.
+Un campo può dichiarare più query in ordine di priorità (es. og:url, poi link canonical): vince la prima
+che trova un valore, indipendentemente dalla posizione degli elementi nel documento.
+Aggiungere una fonte significa dichiarare i selettori: nessuna visita o parsing in più da scrivere a mano.
+"""
+
+from collections.abc import Sequence
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, ClassVar
+from urllib.parse import urljoin
+
+import soupsieve
+from bs4 import BeautifulSoup
+from bs4.element import Tag
+from lxml import etree
+
+from app.core.text_normalization import normalize_text
+from app.domain.schemas.ad_schema import AdSchema, now_iso
+from app.infrastructure.scraper.base_spider import BaseSpider
+from app.infrastructure.scraper.html_parser import BACKEND_BS4_LXML, _lxml_document
+
+KIND_CSS = "css"
+KIND_XPATH = "xpath"
+# Campi di AdSchema valorizzabili da selettore (source e collected_at sono impostati dallo spider)
+AD_SCHEMA_FIELDS = ("title", "description", "landing_url", "creative_url")
+# Campi URL: valori relativi risolti rispetto all'url della pagina
+URL_FIELDS = frozenset({"landing_url", "creative_url"})
+
+
+@dataclass(frozen=True)
+class FieldSelector:
+    """Selettore di un campo: query in ordine di priorità, linguaggio (css|xpath) e attributo (None = testo)."""
+
+    queries: tuple[str, ...]
+    kind: str = KIND_CSS
+    attr: str | None = None
+
+
+def _queries(query: str | Sequence[str]) -> tuple[str, ...]:
+    queries = (query,) if isinstance(query, str) else tuple(query)
+    if not queries:
+        raise ValueError("Selector needs at least one query")
+    return queries
+
+
+def css(query: str | Sequence[str], attr: str | None = None) -> FieldSelector:
+    """Selettore CSS (soupsieve); lista di query = alternative in ordine di priorità; attr=None -> testo."""
+    return FieldSelector(queries=_queries(query), kind=KIND_CSS, attr=attr)
+
+
+def xpath(query: str | Sequence[str], attr: str | None = None) -> FieldSelector:
+    """Selettore XPath (lxml); lista di query = alternative in ordine di priorità.
+
+    Query che terminano in @attr o text() restituiscono direttamente stringhe.
+    """
+    return FieldSelector(queries=_queries(query), kind=KIND_XPATH, attr=attr)
+
+
+@lru_cache(maxsize=None)
+def compile_selector(kind: str, query: str) -> Any:
+    """Selettore compilato (cache di processo per (kind, query)). Query non valida -> eccezione del motore."""
+    if kind == KIND_CSS:
+        return soupsieve.compile(query)
+    if kind == KIND_XPATH:
+        return etree.XPath(query)
+    raise ValueError(f"Unknown selector kind: {kind!r} (expected {KIND_CSS!r} or {KIND_XPATH!r})")
+
+
+def _element_value(element: Any, attr: str | None) -> str | None:
+    """Testo normalizzato o attributo di un elemento bs4/lxml (o stringa restituita da XPath)."""
+    if isinstance(element, str):
+        value = element
+    elif attr is not None:
+        value = element.get(attr)
+        if isinstance(value, list):
+            value = " ".join(value)
+    elif isinstance(element, Tag):
+        value = element.get_text(" ")
+    elif isinstance(element, etree._Element):
+        value = " ".join(element.itertext())
+    else:
+        value = str(element)
+    return normalize_text(value) or None
+
+
+class SelectorSpider(BaseSpider):
+    """Spider definito da selectors (campo AdSchema -> FieldSelector); un solo linguaggio per spider.
+
+    parse() restituisce {campo: valore | None}; finalize() produce il dict di AdSchema con source,
+    landing_url di default = url della pagina e URL relativi risolti.
+    """
+
+    source: ClassVar[str] = "web"
+    selectors: ClassVar[dict[str, FieldSelector]] = {}
+    _compiled: ClassVar[tuple[tuple[str, tuple[Any, ...], str | None], ...]] = ()
+    _selector_kind: ClassVar[str | None] = None
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        unknown = set(cls.selectors) - set(AD_SCHEMA_FIELDS)
+        if unknown:
+            raise ValueError(f"{cls.__name__}: selectors for unknown AdSchema fields {sorted(unknown)}")
+        kinds = {selector.kind for selector in cls.selectors.values()}
+        if len(kinds) > 1:
+            raise ValueError(f"{cls.__name__}: mixed selector kinds {sorted(kinds)} (one tree per spider)")
+        cls._selector_kind = next(iter(kinds), None)
+        cls._compiled = tuple(
+            (name, tuple(compile_selector(selector.kind, query) for query in selector.queries), selector.attr)
+            for name, selector in cls.selectors.items()
+        )
+
+    def parse(self, response: str) -> dict:
+        """Valori dei campi dichiarati (None se il selettore non trova nulla)."""
+        found: dict[str, str | None] = dict.fromkeys(name for name, _, _ in self._compiled)
+        if self._selector_kind == KIND_CSS:
+            self._select_css(response, found)
+        elif self._selector_kind == KIND_XPATH:
+            self._select_xpath(response, found)
+        return found
+
+    def _select_css(self, response: str, found: dict[str, str | None]) -> None:
+        """Una visita in ordine di documento: per campo, primo elemento della query a priorità più alta.
+
+        Il match di un'alternativa è provvisorio finché un elemento successivo può soddisfare una query
+        a priorità più alta; il campo è chiuso quando matcha la prima query.
+        """
+        # Campo in attesa -> (selettori, attributo, numero di alternative ancora migliori del match attuale)
+        pending = {name: (compiled, attr, len(compiled)) for name, compiled, attr in self._compiled}
+        soup = BeautifulSoup(response, BACKEND_BS4_LXML)
+        for element in soup.descendants:
+            if not isinstance(element, Tag):
+                continue
+            for name, (compiled, attr, best) in list(pending.items()):
+                rank = next((index for index in range(best) if compiled[index].match(element)), None)
+                if rank is None:
+                    continue
+                found[name] = _element_value(element, attr)
+                if rank == 0:
+                    del pending[name]
+                else:
+                    pending[name] = (compiled, attr, rank)
+            if not pending:
+                return
+
+    def _select_xpath(self, response: str, found: dict[str, str | None]) -> None:
+        """XPath precompilati sull'unico albero lxml; per campo primo risultato della prima query che trova qualcosa."""
+        root = _lxml_document(response)
+        if root is None:
+            return
+        for name, compiled, attr in self._compiled:
+            for query in compiled:
+                result = query(root)
+                if isinstance(result, list):
+                    result = result[0] if result else None
+                if result is not None:
+                    found[name] = _element_value(result, attr)
+                    break
+
+    def finalize(self, result: dict, url: str) -> dict:
+        """Dict AdSchema: landing_url di default = url della pagina, URL relativi risolti rispetto a url."""
+        values = {name: result.get(name) for name in AD_SCHEMA_FIELDS}
+        for name in URL_FIELDS:
+            if values[name]:
+                values[name] = urljoin(url, values[name])
+        return AdSchema(
+            source=self.source,
+            title=values["title"],
+            description=values["description"],
+            landing_url=values["landing_url"] or url or None,
+            creative_url=values["creative_url"],
+            collected_at=now_iso(),
+        ).to_dict()
@@ -0,0 +1,100 @@
+"""Coalescing in-process delle richieste identiche (singleflight).
+
+Chiamate concorrenti con la stessa chiave (es. spider + url canonico) attendono un'unica esecuzione
+in corso e ricevono tutte il suo risultato (o la sua eccezione). Versione sync (thread) e async.
+Se il leader async viene cancellato i follower non ricevono CancelledError: riprovano e il primo
+diventa il nuovo leader.
+"""
+
+import asyncio
+import copy
+import threading
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any
+
+from app.core.metrics import record_singleflight
+
+
+class _Call:
+    """Esecuzione in corso per una chiave (sync)."""
+
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException | None = None
+
+
+class SingleFlight:
+    """Una sola esecuzione in volo per chiave; i chiamanti concorrenti ne condividono l'esito.
+
+    I follower ricevono una copia profonda del risultato (i consumer possono modificarlo senza effetti sugli altri).
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: dict[Hashable, _Call] = {}
+        self._async_calls: dict[tuple[int, Hashable], asyncio.Future] = {}
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """Esegue fn() se nessuna chiamata con key è in corso, altrimenti ne attende l'esito."""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+        if not leader:
+            record_singleflight("shared")
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return copy.deepcopy(call.result)
+        record_singleflight("leader")
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+
+    async def ado(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Versione async di do(): coalescing delle coroutine sullo stesso event loop."""
+        loop = asyncio.get_running_loop()
+        loop_key = (id(loop), key)
+        while (future := self._async_calls.get(loop_key)) is not None:
+            record_singleflight("shared")
+            try:
+                result = await asyncio.shield(future)
+            except asyncio.CancelledError:
+                # Cancellato il leader, non questo follower: nuovo tentativo (leader o follower del nuovo leader)
+                if future.cancelled() and not asyncio.current_task().cancelling():
+                    continue
+                raise
+            return copy.deepcopy(result)
+        record_singleflight("leader")
+        future = loop.create_future()
+        self._async_calls[loop_key] = future
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as exc:
+            future.set_exception(exc)
+            future.exception()  # segna l'eccezione come letta se nessun follower è in attesa
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            self._async_calls.pop(loop_key, None)
+
+
+# Istanza di processo condivisa dai service di scraping
+default_singleflight = SingleFlight()
@@ -1,28 +1,24 @@
 """Spider che estrae title e meta description da HTML. Seconda fonte dati compatibile con AdData."""
 
 from app.infrastructure.scraper.base_spider import BaseSpider
-from app.infrastructure.scraper.html_parser import HtmlParser
+from app.infrastructure.scraper.head_extractor import FIELD_META, FIELD_TITLE, extract_head
 
 
 class MetaTitleSpider(BaseSpider):
     """Estrae <title> e meta name='description' dalla risposta HTML; output compatibile con AdData."""
 
+    head_only = True
+
     def parse(self, response: str) -> dict:
-        parser = HtmlParser(response)
-        title = parser.get_title()
-        meta_tags = parser.find_all_by_attribute("meta", "name", "description")
-        description = None
-        if meta_tags and meta_tags[0].get("content"):
-            description = meta_tags[0]["content"].strip()
+        head = extract_head(response, fields=(FIELD_TITLE, FIELD_META), meta_names=("description",))
         return {
             "source": "meta",
-            "title": title,
-            "description": description,
+            "title": head.title,
+            "description": head.description,
             "url": "",
         }
 
-    def run(self, url: str) -> dict:
-        """Esegue fetch e restituisce il dict con url impostato."""
-        data = super().run(url)
-        data["url"] = url
-        return data
+    def finalize(self, result: dict, url: str) -> dict:
+        """Imposta l'url di origine nel dict restituito da parse()."""
+        result["url"] = url
+        return result
@@ -0,0 +1,16 @@
+"""Spider dichiarativo Open Graph: og:title/og:description/og:url/og:image mappati su AdSchema."""
+
+from app.infrastructure.scraper.selector_spider import SelectorSpider, xpath
+
+
+class OpenGraphSpider(SelectorSpider):
+    """Metadati Open Graph della pagina (fallback: meta description e link canonical) come AdSchema."""
+
+    head_only = True
+    source = "opengraph"
+    selectors = {
+        "title": xpath("//meta[@property='og:title']/@content"),
+        "description": xpath(["//meta[@property='og:description']/@content", "//meta[@name='description']/@content"]),
+        "landing_url": xpath(["//meta[@property='og:url']/@content", "//link[@rel='canonical']/@href"]),
+        "creative_url": xpath("//meta[@property='og:image']/@content"),
+    }
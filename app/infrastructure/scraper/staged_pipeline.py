@@ -0,0 +1,144 @@
+"""Pipeline a stadi: ogni stage ha i propri worker (thread) e una coda di ingresso limitata.
+
+Un elemento passa da uno stage al successivo con put() bloccante: se uno stage lento riempie la propria coda,
+i worker dello stage precedente si fermano e la pressione risale fino al produttore (put/run). Gli stage
+CPU-bound delegano il lavoro a un pool di processi (es. ParserPool) dal proprio worker, così il numero di
+worker resta il limite di concorrenza dello stage. Una funzione di stage che restituisce None scarta
+l'elemento; un'eccezione lo scarta e viene registrata (log, metrica) senza fermare la pipeline. Se tutti i
+worker di uno stage terminano per un'eccezione non Exception (BaseException), lo stage viene chiuso: i suoi
+elementi sono scartati e gli stage successivi terminano, così join() non resta in attesa.
+"""
+
+import queue
+import threading
+import time
+from collections.abc import Callable, Iterable, Sequence
+from dataclasses import dataclass
+from typing import Any
+
+from app.core.logging import get_logger
+from app.core.metrics import record_stage_item, set_stage_queue_depth
+
+LOG = get_logger("app")
+
+DEFAULT_QUEUE_SIZE = 64
+_STOP = object()
+
+
+@dataclass(frozen=True)
+class Stage:
+    """Stage della pipeline: nome (label delle metriche), funzione elemento -> elemento, worker e coda."""
+
+    name: str
+    fn: Callable[[Any], Any]
+    workers: int = 1
+    queue_size: int = DEFAULT_QUEUE_SIZE
+
+
+class StagedPipeline:
+    """Esegue gli stage in sequenza con code limitate; l'output dell'ultimo stage va a sink (default: lista)."""
+
+    def __init__(self, stages: Sequence[Stage], sink: Callable[[Any], None] | None = None) -> None:
+        if not stages:
+            raise ValueError("StagedPipeline needs at least one stage")
+        self.stages = list(stages)
+        self.results: list = []
+        self._sink = sink if sink is not None else self.results.append
+        self._queues = [queue.Queue(maxsize=max(1, stage.queue_size)) for stage in self.stages]
+        self._live = [max(1, stage.workers) for stage in self.stages]
+        self._closed = [False] * len(self.stages)
+        self._lock = threading.Lock()
+        self._threads: list[threading.Thread] = []
+
+    def start(self) -> None:
+        """Avvia i worker di tutti gli stage."""
+        for index, stage in enumerate(self.stages):
+            for worker in range(self._live[index]):
+                thread = threading.Thread(
+                    target=self._work, args=(index,), name=f"stage-{stage.name}-{worker}", daemon=True
+                )
+                thread.start()
+                self._threads.append(thread)
+
+    def put(self, item: Any, timeout: float | None = None) -> None:
+        """Accoda un elemento al primo stage; blocca se la coda è piena (queue.Full dopo timeout)."""
+        self._emit(0, item, timeout)
+
+    def close(self) -> None:
+        """Nessun altro input: ogni stage termina dopo aver smaltito la coda e chiude il successivo."""
+        for _ in range(self._live[0]):
+            self._queues[0].put(_STOP)
+
+    def join(self, timeout: float | None = None) -> None:
+        """Attende la terminazione dei worker (dopo close)."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for thread in self._threads:
+            thread.join(None if deadline is None else max(0.0, deadline - time.monotonic()))
+
+    def run(self, items: Iterable[Any]) -> list:
+        """start, put di tutti gli elementi (con backpressure), close e join; restituisce self.results."""
+        self.start()
+        try:
+            for item in items:
+                self.put(item)
+        finally:
+            self.close()
+            self.join()
+        return self.results
+
+    def _emit(self, index: int, item: Any, timeout: float | None = None) -> None:
+        if index == len(self.stages):
+            self._sink(item)
+            return
+        if self._closed[index]:
+            record_stage_item(self.stages[index].name, "error", 0.0)
+            return
+        inbox = self._queues[index]
+        inbox.put(item, timeout=timeout)
+        set_stage_queue_depth(self.stages[index].name, inbox.qsize())
+
+    def _work(self, index: int) -> None:
+        stage = self.stages[index]
+        inbox = self._queues[index]
+        try:
+            while True:
+                item = inbox.get()
+                set_stage_queue_depth(stage.name, inbox.qsize())
+                if item is _STOP:
+                    break
+                started = time.perf_counter()
+                elapsed = None
+                try:
+                    result = stage.fn(item)
+                    # Tempo dello stage senza l'attesa su una coda successiva piena (backpressure)
+                    elapsed = time.perf_counter() - started
+                    if result is not None:
+                        self._emit(index + 1, result)
+                except Exception as exc:
+                    record_stage_item(stage.name, "error", elapsed or time.perf_counter() - started)
+                    LOG.warning("staged pipeline: stage %s failed on item (%r)", stage.name, exc)
+                    continue
+                record_stage_item(stage.name, "dropped" if result is None else "ok", elapsed)
+        finally:
+            # Anche se il worker termina per una BaseException: l'ultimo chiude lo stage e il successivo
+            with self._lock:
+                self._live[index] -= 1
+                last = self._live[index] == 0
+            if last:
+                self._close_stage(index)
+
+    def _close_stage(self, index: int) -> None:
+        """Stage senza worker: scarta gli elementi rimasti (il produttore non resta bloccato) e chiude il successivo."""
+        self._closed[index] = True
+        inbox = self._queues[index]
+        while True:
+            try:
+                item = inbox.get_nowait()
+            except queue.Empty:
+                break
+            if item is not _STOP:
+                record_stage_item(self.stages[index].name, "error", 0.0)
+        set_stage_queue_depth(self.stages[index].name, 0)
+        if index + 1 < len(self.stages):
+            for _ in range(self._live[index + 1]):
+                self._queues[index + 1].put(_STOP)
@@ -0,0 +1,66 @@
+"""Lettura a chunk del corpo HTTP con terminazione anticipata (fine <head>) e limite di dimensione.
+
+Usato da HttpClient e AsyncHttpClient in modalità streaming: gli spider che dichiarano head_only
+ricevono solo l'HTML fino a </head> incluso, senza scaricare e decodificare il resto della pagina.
+"""
+
+import re
+
+STREAM_CHUNK_SIZE = 16 * 1024
+# Limite di default per il corpo completo e per la sola sezione <head>
+MAX_BODY_BYTES = 10 * 1024 * 1024
+MAX_HEAD_BYTES = 512 * 1024
+
+HEAD_END_PATTERN = re.compile(rb"</head\s*>", re.IGNORECASE)
+# Byte da mantenere tra un chunk e il successivo per trovare "</head>" spezzato a metà
+_HEAD_END_OVERLAP = 16
+
+
+class BodyAccumulator:
+    """Accumula chunk fino a </head> (se head_only) o fino a max_bytes; feed() restituisce True per fermarsi."""
+
+    def __init__(self, head_only: bool = False, max_bytes: int | None = None) -> None:
+        self.head_only = head_only
+        if max_bytes is None:
+            max_bytes = MAX_HEAD_BYTES if head_only else MAX_BODY_BYTES
+        self.max_bytes = max_bytes
+        self._chunks: list[bytes] = []
+        self._size = 0
+        self._head_end: int | None = None
+        self.truncated = False
+
+    @property
+    def size(self) -> int:
+        """Byte accumulati finora."""
+        return self._size
+
+    def feed(self, chunk: bytes) -> bool:
+        """Aggiunge un chunk; True se la lettura può terminare (head chiuso o limite raggiunto)."""
+        if not chunk:
+            return False
+        if self.head_only:
+            tail = self._chunks[-1][-_HEAD_END_OVERLAP:] if self._chunks else b""
+            match = HEAD_END_PATTERN.search(tail + chunk)
+            if match is not None:
+                self._head_end = self._size - len(tail) + match.end()
+                self._chunks.append(chunk)
+                self._size += len(chunk)
+                return True
+        self._chunks.append(chunk)
+        self._size += len(chunk)
+        if self._size >= self.max_bytes:
+            # Limite raggiunto: il resto del corpo (se c'è) non viene letto, il corpo va trattato come parziale
+            self.truncated = True
+            return True
+        return False
+
+    def body(self) -> bytes:
+        """Corpo accumulato, tagliato a </head> (head_only) e a max_bytes."""
+        data = b"".join(self._chunks)
+        if self._head_end is not None:
+            data = data[: self._head_end]
+        return data[: self.max_bytes]
+
+    def text(self, encoding: str | None) -> str:
+        """Corpo decodificato (encoding della risposta, fallback utf-8; byte invalidi sostituiti)."""
+        return self.body().decode(encoding or "utf-8", errors="replace")
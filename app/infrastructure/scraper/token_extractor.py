@@ -1,6 +1,6 @@
 """Estrae input nascosti da HTML (CSRF, lsd, __VIEWSTATE, ecc.) per POST e session-based scraping."""
 
-from bs4 import BeautifulSoup
+from app.infrastructure.scraper.head_extractor import FIELD_HIDDEN_INPUTS, extract_head
 
 
 def extract_hidden_inputs(html_content: str) -> dict[str, str]:
@@ -8,12 +8,6 @@ def extract_hidden_inputs(html_content: str) -> dict[str, str]:
 
     Restituisce un dizionario riutilizzabile per richieste POST e session-based scraping.
     I campi senza name o senza value vengono ignorati.
+    Singola passata a eventi (head_extractor), senza costruire l'albero del documento.
     """
-    soup = BeautifulSoup(html_content, "html.parser")
-    result: dict[str, str] = {}
-    for tag in soup.find_all("input", type="hidden"):
-        name = tag.get("name")
-        value = tag.get("value")
-        if name is not None and value is not None:
-            result[name] = value
-    return result
+    return extract_head(html_content, fields=(FIELD_HIDDEN_INPUTS,)).hidden_inputs
@@ -0,0 +1,196 @@
+"""Trasporto HTTP condiviso a livello di processo: pool keep-alive per host, limite connessioni per host.
+
+Un unico HTTPAdapter (urllib3 PoolManager) è montato su tutte le sessioni requests dello scraper:
+le sessioni restano separate (cookie, headers) ma riusano le stesse connessioni TCP/TLS.
+Per il client async, un httpx.AsyncClient per event loop e un semaforo per host.
+Le connessioni sync risolvono gli host tramite DnsCache; prewarm() apre in anticipo connessioni nel pool.
+"""
+
+import asyncio
+import threading
+import weakref
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import EmptyPoolError
+from urllib3.util.retry import Retry
+
+from app.core.logging import get_logger
+from app.infrastructure.scraper.dns_cache import DnsCache, default_dns_cache, pool_classes_for
+from app.infrastructure.scraper.urls import host_of
+
+LOG = get_logger("app")
+
+# Numero di host distinti con pool mantenuto in cache (urllib3 PoolManager)
+POOL_HOSTS = 100
+# Connessioni massime per host (oltre: attesa di una connessione libera)
+POOL_MAXSIZE_PER_HOST = 10
+# Attesa massima di una connessione libera (pool esaurito -> requests.ConnectionError invece di bloccare)
+POOL_TIMEOUT_SECONDS = 30.0
+# Connessioni keep-alive totali per il client async
+ASYNC_MAX_CONNECTIONS = 200
+ASYNC_MAX_KEEPALIVE = 100
+# urllib3: solo un nuovo tentativo di connessione; retry su status/timeout gestiti da fetch_with_retry
+# (circuit breaker e retry budget), per non moltiplicare i tentativi dentro ogni singolo attempt.
+RETRY_CONNECT = 1
+
+
+class _PoolTimeoutMixin:
+    """Pool urllib3 con attesa limitata di una connessione libera (pool_block): EmptyPoolError allo scadere."""
+
+    pool_timeout: float | None = None
+
+    def _get_conn(self, timeout: float | None = None):
+        return super()._get_conn(timeout=self.pool_timeout if timeout is None else timeout)
+
+
+class SharedHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter condiviso: close() di una singola sessione non chiude i pool degli altri.
+
+    I pool usano connessioni con risoluzione DNS tramite dns_cache; l'attesa di una connessione libera
+    è limitata a pool_timeout secondi, così una connessione non restituita degrada invece di bloccare l'host.
+    """
+
+    def __init__(self, dns_cache: DnsCache, pool_timeout: float | None = POOL_TIMEOUT_SECONDS, **kwargs) -> None:
+        self.dns_cache = dns_cache
+        self.pool_timeout = pool_timeout
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs) -> None:
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            scheme: type(pool_class.__name__, (_PoolTimeoutMixin, pool_class), {"pool_timeout": self.pool_timeout})
+            for scheme, pool_class in pool_classes_for(self.dns_cache).items()
+        }
+
+    def send(self, request, *args, **kwargs):
+        """Come HTTPAdapter.send; pool esaurito oltre pool_timeout -> requests.ConnectionError."""
+        try:
+            return super().send(request, *args, **kwargs)
+        except EmptyPoolError as exc:
+            raise requests.ConnectionError(exc, request=request) from exc
+
+    def close(self) -> None:
+        """No-op: i pool appartengono al TransportRegistry."""
+
+    def close_pools(self) -> None:
+        """Chiude realmente tutti i pool (chiamato solo dal registry)."""
+        super().close()
+
+
+class TransportRegistry:
+    """Registro di processo dei trasporti HTTP (sync e async); thread-safe."""
+
+    def __init__(
+        self,
+        pool_hosts: int = POOL_HOSTS,
+        pool_maxsize_per_host: int = POOL_MAXSIZE_PER_HOST,
+        dns_cache: DnsCache | None = None,
+        pool_timeout: float | None = POOL_TIMEOUT_SECONDS,
+    ) -> None:
+        self.pool_hosts = pool_hosts
+        self.pool_maxsize_per_host = pool_maxsize_per_host
+        self.pool_timeout = pool_timeout
+        self.dns_cache = dns_cache if dns_cache is not None else default_dns_cache
+        self._lock = threading.Lock()
+        self._adapter: SharedHTTPAdapter | None = None
+        self._async_clients: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+        self._host_slots: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+    def adapter(self) -> SharedHTTPAdapter:
+        """HTTPAdapter condiviso (creato al primo uso): pool per host, pool_block per il limite per host."""
+        with self._lock:
+            if self._adapter is None:
+                retry = Retry(total=RETRY_CONNECT, connect=RETRY_CONNECT, read=0, status=0)
+                self._adapter = SharedHTTPAdapter(
+                    dns_cache=self.dns_cache,
+                    pool_timeout=self.pool_timeout,
+                    pool_connections=self.pool_hosts,
+                    pool_maxsize=self.pool_maxsize_per_host,
+                    pool_block=True,
+                    max_retries=retry,
+                )
+            return self._adapter
+
+    def new_session(self) -> requests.Session:
+        """Nuova requests.Session (cookie propri) con l'adapter condiviso montato su http/https."""
+        session = requests.Session()
+        adapter = self.adapter()
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    def prewarm(self, url: str, connections: int = 1) -> int:
+        """Risolve l'host di url e apre fino a `connections` connessioni nel pool (best effort).
+
+        Restituisce il numero di connessioni aperte; errori di rete vengono solo loggati.
+        """
+        connections = max(1, min(connections, self.pool_maxsize_per_host))
+        # Stesso pool di una GET da new_session(): la chiave include cert_reqs/ca_certs (verify, anche da
+        # REQUESTS_CA_BUNDLE), che connection_from_url non imposta
+        session = self.new_session()
+        request = session.prepare_request(requests.Request("GET", url))
+        settings = session.merge_environment_settings(request.url, {}, None, None, None)
+        pool = self.adapter().get_connection_with_tls_context(
+            request, settings["verify"], settings["proxies"], settings["cert"]
+        )
+        # _get_conn/_put_conn: unico modo in urllib3 per aprire connessioni nel pool senza una richiesta
+        borrowed = []
+        opened = 0
+        try:
+            for _ in range(connections):
+                conn = pool._get_conn(timeout=0.1)
+                borrowed.append(conn)
+                if not conn.is_connected:
+                    conn.connect()
+                    opened += 1
+        except Exception as exc:
+            LOG.warning("Prewarm failed for %s: %s", host_of(url), exc)
+        finally:
+            for conn in borrowed:
+                pool._put_conn(conn)
+        return opened
+
+    def async_client(self) -> httpx.AsyncClient:
+        """httpx.AsyncClient condiviso per l'event loop corrente (da chiamare dentro una coroutine)."""
+        loop = asyncio.get_running_loop()
+        client = self._async_clients.get(loop)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(
+                follow_redirects=True,
+                limits=httpx.Limits(
+                    max_connections=ASYNC_MAX_CONNECTIONS,
+                    max_keepalive_connections=ASYNC_MAX_KEEPALIVE,
+                ),
+            )
+            self._async_clients[loop] = client
+        return client
+
+    def host_slot(self, url: str) -> asyncio.Semaphore:
+        """Semaforo per host (event loop corrente): limita le connessioni async concorrenti verso lo stesso host."""
+        loop = asyncio.get_running_loop()
+        slots = self._host_slots.setdefault(loop, {})
+        host = host_of(url)
+        slot = slots.get(host)
+        if slot is None:
+            slot = asyncio.Semaphore(self.pool_maxsize_per_host)
+            slots[host] = slot
+        return slot
+
+    def close(self) -> None:
+        """Chiude i pool sync; i client async vanno chiusi con aclose() nel loop di appartenenza."""
+        with self._lock:
+            if self._adapter is not None:
+                self._adapter.close_pools()
+                self._adapter = None
+
+    async def aclose(self) -> None:
+        """Chiude l'AsyncClient dell'event loop corrente."""
+        client = self._async_clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.aclose()
+
+
+# Registro di processo condiviso da tutti i client HTTP dello scraper
+default_transport = TransportRegistry()
@@ -0,0 +1,23 @@
+"""Utility su URL per lo scraper (host, chiavi per-dominio). Nessuna richiesta HTTP."""
+
+from urllib.parse import urlsplit, urlunsplit
+
+
+def host_of(url: str) -> str:
+    """Restituisce l'host (lowercase, senza credenziali né porta) dell'url; stringa vuota se assente."""
+    return (urlsplit(url).hostname or "").lower()
+
+
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def canonical_url(url: str) -> str:
+    """Forma canonica per confronti/chiavi: schema e host lowercase, porta di default rimossa,
+    path vuoto -> "/", query ordinata, fragment rimosso."""
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    port = parts.port
+    netloc = host if port is None or _DEFAULT_PORTS.get(scheme) == port else f"{host}:{port}"
+    query = "&".join(sorted(parts.query.split("&"))) if parts.query else ""
+    return urlunsplit((scheme, netloc, parts.path or "/", query, ""))
@@ -7,6 +7,9 @@ Versioning: tutti gli endpoint sono sotto /api/v1 (URL). Nessun endpoint fuori v
 Vedi docs/API_VERSIONING.md.
 """
 
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.responses import JSONResponse
 from prometheus_fastapi_instrumentator import Instrumentator
@@ -39,10 +42,17 @@ def _error_json(message: str) -> dict:
     return {"detail": message}
 
 
+@asynccontextmanager
+async def _lifespan(_app: FastAPI) -> AsyncIterator[None]:
+    """Nessuna inizializzazione all'avvio (schema DB già creato); allo shutdown chiude gli store dello scraper."""
+    yield
+    scraper_api.shutdown()
+
+
 def create_app() -> FastAPI:
     """Build FastAPI app, attach routers and global REST error handlers."""
     settings = get_settings()
-    app = FastAPI(title=settings.app_name, version=settings.version, debug=settings.debug)
+    app = FastAPI(title=settings.app_name, version=settings.version, debug=settings.debug, lifespan=_lifespan)
     Instrumentator().instrument(app).expose(
         app,
         endpoint="/metrics",
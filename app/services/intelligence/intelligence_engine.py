@@ -1,5 +1,7 @@
 """IntelligenceEngine: trasforma metriche e business rules in marketing intelligence completa."""
 
+from app.core.text_normalization import NormalizedText, normalize_copy, normalize_many
+
 # Benchmark base (hardcoded per ora)
 BENCHMARK_ENGAGEMENT_RATE = 0.04
 
@@ -23,14 +25,22 @@ class IntelligenceEngine:
 
     def evaluate(self, data: dict) -> dict:
         """Legge engagement_rate, creative_score, days_active; applica benchmark e pattern; restituisce intelligence."""
+        return self._evaluate(data, normalize_copy(data.get("ad_copy")))
+
+    def evaluate_many(self, items: list[dict]) -> list[dict]:
+        """evaluate() per un batch: i copy sono normalizzati insieme (una volta per testo distinto)."""
+        copies = normalize_many(item.get("ad_copy") for item in items)
+        return [self._evaluate(item, copy) for item, copy in zip(items, copies)]
+
+    def _evaluate(self, data: dict, copy: NormalizedText) -> dict:
+        """Valutazione con il copy già normalizzato (vista minuscola per le parole chiave)."""
         engagement_rate = data.get("engagement_rate", 0.0) or 0.0
         creative_score = data.get("creative_score", 0.0) or 0.0
         days_active = data.get("days_active", 0) or 0
-        ad_copy_raw = data.get("ad_copy") or ""
 
         creative_type = "unknown"
-        if ad_copy_raw:
-            ad_copy = ad_copy_raw.lower()
+        if copy.text:
+            ad_copy = copy.lower
             direct_response_count = sum(ad_copy.count(w) for w in direct_response_keywords)
             branding_count = sum(ad_copy.count(w) for w in branding_keywords)
             if direct_response_count > branding_count:
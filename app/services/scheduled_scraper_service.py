@@ -1,24 +1,86 @@
-"""Servizio per scraping schedulato: collega SimpleScheduler a ScraperService."""
+"""Servizio per scraping schedulato: collega SimpleScheduler a ScraperService.
 
+I run schedulati mettono l'url nella pipeline a stadi di ScraperService (fetch -> parse -> persist),
+condivisa tra i job: un salvataggio lento su DB non ritarda le fetch dei run successivi.
+"""
+
+import threading
+
+from app.core.config import get_settings
 from app.infrastructure.scraper.http_client import HttpClient
+from app.infrastructure.scraper.parse_cache import ParseCache
+from app.infrastructure.scraper.parser_pool import ParserPool
 from app.infrastructure.scraper.result_collector import ResultCollector
+from app.infrastructure.scraper.result_store import ResultStore
+from app.infrastructure.scraper.engine import STAGE_FETCH, STAGE_PARSE, STAGE_PERSIST
+from app.infrastructure.scraper.staged_pipeline import StagedPipeline
 from app.infrastructure.scheduler.simple_scheduler import SimpleScheduler
 from app.services.scraper_service import ScraperService
 
+CLOSE_TIMEOUT_SECONDS = 30.0
+
 
 class ScheduledScraperService:
     """Esegue scraping periodico tramite SimpleScheduler e ScraperService."""
 
-    def __init__(self, http_client: HttpClient) -> None:
+    def __init__(
+        self,
+        http_client: HttpClient,
+        parse_cache: ParseCache | None = None,
+        parser_pool: ParserPool | None = None,
+        collector: ResultStore | None = None,
+    ) -> None:
         self._scheduler = SimpleScheduler()
-        self.scraper_service = ScraperService(http_client)
-        self.collector = ResultCollector()
+        self._http_client = http_client
+        self.scraper_service = ScraperService(http_client, parse_cache=parse_cache, parser_pool=parser_pool)
+        self.collector = collector if collector is not None else ResultCollector()
+        self._pipeline: StagedPipeline | None = None
+        self._pipeline_lock = threading.Lock()
 
     def start_title_scraping(self, url: str, interval_seconds: int) -> None:
-        """Avvia lo scraping periodico con spider 'title' sull'url dato."""
+        """Avvia lo scraping periodico con spider 'title' sull'url dato. Pagine non cambiate (304) saltate.
+
+        Se abilitato, prima di ogni run risolve l'host e apre connessioni nel pool (pre-warm).
+        """
+        settings = get_settings()
+
+        pipeline = self._title_pipeline()
 
         def job() -> None:
-            result = self.scraper_service.scrape_title(url)
-            self.collector.add(result)
+            pipeline.put(url)
+
+        def warmup() -> None:
+            self._http_client.prewarm([url])
+
+        self._scheduler.start(
+            interval_seconds,
+            job,
+            warmup=warmup if settings.scraper_prewarm_enabled else None,
+            warmup_lead_seconds=settings.scraper_prewarm_lead_seconds,
+        )
+
+    def close(self, timeout: float | None = CLOSE_TIMEOUT_SECONDS) -> None:
+        """Chiude la pipeline dei job: gli url già accodati vengono completati (attesa max timeout)."""
+        with self._pipeline_lock:
+            pipeline, self._pipeline = self._pipeline, None
+        if pipeline is not None:
+            pipeline.close()
+            pipeline.join(timeout)
 
-        self._scheduler.start(interval_seconds, job)
+    def _title_pipeline(self) -> StagedPipeline:
+        """Pipeline a stadi condivisa dai job 'title', creata e avviata al primo uso; risultati nel collector."""
+        with self._pipeline_lock:
+            if self._pipeline is None:
+                settings = get_settings()
+                self._pipeline = self.scraper_service.title_pipeline(
+                    self.collector.add,
+                    skip_unchanged=True,
+                    stage_workers={
+                        STAGE_FETCH: settings.scraper_stage_fetch_workers,
+                        STAGE_PARSE: settings.scraper_stage_parse_workers,
+                        STAGE_PERSIST: settings.scraper_stage_persist_workers,
+                    },
+                    queue_size=settings.scraper_stage_queue_size,
+                )
+                self._pipeline.start()
+            return self._pipeline
@@ -1,14 +1,25 @@
 """Servizio scraper: layer tra API e spider. Delega a http_client e registry spider."""
 
+import asyncio
 import hashlib
+from collections.abc import AsyncIterator, Callable
+from dataclasses import asdict
 from datetime import date
 
 from app.infrastructure.database import get_db
+from app.infrastructure.scraper.async_http_client import AsyncHttpClient
+from app.infrastructure.scraper.engine import DEFAULT_STAGE_WORKERS, STAGE_FETCH, STAGE_PARSE, STAGE_PERSIST
 from app.infrastructure.scraper.http_client import HttpClient
 from app.infrastructure.scraper.models import ScrapeResult
+from app.infrastructure.scraper.parse_cache import ParseCache
+from app.infrastructure.scraper.parser_pool import ParserPool
+from app.infrastructure.scraper.singleflight import SingleFlight, default_singleflight
 from app.infrastructure.scraper.spider_registry import SpiderRegistry
 from app.infrastructure.scraper.spiders.meta_title_spider import MetaTitleSpider
+from app.infrastructure.scraper.spiders.open_graph_spider import OpenGraphSpider
 from app.infrastructure.scraper.spiders.title_spider import TitleSpider
+from app.infrastructure.scraper.staged_pipeline import DEFAULT_QUEUE_SIZE, Stage, StagedPipeline
+from app.infrastructure.scraper.urls import canonical_url
 from app.models.ad_analysis import AdAnalysisRead
 from app.repositories.ad_repository import AdRepository
 
@@ -46,31 +57,145 @@ def _scrape_result_to_ad_data(result: dict | ScrapeResult) -> dict:
 class ScraperService:
     """Separa API dalla logica di scraping: fetch_html, scrape_title o scrape(spider_name, url)."""
 
-    def __init__(self, http_client: HttpClient) -> None:
+    def __init__(
+        self,
+        http_client: HttpClient,
+        async_http_client: AsyncHttpClient | None = None,
+        singleflight: SingleFlight | None = None,
+        parse_cache: ParseCache | None = None,
+        parser_pool: ParserPool | None = None,
+    ) -> None:
         self._http_client = http_client
+        self._async_http_client = async_http_client
+        self._parse_cache = parse_cache
+        self._parser_pool = parser_pool
+        self._singleflight = singleflight if singleflight is not None else default_singleflight
         self.registry = SpiderRegistry()
         self.registry.register("title", TitleSpider)
         self.registry.register("meta", MetaTitleSpider)
+        self.registry.register("opengraph", OpenGraphSpider)
 
     def scrape(self, spider_name: str, url: str) -> dict:
-        """Ottiene lo spider dal registry, crea istanza, esegue run(url). Solleva ValueError se spider non trovato."""
+        """Ottiene lo spider dal registry, crea istanza, esegue run(url). Solleva ValueError se spider non trovato.
+
+        Chiamate concorrenti per lo stesso (spider, url canonico) condividono un'unica fetch+parse.
+        """
+        spider_class = self.registry.get(spider_name)
+        if spider_class is None:
+            raise ValueError(f"Spider '{spider_name}' not found")
+        spider = self._spider(spider_class)
+        return self._singleflight.do((spider_name, canonical_url(url)), lambda: spider.run(url))
+
+    async def ascrape(self, spider_name: str, url: str) -> dict:
+        """Come scrape() ma asincrono: lo spider usa async_http_client. Solleva ValueError se spider non trovato."""
         spider_class = self.registry.get(spider_name)
         if spider_class is None:
             raise ValueError(f"Spider '{spider_name}' not found")
-        spider = spider_class(self._http_client)
-        return spider.run(url)
+        spider = self._spider(spider_class, self._async_http_client)
+        return await self._singleflight.ado((spider_name, canonical_url(url)), lambda: spider.arun(url))
+
+    def scrape_many(self, spider_name: str, urls: list[str], concurrency: int) -> AsyncIterator[dict]:
+        """Scraping asincrono di più url con al massimo `concurrency` fetch in corso.
+
+        Restituisce un async iterator che produce un dict per url appena pronto (ordine di completamento):
+        {"url", "status": "ok", "result"} oppure {"url", "status": "error", "error"}. Un url lento o in errore
+        non blocca gli altri. Solleva ValueError subito se lo spider non esiste.
+        """
+        spider_class = self.registry.get(spider_name)
+        if spider_class is None:
+            raise ValueError(f"Spider '{spider_name}' not found")
+        spider = self._spider(spider_class, self._async_http_client)
+        return self._scrape_many(spider_name, spider, urls, max(1, concurrency))
+
+    async def _scrape_many(self, spider_name: str, spider, urls: list[str], concurrency: int) -> AsyncIterator[dict]:
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def scrape_one(url: str) -> dict:
+            async with semaphore:
+                try:
+                    result = await self._singleflight.ado(
+                        (spider_name, canonical_url(url)),
+                        lambda: spider.arun(url),
+                    )
+                except Exception as exc:
+                    return {"url": url, "status": "error", "error": str(exc) or exc.__class__.__name__}
+            if isinstance(result, ScrapeResult):
+                result = asdict(result)
+            return {"url": url, "status": "ok", "result": result}
+
+        tasks = [asyncio.create_task(scrape_one(url)) for url in urls]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def _spider(self, spider_class, async_http_client: AsyncHttpClient | None = None):
+        """Istanza dello spider con client, parse cache e parser pool del servizio."""
+        return spider_class(
+            self._http_client,
+            async_http_client,
+            parse_cache=self._parse_cache,
+            parser_pool=self._parser_pool,
+        )
 
     def fetch_html(self, url: str) -> str:
         """Delega al http_client la GET; restituisce il corpo della risposta come stringa."""
         return self._http_client.get(url)
 
-    def scrape_title(self, url: str) -> dict:
-        """Ottiene spider 'title' dal registry, crea istanza, esegue run(url), persiste su DB e restituisce il risultato."""
+    def scrape_title(self, url: str, skip_unchanged: bool = False) -> dict | None:
+        """Ottiene spider 'title' dal registry, scarica url, esegue parse, persiste su DB e restituisce il risultato.
+
+        Con skip_unchanged=True, se la pagina non è cambiata (304 da GET condizionale) salta
+        parse e upsert su DB e restituisce None.
+        """
+        spider = self._title_spider()
+        fetched = self._http_client.fetch(url, head_only=spider.head_only)
+        if skip_unchanged and fetched.not_modified:
+            return None
+        return self._persist_title(spider.process(fetched.text, url))
+
+    def title_pipeline(
+        self,
+        sink: Callable[[dict], None],
+        skip_unchanged: bool = False,
+        stage_workers: dict[str, int] | None = None,
+        queue_size: int = DEFAULT_QUEUE_SIZE,
+    ) -> StagedPipeline:
+        """Come scrape_title ma a stadi (fetch -> parse -> persist, code limitate): un url per elemento con put().
+
+        Un salvataggio lento su DB non ferma le fetch degli url successivi; sink riceve il dict di scrape_title.
+        Pipeline da avviare con start() e chiudere con close()/join().
+        """
+        spider = self._title_spider()
+        workers = {**DEFAULT_STAGE_WORKERS, **(stage_workers or {})}
+
+        def fetch(url: str) -> tuple[str, str] | None:
+            fetched = self._http_client.fetch(url, head_only=spider.head_only)
+            if skip_unchanged and fetched.not_modified:
+                return None
+            return url, fetched.text
+
+        def parse(fetched: tuple[str, str]):
+            url, html = fetched
+            return spider.process(html, url)
+
+        stages = [
+            Stage(name, fn, workers[name], queue_size)
+            for name, fn in ((STAGE_FETCH, fetch), (STAGE_PARSE, parse), (STAGE_PERSIST, self._persist_title))
+        ]
+        return StagedPipeline(stages, sink=sink)
+
+    def _title_spider(self):
+        """Istanza dello spider 'title' dal registry; ValueError se non registrato."""
         spider_class = self.registry.get("title")
         if spider_class is None:
             raise ValueError("Spider 'title' not found")
-        spider = spider_class(self._http_client)
-        result = spider.run(url)
+        return self._spider(spider_class)
+
+    def _persist_title(self, result) -> dict:
+        """Salva su DB il risultato dello spider 'title' e lo restituisce come dict."""
         # Persistenza: sessione DB e save tramite AdRepository
         for db in get_db():
             ad_data = _scrape_result_to_ad_data(result)
@@ -0,0 +1 @@
+"""Benchmark di parsing/estrazione dello scraper (script eseguibili con python -m benchmarks.<nome>)."""
@@ -0,0 +1,72 @@
+"""Benchmark: head_extractor (singola passata a eventi) contro il percorso soup degli spider.
+
+Uso: python -m benchmarks.bench_head_extractor [--repeat N]
+Misura per pagina fixture (intera e con body gonfiato) il tempo medio di estrazione di title + meta description.
+"""
+
+import argparse
+import timeit
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+
+from app.infrastructure.scraper.head_extractor import FIELD_META, FIELD_TITLE, extract_head
+from app.infrastructure.scraper.html_parser import BACKEND_LXML, HtmlParser
+
+FIXTURES_DIR = Path(__file__).resolve().parent.parent / "tests" / "fixtures" / "html"
+# Body ripetuto per simulare pagine reali (molto più pesanti del solo <head>)
+BODY_INFLATION = 200
+
+
+def soup_title_meta(html: str) -> tuple:
+    """Percorso storico degli spider: albero BeautifulSoup completo con html.parser."""
+    soup = BeautifulSoup(html, "html.parser")
+    title_tag = soup.find("title")
+    meta = soup.find("meta", attrs={"name": "description"})
+    return (title_tag.get_text(strip=True) if title_tag else None, meta.get("content") if meta else None)
+
+
+def lxml_title_meta(html: str) -> tuple:
+    """Albero lxml.html nativo tramite HtmlParser."""
+    parser = HtmlParser(html, backend=BACKEND_LXML)
+    meta = parser.find_all_by_attribute("meta", "name", "description")
+    return (parser.get_title(), meta[0].get("content") if meta else None)
+
+
+def extractor_title_meta(html: str) -> tuple:
+    """head_extractor: nessun DOM, stop a campi completi."""
+    head = extract_head(html, fields=(FIELD_TITLE, FIELD_META), meta_names=("description",))
+    return (head.title, head.meta.get("description"))
+
+
+CANDIDATES = {
+    "soup(html.parser)": soup_title_meta,
+    "lxml.html": lxml_title_meta,
+    "head_extractor": extractor_title_meta,
+}
+
+
+def _inflate(html: str) -> str:
+    start, end = html.find("<body"), html.rfind("</body>")
+    if start < 0 or end < 0:
+        return html * BODY_INFLATION
+    return html[:end] + html[start:end] * BODY_INFLATION + html[end:]
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument("--repeat", type=int, default=50)
+    args = arg_parser.parse_args()
+    print(f"{'page':<28}{'KB':>8}" + "".join(f"{name:>20}" for name in CANDIDATES))
+    for path in sorted(FIXTURES_DIR.glob("*.html")):
+        for label, html in ((path.stem, path.read_text(encoding="utf-8")), (f"{path.stem}+body", None)):
+            html = html if html is not None else _inflate(path.read_text(encoding="utf-8"))
+            row = f"{label:<28}{len(html.encode()) / 1024:>8.1f}"
+            for fn in CANDIDATES.values():
+                seconds = timeit.timeit(lambda: fn(html), number=args.repeat) / args.repeat
+                row += f"{seconds * 1000:>17.3f} ms"
+            print(row)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""Benchmark: scanner lineare dei blocchi JSON (json_blocks) contro le regex storiche di MetaSpider.
+
+Uso: python -m benchmarks.bench_json_blocks [--ads N] [--repeat N]
+Genera due pagine di più MB (grande window._sharedData; stile Ad Library con payload data-sjs e copy
+contenenti "};") e misura tempo medio, MB/s e blocchi decodificati per ciascun estrattore.
+"""
+
+import argparse
+import json
+import random
+import re
+import timeit
+
+from app.infrastructure.scraper.json_blocks import KIND_LD_JSON, extract_json_blocks
+
+# Regex della versione precedente di meta_spider (riportate qui solo per confronto)
+LEGACY_SHARED_DATA = re.compile(r"window\._sharedData\s*=\s*(\{.*?\});", re.DOTALL)
+LEGACY_LD_JSON = re.compile(
+    r'<script[^>]*type\s*=\s*["\']application/ld\+json["\'][^>]*>(.*?)</script>',
+    re.DOTALL | re.IGNORECASE,
+)
+
+
+def legacy_extract(html: str) -> list:
+    """Due passate regex + json.loads su sottostringhe (implementazione storica)."""
+    blocks = []
+    for pattern in (LEGACY_SHARED_DATA, LEGACY_LD_JSON):
+        for match in pattern.finditer(html):
+            try:
+                blocks.append(json.loads(match.group(1).strip()))
+            except json.JSONDecodeError:
+                continue
+    return blocks
+
+
+def _ad(rng: random.Random, index: int, tricky: bool) -> dict:
+    suffix = " {code}; solo oggi!" if tricky else " solo oggi!"
+    return {
+        "ad_archive_id": str(10**15 + index),
+        "page_name": f"Brand {index % 97}",
+        "snapshot": {
+            "body": {"text": f"Offerta {index}: fino al -{rng.randint(10, 70)}%{suffix}"},
+            "images": [{"original_image_url": f"https://scontent.example.com/{index}.jpg"}],
+            "cta_text": "Shop now",
+        },
+        "start_date": 1_700_000_000 + index * 3600,
+        "publisher_platform": ["facebook", "instagram"],
+    }
+
+
+def build_shared_data_page(ads: int, seed: int = 7) -> str:
+    """Pagina con molti script JS e un grande window._sharedData (nessun "};" nelle stringhe)."""
+    rng = random.Random(seed)
+    shared = {"entry_data": {"ads": [_ad(rng, i, tricky=False) for i in range(ads)]}}
+    return (
+        "<!DOCTYPE html><html><head><title>Ads</title>"
+        '<script type="application/ld+json">{"@type": "WebPage", "name": "Ads"}</script></head><body>'
+        + "<script>var cfg = {a: 1};</script><div class='x1'><span>layout</span></div>" * 2000
+        + f"<script>window._sharedData = {json.dumps(shared)};</script></body></html>"
+    )
+
+
+def build_ad_library_page(ads: int, seed: int = 7) -> str:
+    """Pagina stile Ad Library: annunci in payload data-sjs da 50, copy con "};", piccolo _sharedData finale."""
+    rng = random.Random(seed)
+    parts = ["<!DOCTYPE html><html><head><title>Ad Library</title></head><body>"]
+    for index in range(0, ads, 50):
+        chunk = [_ad(rng, i, tricky=True) for i in range(index, min(index + 50, ads))]
+        parts.append("<div class='x1'>" + "<span class='x2'>layout</span>" * 40 + "</div>")
+        parts.append("<script>(function(){var a={b:1};if(a.b){a.c='};'}})();</script>")
+        payload = {"require": [["ScheduledServerJS", "handle", None, [{"__bbox": {"result": {"data": chunk}}}]]]}
+        parts.append(f'<script type="application/json" data-content-len="0" data-sjs>{json.dumps(payload)}</script>')
+    shared = {"entry_data": {"ads": [_ad(rng, i, tricky=True) for i in range(min(ads, 200))]}}
+    parts.append(f"<script>window._sharedData = {json.dumps(shared)};</script></body></html>")
+    return "".join(parts)
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument("--ads", type=int, default=8000)
+    arg_parser.add_argument("--repeat", type=int, default=5)
+    args = arg_parser.parse_args()
+    legacy_kinds = frozenset({"_sharedData", KIND_LD_JSON})
+    candidates = {
+        "legacy regex": legacy_extract,
+        "scanner (same kinds)": lambda html: extract_json_blocks(html, legacy_kinds),
+        "scanner (all kinds)": extract_json_blocks,
+    }
+    for title, html in (
+        ("shared-data page", build_shared_data_page(args.ads)),
+        ("ad-library page", build_ad_library_page(args.ads)),
+    ):
+        size_mb = len(html.encode()) / (1024 * 1024)
+        print(f"{title}: {size_mb:.2f} MB, {args.ads} ads")
+        for name, fn in candidates.items():
+            seconds = timeit.timeit(lambda: fn(html), number=args.repeat) / args.repeat
+            print(f"  {name:<22}{seconds * 1000:>9.1f} ms{size_mb / seconds:>9.1f} MB/s{len(fn(html)):>6} blocks")
+
+
+if __name__ == "__main__":
+    main()
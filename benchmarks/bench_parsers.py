@@ -0,0 +1,206 @@
+"""Suite di benchmark del parsing: backend HtmlParser e spider sul corpus (landing, e-commerce, Ad Library).
+
+Uso: python -m benchmarks.bench_parsers [--repeat N] [--scale F] [--corpus-dir DIR] [--only NOME ...]
+                                        [--output FILE] [--compare FILE]
+Per ogni (target, categoria) riporta pagine/s, MB/s e picco di memoria, misurato in esecuzioni separate da
+quelle cronometrate: RSS del processo (include la memoria nativa di lxml/libxml2; Linux, picco azzerato con
+/proc/self/clear_refs) e heap Python (tracemalloc). Salva i risultati in JSON; con --compare stampa il
+rapporto rispetto a un'esecuzione precedente (pagine/s: >1 più veloce; memoria: >1 più memoria).
+"""
+
+import argparse
+import ctypes
+import ctypes.util
+import gc
+import json
+import platform
+import re
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable
+from datetime import datetime, timezone
+from pathlib import Path
+
+from app.infrastructure.scraper.html_parser import BACKENDS, HtmlParser
+from app.infrastructure.scraper.meta_spider import MetaSpider
+from app.infrastructure.scraper.spiders.meta_title_spider import MetaTitleSpider
+from app.infrastructure.scraper.spiders.open_graph_spider import OpenGraphSpider
+from app.infrastructure.scraper.spiders.title_spider import TitleSpider
+from benchmarks.corpus import CATEGORIES, CorpusPage, load_corpus
+
+DEFAULT_OUTPUT = Path(__file__).resolve().parent / "results" / "bench_parsers.json"
+MB = 1024 * 1024
+_PROC_STATUS = Path("/proc/self/status")
+_PROC_CLEAR_REFS = Path("/proc/self/clear_refs")
+_STATUS_KB = re.compile(r"^(VmRSS|VmHWM):\s+(\d+) kB", re.MULTILINE)
+
+
+def _load_malloc_trim() -> Callable[[int], int] | None:
+    """malloc_trim di glibc: restituisce al sistema la memoria libera, così l'RSS riparte da una base pulita."""
+    libc_name = ctypes.util.find_library("c")
+    if libc_name is None:
+        return None
+    return getattr(ctypes.CDLL(libc_name), "malloc_trim", None)
+
+
+_MALLOC_TRIM = _load_malloc_trim()
+
+
+def _html_parser_workload(backend: str) -> Callable[[str], object]:
+    """Albero completo + accessi tipici degli spider (title, link, meta, classe)."""
+
+    def run(html: str) -> object:
+        parser = HtmlParser(html, backend=backend)
+        return (
+            parser.get_title(),
+            len(parser.find_by_tag("a")),
+            len(parser.find_by_tag("meta")),
+            len(parser.find_by_class("product-card")),
+        )
+
+    return run
+
+
+def build_targets() -> dict[str, Callable[[str], object]]:
+    """Target misurati: un workload per backend di HtmlParser e parse() di ogni spider."""
+    targets: dict[str, Callable[[str], object]] = {
+        f"HtmlParser[{backend}]": _html_parser_workload(backend) for backend in BACKENDS
+    }
+    targets["TitleSpider"] = TitleSpider(None).parse
+    targets["MetaTitleSpider"] = MetaTitleSpider(None).parse
+    targets["OpenGraphSpider"] = OpenGraphSpider(None).parse
+    targets["MetaSpider"] = MetaSpider(None).parse
+    targets["MetaSpider[multi_ad]"] = MetaSpider(None, multi_ad=True).parse
+    return targets
+
+
+def peak_python_memory(fn: Callable[[str], object], html: str) -> int:
+    """Picco dell'heap Python (byte) durante una chiamata; non include la memoria nativa di libxml2."""
+    tracemalloc.start()
+    try:
+        fn(html)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def _proc_status_kb() -> dict[str, int]:
+    return {key: int(value) for key, value in _STATUS_KB.findall(_PROC_STATUS.read_text())}
+
+
+def peak_rss(fn: Callable[[str], object], html: str) -> int | None:
+    """Crescita massima dell'RSS (byte) durante una chiamata; None se non misurabile (non Linux)."""
+    gc.collect()
+    if _MALLOC_TRIM is not None:
+        _MALLOC_TRIM(0)
+    try:
+        _PROC_CLEAR_REFS.write_text("5")  # azzera VmHWM al valore corrente di VmRSS
+        baseline = _proc_status_kb()["VmRSS"]
+        fn(html)
+        return max(0, _proc_status_kb()["VmHWM"] - baseline) * 1024
+    except (OSError, KeyError):
+        return None
+
+
+def measure(fn: Callable[[str], object], pages: list[CorpusPage], repeat: int) -> dict:
+    """Tempo medio per pagina (miglior media su repeat giri dell'intera categoria) e picco di memoria."""
+    total_bytes = sum(page.size for page in pages)
+    for page in pages:
+        fn(page.html)  # riscaldamento (cache di compilazione, import lazy)
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for page in pages:
+            fn(page.html)
+        best = min(best, time.perf_counter() - started)
+    rss = [peak_rss(fn, page.html) for page in pages]
+    peak_python = max(peak_python_memory(fn, page.html) for page in pages)
+    return {
+        "pages": len(pages),
+        "bytes": total_bytes,
+        "seconds": best,
+        "pages_per_sec": len(pages) / best,
+        "mb_per_sec": total_bytes / MB / best,
+        "peak_rss_mb": max(rss) / MB if None not in rss else None,
+        "peak_python_mb": peak_python / MB,
+    }
+
+
+def run_suite(
+    corpus: list[CorpusPage],
+    repeat: int,
+    only: list[str] | None = None,
+    report: Callable[[str], None] = print,
+) -> list[dict]:
+    """Misura ogni target su ogni categoria del corpus; restituisce una riga per (target, categoria)."""
+    by_category: dict[str, list[CorpusPage]] = {}
+    for page in corpus:
+        by_category.setdefault(page.category, []).append(page)
+    categories = [c for c in CATEGORIES if c in by_category] + sorted(set(by_category) - set(CATEGORIES))
+    results = []
+    for target, fn in build_targets().items():
+        if only and target not in only:
+            continue
+        for category in categories:
+            row = {"target": target, "category": category, **measure(fn, by_category[category], repeat)}
+            results.append(row)
+            rss = f"{row['peak_rss_mb']:>8.1f}" if row["peak_rss_mb"] is not None else f"{'n/a':>8}"
+            report(
+                f"{target:<26}{category:<12}{row['pages_per_sec']:>10.1f} pages/s"
+                f"{row['mb_per_sec']:>9.2f} MB/s{rss} MB rss{row['peak_python_mb']:>8.1f} MB py"
+            )
+    return results
+
+
+def compare(results: list[dict], baseline: dict) -> None:
+    """Stampa il rapporto pagine/s e picco di memoria rispetto ai risultati di un'esecuzione precedente."""
+    previous = {(row["target"], row["category"]): row for row in baseline.get("results", [])}
+    print(f"\ncompared with {baseline.get('meta', {}).get('timestamp', '?')}")
+    for row in results:
+        old = previous.get((row["target"], row["category"]))
+        if old is None:
+            continue
+        speed = row["pages_per_sec"] / old["pages_per_sec"]
+        memory = float("nan")
+        if row["peak_rss_mb"] is not None and old.get("peak_rss_mb"):
+            memory = row["peak_rss_mb"] / old["peak_rss_mb"]
+        print(f"{row['target']:<26}{row['category']:<12}{speed:>8.2f}x speed{memory:>8.2f}x rss")
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument("--repeat", type=int, default=3)
+    arg_parser.add_argument("--scale", type=float, default=1.0, help="fattore di dimensione delle pagine generate")
+    arg_parser.add_argument("--corpus-dir", type=Path, default=None)
+    arg_parser.add_argument("--only", nargs="*", default=None, help="nomi dei target da misurare")
+    arg_parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT)
+    arg_parser.add_argument("--compare", type=Path, default=None)
+    args = arg_parser.parse_args()
+
+    corpus = load_corpus(args.corpus_dir, args.scale)
+    for category in sorted({page.category for page in corpus}):
+        pages = [page for page in corpus if page.category == category]
+        print(f"{category}: {len(pages)} pages, {sum(page.size for page in pages) / 1024:.0f} KB")
+    results = run_suite(corpus, args.repeat, args.only)
+
+    payload = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "repeat": args.repeat,
+            "scale": args.scale,
+            "corpus_dir": str(args.corpus_dir) if args.corpus_dir else None,
+        },
+        "results": results,
+    }
+    if args.compare is not None:
+        compare(results, json.loads(args.compare.read_text(encoding="utf-8")))
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+    print(f"\nresults saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
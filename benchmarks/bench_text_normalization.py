@@ -0,0 +1,71 @@
+"""Benchmark: normalizzazione del copy (pipeline fusa, normalize_many) contro la pulizia storica a tre passate.
+
+Uso: python -m benchmarks.bench_text_normalization [--ads N] [--repeat N] [--distinct F]
+Genera N copy sintetici (spazi irregolari, emoji singole e in sequenza, parte dei copy ripetuti come
+nelle pagine Ad Library) e misura il costo per stringa di: pulizia storica + lower() separato,
+normalize_copy per stringa, normalize_many sul batch.
+"""
+
+import argparse
+import random
+import re
+import timeit
+
+from app.core.text_normalization import normalize_copy, normalize_many
+
+# Pulizia della versione precedente di meta_spider (riportata qui solo per confronto)
+LEGACY_EMOJI = re.compile(
+    r"[\U0001F300-\U0001F9FF\U0001F600-\U0001F64F\U0001F680-\U0001F6FF\U0001F1E0-\U0001F1FF\U00002600-\U000026FF\U00002700-\U000027BF]+",
+    re.UNICODE,
+)
+
+
+def legacy_clean(text: str) -> tuple[str, str]:
+    """Tre passate regex (callback Python per le emoji) e lower() ripetuta a valle dall'intelligence."""
+    cleaned = re.sub(r"\s+", " ", text).strip()
+    cleaned = LEGACY_EMOJI.sub(lambda m: " " if len(m.group()) > 2 else m.group(), cleaned)
+    cleaned = re.sub(r"\s+", " ", cleaned).strip()
+    return cleaned, cleaned.lower()
+
+
+WORDS = ["Offerta", "SALDI", "solo", "oggi", "spedizione", "gratuita", "Shop", "now", "nuova", "collezione"]
+EMOJI = ["🔥", "😍", "✅", "☀", "🚀"]
+
+
+def build_copies(ads: int, distinct: float, seed: int = 7) -> list[str]:
+    """Copy sintetici; distinct = frazione di testi unici (il resto ripete copy già visti)."""
+    rng = random.Random(seed)
+    unique = max(1, int(ads * distinct))
+    pool = []
+    for index in range(unique):
+        parts = []
+        for _ in range(rng.randint(8, 40)):
+            parts.append(rng.choice(WORDS))
+            parts.append(rng.choice([" ", "  ", "\n", " \t "]))
+            if rng.random() < 0.15:
+                parts.append(rng.choice(EMOJI) * rng.randint(1, 5))
+        pool.append(f"  {index} " + "".join(parts))
+    return [pool[i % unique] for i in range(ads)]
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument("--ads", type=int, default=5000)
+    arg_parser.add_argument("--repeat", type=int, default=5)
+    arg_parser.add_argument("--distinct", type=float, default=0.5)
+    args = arg_parser.parse_args()
+    copies = build_copies(args.ads, args.distinct)
+    candidates = {
+        "legacy 3-pass + lower": lambda: [legacy_clean(text) for text in copies],
+        "normalize_copy": lambda: [normalize_copy(text) for text in copies],
+        "normalize_many": lambda: normalize_many(copies),
+    }
+    size_kb = sum(len(text) for text in copies) / 1024
+    print(f"{args.ads} copies ({args.distinct:.0%} distinct), {size_kb:.0f} KB")
+    for name, fn in candidates.items():
+        seconds = timeit.timeit(fn, number=args.repeat) / args.repeat
+        print(f"  {name:<24}{seconds * 1000:>9.2f} ms{seconds * 1e6 / args.ads:>9.2f} us/string")
+
+
+if __name__ == "__main__":
+    main()
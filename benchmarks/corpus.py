@@ -0,0 +1,108 @@
+"""Corpus HTML per i benchmark di parsing: pagine registrate da disco o generate (deterministiche).
+
+Categorie: landing (pagine piccole, le fixture in tests/fixtures/html), ecommerce (listing pesanti con
+molti prodotti, markup annidato, script e JSON-LD) e ad_library (pagine Ad Library di più MB con payload
+JSON incorporati). Con --corpus-dir si usano pagine registrate: una sottocartella per categoria con file
+*.html (es. corpus/ecommerce/shop1.html); le categorie assenti restano generate.
+"""
+
+import json
+import random
+from dataclasses import dataclass
+from pathlib import Path
+
+from benchmarks.bench_json_blocks import build_ad_library_page
+
+FIXTURES_DIR = Path(__file__).resolve().parent.parent / "tests" / "fixtures" / "html"
+CATEGORY_LANDING = "landing"
+CATEGORY_ECOMMERCE = "ecommerce"
+CATEGORY_AD_LIBRARY = "ad_library"
+CATEGORIES = (CATEGORY_LANDING, CATEGORY_ECOMMERCE, CATEGORY_AD_LIBRARY)
+
+
+@dataclass(frozen=True)
+class CorpusPage:
+    """Pagina del corpus: categoria, nome e corpo HTML (size in byte UTF-8)."""
+
+    category: str
+    name: str
+    html: str
+
+    @property
+    def size(self) -> int:
+        return len(self.html.encode("utf-8"))
+
+
+def build_ecommerce_page(products: int, seed: int = 11) -> str:
+    """Listing e-commerce: head ricco (og, JSON-LD), griglia prodotti annidata, script inline e footer."""
+    rng = random.Random(seed)
+    ld_json = {
+        "@context": "https://schema.org",
+        "@type": "ItemList",
+        "itemListElement": [
+            {"@type": "Product", "name": f"Prodotto {i}", "offers": {"price": f"{rng.uniform(5, 300):.2f}"}}
+            for i in range(min(products, 60))
+        ],
+    }
+    parts = [
+        "<!DOCTYPE html><html lang='it'><head><meta charset='utf-8'>",
+        "<title>Scarpe running uomo | Shop Example</title>",
+        "<meta name='description' content='Scarpe da corsa uomo: nuovi arrivi, saldi e spedizione gratuita.'>",
+        "<meta property='og:title' content='Scarpe running uomo'>",
+        "<meta property='og:image' content='https://cdn.example.com/og/running.jpg'>",
+        "<link rel='canonical' href='https://shop.example.com/uomo/running'>",
+        "<link rel='stylesheet' href='/static/app.css'>" * 12,
+        f"<script type='application/ld+json'>{json.dumps(ld_json)}</script>",
+        "<script>window.dataLayer=window.dataLayer||[];function gtag(){dataLayer.push(arguments);}</script>",
+        "</head><body class='catalog'>",
+        "<header><nav>" + "".join(f"<a class='nav-link' href='/c/{i}'>Categoria {i}</a>" for i in range(40)) + "</nav></header>",
+        "<main><div class='filters'>" + "<label><input type='checkbox' name='f'> Filtro</label>" * 60 + "</div>",
+        "<ul class='product-grid'>",
+    ]
+    for index in range(products):
+        price = rng.uniform(5, 300)
+        parts.append(
+            f"<li class='product-card' data-sku='SKU{index:06d}'><div class='media'>"
+            f"<img src='https://cdn.example.com/p/{index}.jpg' alt='Prodotto {index}' loading='lazy'></div>"
+            f"<div class='info'><h3 class='product-title'><a href='/p/{index}'>Prodotto {index} running</a></h3>"
+            f"<span class='price'>&euro; {price:.2f}</span><span class='badge'>-{rng.randint(5, 60)}%</span>"
+            f"<p class='product-copy'>Ammortizzazione reattiva, tomaia traspirante &amp; suola in gomma.</p>"
+            "<button class='add-to-cart' type='button'>Aggiungi</button></div></li>"
+        )
+    parts.append("</ul></main><footer>" + "<p class='legal'>&copy; Shop Example S.r.l.</p>" * 20 + "</footer>")
+    parts.append("<script>" + "var x=1;" * 2000 + "</script></body></html>")
+    return "".join(parts)
+
+
+def generated_corpus(scale: float = 1.0) -> list[CorpusPage]:
+    """Corpus generato: fixture piccole, due listing e-commerce e due pagine Ad Library (scale riduce/aumenta)."""
+    pages = [
+        CorpusPage(CATEGORY_LANDING, path.stem, path.read_text(encoding="utf-8"))
+        for path in sorted(FIXTURES_DIR.glob("*.html"))
+    ]
+    for products in (200, 1000):
+        count = max(1, int(products * scale))
+        pages.append(CorpusPage(CATEGORY_ECOMMERCE, f"listing_{count}", build_ecommerce_page(count)))
+    for ads in (2000, 8000):
+        count = max(1, int(ads * scale))
+        pages.append(CorpusPage(CATEGORY_AD_LIBRARY, f"ad_library_{count}", build_ad_library_page(count)))
+    return pages
+
+
+def recorded_corpus(corpus_dir: Path) -> list[CorpusPage]:
+    """Pagine registrate in corpus_dir/<categoria>/*.html (categorie note e sconosciute)."""
+    pages = []
+    for category_dir in sorted(path for path in corpus_dir.iterdir() if path.is_dir()):
+        for path in sorted(category_dir.glob("*.html")):
+            pages.append(CorpusPage(category_dir.name, path.stem, path.read_text(encoding="utf-8", errors="replace")))
+    return pages
+
+
+def load_corpus(corpus_dir: Path | None = None, scale: float = 1.0) -> list[CorpusPage]:
+    """Corpus registrato (se indicato) completato con le categorie generate mancanti."""
+    generated = generated_corpus(scale)
+    if corpus_dir is None:
+        return generated
+    recorded = recorded_corpus(corpus_dir)
+    present = {page.category for page in recorded}
+    return recorded + [page for page in generated if page.category not in present]
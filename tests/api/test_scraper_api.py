@@ -0,0 +1,109 @@
+"""
+Test API Scraper – POST /api/v1/scrape/batch (NDJSON) via TestClient, spider finto senza rete.
+"""
+
+import asyncio
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api.v1 import scraper as scraper_api
+from app.infrastructure.scraper.base_spider import BaseSpider
+from app.infrastructure.scraper.result_store import ResultStore
+from app.main import app
+
+
+class FakeSpider(BaseSpider):
+    """Spider finto: url con 'slow' attende, url con 'fail' solleva, gli altri rispondono subito."""
+
+    async def arun(self, url: str) -> dict:
+        if "slow" in url:
+            await asyncio.sleep(0.2)
+        if "fail" in url:
+            raise RuntimeError("boom")
+        return {"title": url.rsplit("/", 1)[-1], "url": url}
+
+    def parse(self, response: str) -> dict:
+        return {}
+
+
+@pytest.fixture
+def fake_spider():
+    scraper_api.scraper_service.registry.register("fake", FakeSpider)
+    yield
+    scraper_api.scraper_service.registry._spiders.pop("fake", None)
+
+
+def _lines(response) -> list[dict]:
+    return [json.loads(line) for line in response.text.splitlines() if line]
+
+
+def test_batch_streams_ndjson_in_completion_order(client: TestClient, fake_spider) -> None:
+    """Ogni url produce una riga NDJSON; l'url lento non ritarda gli altri (arriva per ultimo)."""
+    urls = ["https://a.example.com/slow", "https://b.example.com/one", "https://c.example.com/two"]
+    response = client.post("/api/v1/scrape/batch", json={"urls": urls, "source": "fake", "concurrency": 3})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = _lines(response)
+    assert [line["url"] for line in lines][-1] == "https://a.example.com/slow"
+    assert {line["url"] for line in lines} == set(urls)
+    assert all(line["status"] == "ok" for line in lines)
+
+
+def test_batch_isolates_errors_per_url(client: TestClient, fake_spider) -> None:
+    """Un url in errore produce una riga status=error; gli altri restano ok."""
+    urls = ["https://a.example.com/fail", "https://b.example.com/ok"]
+    lines = _lines(client.post("/api/v1/scrape/batch", json={"urls": urls, "source": "fake"}))
+    by_url = {line["url"]: line for line in lines}
+    assert by_url["https://a.example.com/fail"] == {"url": "https://a.example.com/fail", "status": "error", "error": "boom"}
+    assert by_url["https://b.example.com/ok"]["result"]["title"] == "ok"
+
+
+def test_batch_unknown_source_returns_404(client: TestClient) -> None:
+    """Spider non registrato -> 404."""
+    response = client.post("/api/v1/scrape/batch", json={"urls": ["https://a.example.com/"], "source": "missing"})
+    assert response.status_code == 404
+
+
+def test_batch_empty_urls_returns_422(client: TestClient) -> None:
+    """Lista url vuota -> 422 (validazione body)."""
+    response = client.post("/api/v1/scrape/batch", json={"urls": [], "source": "title"})
+    assert response.status_code == 422
+
+
+@pytest.fixture
+def result_store(monkeypatch):
+    """Result store dell'engine isolato per test: 5 risultati {source, data}."""
+    store = ResultStore(capacity=3)
+    monkeypatch.setattr(scraper_api.engine, "result_store", store)
+    for index in range(1, 6):
+        store.add({"source": "meta", "data": {"title": f"ad {index}"}})
+    return store
+
+
+def test_results_paginated_by_cursor(client: TestClient, result_store) -> None:
+    """after/limit: pagine in ordine di seq; i risultati fuori dal ring (senza spill) non sono più leggibili."""
+    first = client.get("/api/v1/scrape/results", params={"limit": 2}).json()
+    assert [item["seq"] for item in first["results"]] == [3, 4]
+    assert first["results"][0] == {"seq": 3, "source": "meta", "data": {"title": "ad 3"}}
+    assert first["last_seq"] == 5
+    second = client.get("/api/v1/scrape/results", params={"after": first["next_after"], "limit": 2}).json()
+    assert [item["seq"] for item in second["results"]] == [5]
+    empty = client.get("/api/v1/scrape/results", params={"after": second["next_after"]}).json()
+    assert empty == {"results": [], "next_after": 5, "last_seq": 5}
+
+
+def test_results_stream_ndjson(client: TestClient, result_store) -> None:
+    response = client.get("/api/v1/scrape/results", params={"after": 3, "stream": True})
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    assert [line["seq"] for line in _lines(response)] == [4, 5]
+
+
+def test_app_shutdown_persists_result_store(tmp_path, monkeypatch) -> None:
+    """Shutdown dell'app (lifespan): i risultati ancora nel ring sono scritti su disco e rileggibili dopo il riavvio."""
+    store = ResultStore(capacity=3, spill_dir=tmp_path)
+    monkeypatch.setattr(scraper_api.engine, "result_store", store)
+    with TestClient(app):
+        store.add({"source": "meta", "data": {"title": "ad 1"}})
+    assert ResultStore(capacity=3, spill_dir=tmp_path).read(0) == [(1, {"source": "meta", "data": {"title": "ad 1"}})]
@@ -17,6 +17,8 @@ from app.db.models import api_key_orm  # noqa: F401 – registra ApiKeyORM su Ba
 from app.db.models import api_usage_orm  # noqa: F401 – registra ApiUsageORM su Base
 from app.db.models import item_orm  # noqa: F401 – registra tutti i modelli su Base prima di create_all
 from app.db.models.item_orm import ItemORM
+from app.infrastructure.scraper.circuit_breaker import default_circuit_breaker, default_retry_budget
+from app.infrastructure.scraper.politeness import default_politeness
 
 # Inizializzazione DB di test a import time, PRIMA di importare app (tabelle pronte per override).
 # SQLite in-memory condiviso tra tutte le sessioni di test (StaticPool).
@@ -32,6 +34,7 @@ TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=TEST_
 TEST_SESSION_FACTORY = TestingSessionLocal
 
 from app.main import app
+from app.api.v1 import scraper as _scraper_api
 from app.repositories.item_repository import ItemRepository
 from app.services.item_service import ItemService
 from app.db.session import get_db
@@ -144,6 +147,17 @@ def _clean_items(_override_db: None, test_session_factory) -> Generator[None, No
     yield
 
 
+@pytest.fixture(autouse=True)
+def _reset_scraper_state() -> Generator[None, None, None]:
+    """Isolamento scraper: politeness, circuit breaker, retry budget e parse cache di processo azzerati per ogni test."""
+    default_politeness.reset()
+    default_circuit_breaker.reset()
+    default_retry_budget.reset()
+    if _scraper_api.parse_cache is not None:
+        _scraper_api.parse_cache.clear()
+    yield
+
+
 @pytest.fixture
 def client(_override_db: None) -> TestClient:
     """HTTP client per test API. Tabelle create da _override_db prima della creazione del client."""
@@ -0,0 +1,121 @@
+"""Test AsyncHttpClient e BaseSpider.arun senza rete reale (httpx.MockTransport)."""
+
+import asyncio
+
+import httpx
+import pytest
+
+from app.infrastructure.scraper.async_http_client import AsyncHttpClient
+from app.infrastructure.scraper.http_client import HttpClient, USER_AGENTS
+from app.infrastructure.scraper.models import ScrapeResult
+from app.infrastructure.scraper.politeness import HostPoliteness
+from app.infrastructure.scraper.spiders.title_spider import TitleSpider
+from app.infrastructure.scraper.transport import TransportRegistry
+
+HTML = "<html><head><title>Async Title</title></head><body></body></html>"
+
+
+def _client(handler) -> AsyncHttpClient:
+    """AsyncHttpClient su MockTransport con politeness dedicata (nessuno stato condiviso tra test)."""
+    return AsyncHttpClient(
+        transport=httpx.MockTransport(handler),
+        politeness=HostPoliteness(min_gap=0.0, max_gap=0.0),
+    )
+
+
+@pytest.fixture(autouse=True)
+def _no_sleep(mocker) -> None:
+    """Nessuna attesa reale: asyncio.sleep del modulo sostituito da no-op."""
+
+    async def _sleep(_delay: float) -> None:
+        return None
+
+    mocker.patch("app.infrastructure.scraper.async_http_client.asyncio.sleep", _sleep)
+
+
+def test_async_get_returns_text_and_rotates_user_agent() -> None:
+    """200: restituisce il corpo; User-Agent preso dalla lista di rotazione."""
+    seen_agents: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen_agents.append(request.headers["User-Agent"])
+        return httpx.Response(200, text=HTML)
+
+    client = _client(handler)
+    assert asyncio.run(client.get("https://example.com/")) == HTML
+    assert seen_agents[0] in USER_AGENTS
+
+
+def test_async_get_retries_on_429_then_succeeds() -> None:
+    """429 seguito da 200: retry con backoff e risposta finale restituita."""
+    statuses = iter([429, 503, 200])
+    calls: list[int] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        status = next(statuses)
+        calls.append(status)
+        return httpx.Response(status, text=HTML)
+
+    client = _client(handler)
+    assert asyncio.run(client.get("https://example.com/")) == HTML
+    assert calls == [429, 503, 200]
+
+
+def test_async_get_raises_after_retries_exhausted() -> None:
+    """403 persistente: eccezione solo dopo i retry previsti."""
+    calls: list[int] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(403)
+        return httpx.Response(403, text="Forbidden")
+
+    client = _client(handler)
+    with pytest.raises(httpx.HTTPStatusError):
+        asyncio.run(client.get("https://example.com/blocked"))
+    assert len(calls) >= 2
+
+
+def test_spider_arun_uses_async_client() -> None:
+    """BaseSpider.arun: fetch asincrona, parse e url impostato come run()."""
+    client = _client(lambda r: httpx.Response(200, text=HTML))
+    spider = TitleSpider(HttpClient(), client)
+    result = asyncio.run(spider.arun("https://example.com/landing"))
+    assert isinstance(result, ScrapeResult)
+    assert result.url == "https://example.com/landing"
+    assert result.data["title"] == "Async Title"
+
+
+def test_host_slot_held_until_body_is_read() -> None:
+    """Con 1 connessione per host la seconda GET parte solo dopo la lettura del corpo della prima."""
+    second_sent = asyncio.Event()
+    overlapped: list[bool] = []
+
+    class SlowBody(httpx.AsyncByteStream):
+        async def __aiter__(self):
+            yield b"<html><head><title>"
+            try:
+                await asyncio.wait_for(second_sent.wait(), timeout=0.2)
+                overlapped.append(True)
+            except asyncio.TimeoutError:
+                overlapped.append(False)
+            yield b"Slow</title></head></html>"
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/second":
+            second_sent.set()
+            return httpx.Response(200, text=HTML)
+        return httpx.Response(200, stream=SlowBody())
+
+    client = AsyncHttpClient(
+        transport=httpx.MockTransport(handler),
+        politeness=HostPoliteness(min_gap=0.0, max_gap=0.0),
+        registry=TransportRegistry(pool_maxsize_per_host=1),
+    )
+
+    async def main() -> list[str]:
+        return await asyncio.gather(
+            client.get("https://slot.example.com/first"), client.get("https://slot.example.com/second")
+        )
+
+    assert asyncio.run(main())[1] == HTML
+    assert overlapped == [False]
@@ -0,0 +1,32 @@
+"""Smoke test della suite di benchmark del parsing: corpus generato ridotto, righe complete e serializzabili."""
+
+import json
+
+from benchmarks.bench_parsers import build_targets, run_suite
+from benchmarks.corpus import CATEGORIES, load_corpus, recorded_corpus
+
+
+def test_suite_reports_every_target_and_category() -> None:
+    """Una riga per (target, categoria) con pagine/s, MB/s e picchi di memoria; output JSON valido."""
+    corpus = load_corpus(scale=0.01)
+    assert {page.category for page in corpus} == set(CATEGORIES)
+    only = ["HtmlParser[lxml.html]", "MetaSpider[multi_ad]"]
+    results = run_suite(corpus, repeat=1, only=only, report=lambda line: None)
+    assert [(row["target"], row["category"]) for row in results] == [
+        (target, category) for target in only for category in CATEGORIES
+    ]
+    for row in results:
+        assert row["pages_per_sec"] > 0 and row["mb_per_sec"] > 0
+        assert row["peak_python_mb"] >= 0
+    json.dumps(results)
+    assert set(only) <= set(build_targets())
+
+
+def test_recorded_corpus_replaces_generated_category(tmp_path) -> None:
+    """Pagine registrate per categoria sostituiscono quelle generate; le altre categorie restano generate."""
+    (tmp_path / "ecommerce").mkdir()
+    (tmp_path / "ecommerce" / "shop.html").write_text("<html><title>Shop</title></html>", encoding="utf-8")
+    assert [page.name for page in recorded_corpus(tmp_path)] == ["shop"]
+    corpus = load_corpus(tmp_path, scale=0.01)
+    assert [page.name for page in corpus if page.category == "ecommerce"] == ["shop"]
+    assert any(page.category == "ad_library" for page in corpus)
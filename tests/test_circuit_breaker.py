@@ -0,0 +1,190 @@
+"""Test circuit breaker per-host e retry budget globale (nessuna rete reale)."""
+
+import asyncio
+
+import httpx
+import pytest
+import requests
+import requests_mock
+from prometheus_client import REGISTRY
+
+from app.infrastructure.scraper.circuit_breaker import (
+    CircuitOpenError,
+    CircuitState,
+    HostCircuitBreaker,
+    RetryBudget,
+)
+from app.infrastructure.scraper.async_http_client import AsyncHttpClient
+from app.infrastructure.scraper.http_client import RealisticSession
+from app.infrastructure.scraper.politeness import HostPoliteness
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_breaker_opens_after_threshold_and_fails_fast() -> None:
+    """Fallimenti consecutivi oltre soglia: circuito aperto, richieste rifiutate durante il cooldown."""
+    clock = FakeClock()
+    breaker = HostCircuitBreaker(failure_threshold=2, cooldown_seconds=10, clock=clock)
+    url = "https://dead.example.com/"
+    breaker.record_failure(url)
+    breaker.before_request(url)
+    breaker.record_failure(url)
+    assert breaker.state(url) is CircuitState.OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request(url)
+    breaker.before_request("https://alive.example.com/")
+    assert REGISTRY.get_sample_value("scraper_circuit_breaker_state", {"host": "dead.example.com"}) == 2
+
+
+def test_breaker_half_open_allows_single_probe() -> None:
+    """Dopo il cooldown: una sola richiesta di prova; successo -> closed, fallimento -> open."""
+    clock = FakeClock()
+    breaker = HostCircuitBreaker(failure_threshold=1, cooldown_seconds=10, clock=clock)
+    url = "https://flaky.example.com/"
+    breaker.record_failure(url)
+    clock.now = 11
+    breaker.before_request(url)
+    assert breaker.state(url) is CircuitState.HALF_OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request(url)
+    breaker.record_failure(url)
+    assert breaker.state(url) is CircuitState.OPEN
+    clock.now = 22
+    breaker.before_request(url)
+    breaker.record_success(url)
+    assert breaker.state(url) is CircuitState.CLOSED
+
+
+def test_retry_budget_limits_retries() -> None:
+    """Budget esaurito: try_acquire False finché richieste o tempo non ricaricano token."""
+    clock = FakeClock()
+    budget = RetryBudget(ratio=0.5, min_retries_per_second=0.0, max_tokens=1.0, clock=clock)
+    assert budget.try_acquire() is True
+    assert budget.try_acquire() is False
+    budget.record_request()
+    budget.record_request()
+    assert budget.try_acquire() is True
+
+
+def test_session_fails_fast_once_host_circuit_is_open(mocker) -> None:
+    """RealisticSession: 503 ripetuti aprono il circuito; la chiamata successiva non contatta l'host."""
+    mocker.patch("app.infrastructure.scraper.http_client.time.sleep")
+    breaker = HostCircuitBreaker(failure_threshold=3, cooldown_seconds=60)
+    session = RealisticSession(
+        politeness=HostPoliteness(min_gap=0.0, max_gap=0.0),
+        circuit_breaker=breaker,
+        retry_budget=RetryBudget(),
+    )
+    url = "https://down.example.com/"
+    with requests_mock.Mocker() as m:
+        m.get(url, status_code=503)
+        with pytest.raises(requests.exceptions.HTTPError):
+            session.fetch_with_retry(url)
+        calls = m.call_count
+        with pytest.raises(CircuitOpenError):
+            session.fetch_with_retry(url)
+        assert m.call_count == calls
+
+
+def test_session_stops_retrying_when_budget_is_exhausted(mocker) -> None:
+    """Budget a zero: nessun retry, errore propagato dopo il primo tentativo."""
+    mocker.patch("app.infrastructure.scraper.http_client.time.sleep")
+    session = RealisticSession(
+        politeness=HostPoliteness(min_gap=0.0, max_gap=0.0),
+        circuit_breaker=HostCircuitBreaker(),
+        retry_budget=RetryBudget(ratio=0.0, min_retries_per_second=0.0, max_tokens=0.0),
+    )
+    with requests_mock.Mocker() as m:
+        m.get("https://busy.example.com/", status_code=429)
+        with pytest.raises(requests.exceptions.HTTPError):
+            session.fetch_with_retry("https://busy.example.com/")
+        assert m.call_count == 1
+
+
+def _half_open_breaker(url: str) -> tuple[HostCircuitBreaker, FakeClock]:
+    clock = FakeClock()
+    breaker = HostCircuitBreaker(failure_threshold=1, cooldown_seconds=10, clock=clock)
+    breaker.record_failure(url)
+    clock.now = 11
+    return breaker, clock
+
+
+def test_release_probe_frees_slot_only_for_its_own_probe() -> None:
+    """release_probe libera lo slot della prova senza esito; un token già chiuso da record_* non tocca la prova successiva."""
+    url = "https://flaky.example.com/"
+    breaker, _ = _half_open_breaker(url)
+    probe = breaker.before_request(url)
+    assert probe is not None
+    breaker.release_probe(url, probe)
+    assert breaker.state(url) is CircuitState.HALF_OPEN
+    second = breaker.before_request(url)
+    breaker.release_probe(url, probe)
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request(url)
+    breaker.record_success(url)
+    breaker.release_probe(url, second)
+    assert breaker.before_request(url) is None
+
+
+def test_cancelled_async_probe_does_not_block_host() -> None:
+    """Prova half-open cancellata (timeout del chiamante): l'host accetta una nuova prova."""
+    url = "https://slow.example.com/"
+    breaker, _ = _half_open_breaker(url)
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(5)
+        return httpx.Response(200, text="late")
+
+    client = AsyncHttpClient(
+        transport=httpx.MockTransport(handler),
+        politeness=HostPoliteness(min_gap=0.0, max_gap=0.0),
+        circuit_breaker=breaker,
+    )
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(asyncio.wait_for(client.get(url), timeout=0.05))
+    assert breaker.before_request(url) is not None
+
+
+def test_unexpected_error_in_sync_probe_releases_slot(mocker) -> None:
+    """Eccezione non di rete durante la prova: propagata, ma lo slot half-open viene liberato."""
+    url = "https://odd.example.com/"
+    breaker, _ = _half_open_breaker(url)
+    session = RealisticSession(politeness=HostPoliteness(min_gap=0.0, max_gap=0.0), circuit_breaker=breaker)
+    mocker.patch.object(session, "get", side_effect=ValueError("bad header"))
+    with pytest.raises(ValueError):
+        session.fetch_with_retry(url)
+    assert breaker.before_request(url) is not None
+
+
+def test_closed_circuits_are_dropped_on_success_and_pruned_at_cap(monkeypatch) -> None:
+    """Un successo rimuove il circuito; oltre MAX_TRACKED_HOSTS restano solo i circuiti non chiusi."""
+    monkeypatch.setattr("app.infrastructure.scraper.circuit_breaker.MAX_TRACKED_HOSTS", 3)
+    breaker = HostCircuitBreaker(failure_threshold=2, clock=FakeClock())
+    breaker.record_failure("https://ok.example.com/")
+    breaker.record_success("https://ok.example.com/")
+    assert breaker._circuits == {}
+    for _ in range(2):
+        breaker.record_failure("https://down.example.com/")
+    for index in range(5):
+        breaker.record_failure(f"https://flaky{index}.example.com/")
+    assert len(breaker._circuits) <= 3
+    assert breaker.state("https://down.example.com/") is CircuitState.OPEN
+
+
+def test_state_gauge_skips_hosts_beyond_label_limit(mocker) -> None:
+    """Host oltre il limite label: nessun gauge "other" (valori di host diversi si sovrascriverebbero)."""
+    from app.core import metrics
+
+    mocker.patch.object(metrics, "scraper_host_labels", metrics.HostLabelLimiter(limit=1))
+    labels = mocker.spy(metrics.SCRAPER_CIRCUIT_BREAKER_STATE, "labels")
+    breaker = HostCircuitBreaker(failure_threshold=1, clock=FakeClock())
+    breaker.record_failure("https://first.example.com/")
+    breaker.record_failure("https://second.example.com/")
+    assert [call.kwargs["host"] for call in labels.call_args_list] == ["first.example.com"]
+    assert breaker.state("https://second.example.com/") is CircuitState.OPEN
@@ -0,0 +1,92 @@
+"""Test DnsCache (TTL, invalidazione) e pre-warm delle connessioni nel pool condiviso."""
+
+import socket
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from app.infrastructure.scraper.dns_cache import DnsCache
+from app.infrastructure.scraper.transport import TransportRegistry
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _fake_resolver(calls: list):
+    def resolve(host, port, family, type_):
+        calls.append(host)
+        return [(socket.AF_INET, socket.SOCK_STREAM, 6, "", ("127.0.0.1", port))]
+
+    return resolve
+
+
+def test_dns_cache_reuses_entry_until_ttl_expires() -> None:
+    """Stesso host entro il TTL: una sola risoluzione; dopo la scadenza si risolve di nuovo."""
+    calls: list = []
+    clock = FakeClock()
+    cache = DnsCache(ttl_seconds=30, clock=clock, resolver=_fake_resolver(calls))
+    cache.resolve("Example.com", 443)
+    cache.resolve("example.com", 443)
+    assert calls == ["Example.com"]
+    clock.now = 31
+    cache.resolve("example.com", 443)
+    assert len(calls) == 2
+
+
+def test_dns_cache_invalidate_forces_new_resolution() -> None:
+    """invalidate(): la voce viene scartata (es. dopo errore di connessione)."""
+    calls: list = []
+    cache = DnsCache(resolver=_fake_resolver(calls))
+    cache.resolve("example.com", 80)
+    cache.invalidate("example.com", 80)
+    cache.resolve("example.com", 80)
+    assert len(calls) == 2
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self) -> None:
+        body = b"ok"
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+class _CountingServer(ThreadingHTTPServer):
+    """Server locale che conta le connessioni TCP accettate."""
+
+    accepted = 0
+
+    def get_request(self):
+        request = super().get_request()
+        self.accepted += 1
+        return request
+
+
+def test_prewarm_opens_pooled_connections_reused_by_requests() -> None:
+    """prewarm(): host risolto via cache e connessione aperta; la GET successiva la riusa (nessuna nuova connessione)."""
+    server = _CountingServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        calls: list = []
+        registry = TransportRegistry(dns_cache=DnsCache(resolver=_fake_resolver(calls)))
+        url = f"http://localhost:{server.server_port}/"
+        assert registry.prewarm(url, connections=2) == 2
+        assert calls == ["localhost"]
+        session = registry.new_session()
+        assert session.get(url, timeout=5).text == "ok"
+        assert calls == ["localhost"]
+        assert server.accepted == 2
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,189 @@
+"""Test esecuzione concorrente degli spider in ScraperEngine: tempo ~ spider più lento, ordine stabile, errori isolati."""
+
+import time
+
+import pytest
+from prometheus_client import REGISTRY
+
+from app.infrastructure.scraper.async_http_client import AsyncHttpClient
+from app.infrastructure.scraper.base_spider import BaseSpider
+from app.infrastructure.scraper.engine import EXECUTOR_ASYNC, EXECUTOR_PROCESS, EXECUTOR_THREAD, ScraperEngine
+from app.infrastructure.scraper.http_client import HttpClient
+from app.infrastructure.scraper.parser_pool import ParserPool
+from app.infrastructure.scraper.spiders.meta_title_spider import MetaTitleSpider
+from app.infrastructure.scraper.spiders.title_spider import TitleSpider
+
+HTML = "<html><head><title>Offerta</title><meta name='description' content='Saldi'></head></html>"
+URL = "https://shop.example.com/"
+DELAY = 0.2
+
+
+class SlowSpider(BaseSpider):
+    """parse() lento (simula pagine pesanti); titolo distinto per spider per evitare il dedupe."""
+
+    def __init__(self, http_client, name: str, delay: float = DELAY) -> None:
+        super().__init__(http_client)
+        self.name = name
+        self.delay = delay
+
+    def parse(self, response: str) -> dict:
+        time.sleep(self.delay)
+        return {"source": self.name, "title": self.name, "url": ""}
+
+
+class FailingSpider(BaseSpider):
+    def parse(self, response: str) -> dict:
+        raise RuntimeError("broken selector")
+
+
+def _engine(mocker, executor: str, *spiders_args, run_timeout: float | None = None) -> ScraperEngine:
+    http_client = mocker.Mock(spec=HttpClient)
+    http_client.get.return_value = HTML
+    engine = ScraperEngine(http_client, executor=executor, run_timeout=run_timeout)
+    for name, delay in spiders_args:
+        engine.register_spider(SlowSpider(http_client, name, delay))
+    return engine
+
+
+@pytest.mark.parametrize("executor", [EXECUTOR_THREAD, EXECUTOR_ASYNC])
+def test_wall_clock_is_slowest_spider_and_order_is_stable(mocker, executor: str) -> None:
+    """Tre spider da DELAY: tempo ~DELAY (non 3x); risultati nell'ordine di registrazione anche se il primo è il più lento."""
+    engine = _engine(mocker, executor, ("a", DELAY * 1.5), ("b", DELAY), ("c", DELAY / 2))
+    started = time.perf_counter()
+    results = engine.run(URL)
+    elapsed = time.perf_counter() - started
+    engine.close()
+    assert [r["data"]["title"] for r in results] == ["a", "b", "c"]
+    assert elapsed < DELAY * 2.5
+    assert engine.last_run_fetches == 1
+
+
+@pytest.mark.parametrize("executor", [EXECUTOR_THREAD, EXECUTOR_ASYNC])
+def test_failing_spider_does_not_drop_other_results(mocker, executor: str) -> None:
+    """Eccezione in uno spider: escluso (last_run_errors, metrica), gli altri risultati restano."""
+    engine = _engine(mocker, executor, ("a", 0), ("b", 0))
+    engine.spiders.insert(1, FailingSpider(engine._http_client))
+    before = REGISTRY.get_sample_value(
+        "scraper_engine_spider_errors_total", {"spider": "FailingSpider", "reason": "error"}
+    ) or 0.0
+    results = engine.run(URL)
+    engine.close()
+    assert [r["data"]["title"] for r in results] == ["a", "b"]
+    assert engine.last_run_errors["FailingSpider"].startswith("error: RuntimeError")
+    assert REGISTRY.get_sample_value(
+        "scraper_engine_spider_errors_total", {"spider": "FailingSpider", "reason": "error"}
+    ) == before + 1
+
+
+@pytest.mark.parametrize("executor", [EXECUTOR_THREAD, EXECUTOR_ASYNC])
+def test_run_timeout_excludes_slow_spiders(mocker, executor: str) -> None:
+    """Spider oltre run_timeout esclusi come timeout; il run termina entro il timeout con gli altri risultati."""
+    engine = _engine(mocker, executor, ("fast", 0), ("slow", 1.0), run_timeout=DELAY)
+    started = time.perf_counter()
+    results = engine.run(URL)
+    elapsed = time.perf_counter() - started
+    engine.close()
+    assert [r["data"]["title"] for r in results] == ["fast"]
+    assert engine.last_run_errors["SlowSpider"].startswith("timeout")
+    assert elapsed < 0.8
+
+
+@pytest.mark.parametrize("executor", [EXECUTOR_THREAD, EXECUTOR_ASYNC])
+def test_timed_out_spider_does_not_starve_later_runs(mocker, executor: str) -> None:
+    """Il worker dello spider scaduto resta occupato: nei run successivi gli spider sani non vanno in timeout."""
+    engine = _engine(mocker, executor, ("hung", 1.0), ("b", DELAY * 0.75), ("c", DELAY * 0.75), run_timeout=DELAY * 1.25)
+    for run in range(3):
+        engine.pipeline.seen.clear()
+        results = engine.run(URL)
+        assert [r["data"]["title"] for r in results] == ["b", "c"], run
+        assert list(engine.last_run_errors) == ["SlowSpider"]
+        assert engine.last_run_errors["SlowSpider"].startswith("timeout")
+    engine.close()
+
+
+@pytest.mark.parametrize("executor", [EXECUTOR_THREAD, EXECUTOR_ASYNC])
+def test_timeout_counts_from_spider_start_not_submit(mocker, executor: str) -> None:
+    """max_workers=1: il secondo spider parte dopo il primo e ha comunque l'intero run_timeout."""
+    engine = _engine(mocker, executor, ("a", DELAY * 0.75), ("b", DELAY * 0.75), run_timeout=DELAY * 1.25)
+    engine.max_workers = 1
+    results = engine.run(URL)
+    engine.close()
+    assert [r["data"]["title"] for r in results] == ["a", "b"]
+    assert engine.last_run_errors == {}
+
+
+def test_queued_spider_behind_abandoned_workers_times_out(mocker) -> None:
+    """Unico worker trattenuto dallo spider scaduto: lo spider in coda è escluso e il run non resta bloccato."""
+    engine = _engine(mocker, EXECUTOR_THREAD, ("hung", 1.0), ("queued", 0), run_timeout=DELAY)
+    engine.max_workers = 1
+    started = time.perf_counter()
+    assert engine.run(URL) == []
+    elapsed = time.perf_counter() - started
+    engine.close()
+    assert elapsed < 0.8
+    assert engine.last_run_errors["SlowSpider"].startswith("timeout")
+
+
+def test_async_mode_uses_spider_arun_for_own_fetch(mocker) -> None:
+    """Async: spider con fetch propria e client async eseguiti con arun(); stessi risultati del serial."""
+
+    class OwnFetchSpider(TitleSpider):
+        shared_fetch = False
+
+    http_client = mocker.Mock(spec=HttpClient)
+    http_client.get.return_value = HTML
+    async_http_client = mocker.Mock(spec=AsyncHttpClient)
+    async_http_client.get.return_value = HTML
+    spy = mocker.spy(OwnFetchSpider, "arun")
+    serial, concurrent = ScraperEngine(http_client), ScraperEngine(http_client, executor=EXECUTOR_ASYNC)
+    for engine in (serial, concurrent):
+        engine.register_spider(MetaTitleSpider(http_client))
+        engine.register_spider(OwnFetchSpider(http_client, async_http_client))
+    strip = lambda results: [(r["source"], r["data"]["title"]) for r in results]  # noqa: E731
+    assert strip(concurrent.run(URL)) == strip(serial.run(URL))
+    assert spy.call_count == 1
+
+
+def test_async_own_fetch_without_async_client_does_not_block_shutdown(mocker) -> None:
+    """Fetch propria senza client async: eseguita nel pool dell'engine, asyncio.run non attende lo spider scaduto."""
+
+    class OwnFetchSpider(TitleSpider):
+        shared_fetch = False
+
+    http_client = mocker.Mock(spec=HttpClient)
+    http_client.get.side_effect = lambda url, head_only=False: time.sleep(2.0) or HTML
+    engine = ScraperEngine(http_client, executor=EXECUTOR_ASYNC, run_timeout=DELAY)
+    engine.register_spider(OwnFetchSpider(http_client))
+    started = time.perf_counter()
+    assert engine.run(URL) == []
+    elapsed = time.perf_counter() - started
+    engine.close()
+    assert elapsed < 0.8
+    assert engine.last_run_errors["OwnFetchSpider"].startswith("timeout")
+
+
+def test_process_executor_parses_in_worker(mocker) -> None:
+    """Process: parse() nei worker di ParserPool, risultati identici al serial."""
+    http_client = mocker.Mock(spec=HttpClient)
+    http_client.get.return_value = HTML
+    pool = ParserPool(max_workers=1, inline_threshold_bytes=0)
+    try:
+        serial = ScraperEngine(http_client)
+        concurrent = ScraperEngine(http_client, executor=EXECUTOR_PROCESS, parser_pool=pool)
+        for engine in (serial, concurrent):
+            engine.register_spider(TitleSpider(http_client))
+            engine.register_spider(MetaTitleSpider(http_client))
+        strip = lambda results: [(r["source"], r["data"]["title"]) for r in results]  # noqa: E731
+        assert strip(concurrent.run(URL)) == strip(serial.run(URL))
+        deadline = time.monotonic() + 5
+        while pool.queue_depth and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert sum(worker["tasks"] for worker in pool.stats().values()) == 2
+    finally:
+        concurrent.close()
+        pool.shutdown()
+
+
+def test_unknown_executor_rejected(mocker) -> None:
+    with pytest.raises(ValueError):
+        ScraperEngine(mocker.Mock(spec=HttpClient), executor="fibers")
@@ -0,0 +1,90 @@
+"""Test fan-out dell'engine: una fetch per run condivisa tra spider, opt-out con shared_fetch=False."""
+
+from prometheus_client import REGISTRY
+
+from app.infrastructure.scraper.engine import ScraperEngine
+from app.infrastructure.scraper.http_client import HttpClient
+from app.infrastructure.scraper.meta_spider import MetaSpider
+from app.infrastructure.scraper.spiders.meta_title_spider import MetaTitleSpider
+from app.infrastructure.scraper.spiders.open_graph_spider import OpenGraphSpider
+from app.infrastructure.scraper.spiders.title_spider import TitleSpider
+
+HTML = (
+    "<html><head><title>Offerta</title><meta name='description' content='Saldi'>"
+    "<meta property='og:title' content='OG Offerta'></head><body></body></html>"
+)
+URL = "https://shop.example.com/"
+
+
+class TokenSpider(TitleSpider):
+    """Spider che richiede una propria richiesta (es. POST con token nascosti)."""
+
+    shared_fetch = False
+
+
+class LegacySpider:
+    """Spider duck-typed con solo run(url): continua a fare la propria fetch."""
+
+    def __init__(self, http_client) -> None:
+        self.http_client = http_client
+
+    def run(self, url: str) -> dict:
+        self.http_client.get(url)
+        return {"source": "legacy", "url": url, "title": "legacy"}
+
+
+def _http_client(mocker):
+    http_client = mocker.Mock(spec=HttpClient)
+    http_client.get.return_value = HTML
+    return http_client
+
+
+def test_spiders_share_one_fetch(mocker) -> None:
+    """Tre spider sullo stesso url: un solo download (head_only se tutti lo sono), stesso corpo a ciascuno."""
+    http_client = _http_client(mocker)
+    engine = ScraperEngine(http_client)
+    for spider_class in (TitleSpider, MetaTitleSpider, OpenGraphSpider):
+        engine.register_spider(spider_class(http_client))
+    saved = REGISTRY.get_sample_value("scraper_engine_fetches_saved_total") or 0.0
+    results = engine.run(URL)
+    http_client.get.assert_called_once_with(URL, head_only=True)
+    assert engine.last_run_fetches == 1
+    assert [(r["source"], r["data"]["title"]) for r in results] == [
+        ("TitleSpider", "Offerta"),
+        ("MetaTitleSpider", "Offerta"),
+        ("OpenGraphSpider", "OG Offerta"),
+    ]
+    assert REGISTRY.get_sample_value("scraper_engine_fetches_saved_total") == saved + 2
+
+
+def test_full_body_when_any_spider_needs_it(mocker) -> None:
+    """Uno spider non head_only (MetaSpider) -> la fetch condivisa scarica la pagina intera."""
+    http_client = _http_client(mocker)
+    engine = ScraperEngine(http_client)
+    engine.register_spider(TitleSpider(http_client))
+    engine.register_spider(MetaSpider(http_client, multi_ad=True))
+    engine.run(URL)
+    http_client.get.assert_called_once_with(URL, head_only=False)
+
+
+def test_opted_out_spiders_fetch_on_their_own(mocker) -> None:
+    """shared_fetch=False e spider senza process(): run(url) con la propria richiesta, contate nel run."""
+    http_client = _http_client(mocker)
+    engine = ScraperEngine(http_client)
+    engine.register_spider(MetaTitleSpider(http_client))
+    engine.register_spider(TokenSpider(http_client))
+    engine.register_spider(LegacySpider(http_client))
+    results = engine.run(URL)
+    assert http_client.get.call_count == 3
+    assert engine.last_run_fetches == 3
+    assert [r["source"] for r in results] == ["MetaTitleSpider", "TokenSpider", "LegacySpider"]
+
+
+def test_no_shared_fetch_without_sharing_spiders(mocker) -> None:
+    """Solo spider in opt-out: nessuna fetch condivisa superflua."""
+    http_client = _http_client(mocker)
+    engine = ScraperEngine(http_client)
+    engine.register_spider(TokenSpider(http_client))
+    engine.run(URL)
+    assert http_client.get.call_count == 1
+    assert engine.last_run_fetches == 1
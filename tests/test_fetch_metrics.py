@@ -0,0 +1,77 @@
+"""Test metriche fetch dello scraper: latenza, TTFB, byte, status, retry, attese e limite label host."""
+
+import asyncio
+
+import httpx
+import requests_mock
+from prometheus_client import REGISTRY
+
+from app.core.metrics import OTHER_HOST_LABEL, HostLabelLimiter
+from app.infrastructure.scraper.async_http_client import AsyncHttpClient
+from app.infrastructure.scraper.circuit_breaker import RetryBudget
+from app.infrastructure.scraper.http_client import HttpClient
+from app.infrastructure.scraper.politeness import HostPoliteness
+
+
+def _sample(name: str, **labels) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+def test_host_label_limiter_caps_distinct_hosts() -> None:
+    """Oltre il limite i nuovi host diventano "other"; quelli già visti mantengono il nome."""
+    limiter = HostLabelLimiter(limit=2)
+    assert limiter.label("a.com") == "a.com"
+    assert limiter.label("b.com") == "b.com"
+    assert limiter.label("c.com") == OTHER_HOST_LABEL
+    assert limiter.label("a.com") == "a.com"
+    limiter.reset()
+    assert limiter.label("c.com") == "c.com"
+
+
+def test_sync_fetch_records_status_retry_backoff_and_bytes(mocker) -> None:
+    """503 poi 200: status per tentativo, un retry, tempo di backoff, byte letti e durata fetch."""
+    host = "metrics-sync.example.com"
+    url = f"https://{host}/page"
+    mocker.patch("app.infrastructure.scraper.http_client.time.sleep")
+    client = HttpClient()
+    client.session.politeness = HostPoliteness(min_gap=0, max_gap=0)
+    client.session.retry_budget = RetryBudget(min_retries_per_second=10)
+    before_fetch = _sample("scraper_fetch_seconds_count", host=host)
+    before_bytes = _sample("scraper_response_bytes_sum", host=host)
+    with requests_mock.Mocker() as m:
+        m.get(url, [{"status_code": 503, "text": "busy"}, {"status_code": 200, "text": "<html>ok</html>"}])
+        assert client.get(url) == "<html>ok</html>"
+    assert _sample("scraper_responses_total", host=host, status="503") == 1
+    assert _sample("scraper_responses_total", host=host, status="200") == 1
+    assert _sample("scraper_retries_total", host=host, reason="status") == 1
+    assert _sample("scraper_sleep_seconds_total", host=host, kind="backoff") > 0
+    assert _sample("scraper_ttfb_seconds_count", host=host) == 2
+    assert _sample("scraper_fetch_seconds_count", host=host) == before_fetch + 1
+    assert _sample("scraper_response_bytes_sum", host=host) == before_bytes + len("<html>ok</html>")
+
+
+def test_async_get_records_politeness_sleep_and_transport_errors(mocker) -> None:
+    """Errore di trasporto poi 200: status "error", retry transport, attesa politeness contabilizzata."""
+    host = "metrics-async.example.com"
+    url = f"https://{host}/"
+    calls = {"n": 0}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls["n"] += 1
+        if calls["n"] == 1:
+            raise httpx.ConnectError("boom", request=request)
+        return httpx.Response(200, text="<html></html>")
+
+    mocker.patch("app.infrastructure.scraper.async_http_client.asyncio.sleep", new=mocker.AsyncMock())
+    mocker.patch("app.infrastructure.scraper.politeness.asyncio.sleep", new=mocker.AsyncMock())
+    client = AsyncHttpClient(
+        transport=httpx.MockTransport(handler),
+        politeness=HostPoliteness(min_gap=0.5, max_gap=0.5),
+        retry_budget=RetryBudget(min_retries_per_second=10),
+    )
+    assert asyncio.run(client.get(url)) == "<html></html>"
+    assert _sample("scraper_responses_total", host=host, status="error") == 1
+    assert _sample("scraper_responses_total", host=host, status="200") == 1
+    assert _sample("scraper_retries_total", host=host, reason="transport") == 1
+    assert _sample("scraper_sleep_seconds_total", host=host, kind="politeness") > 0
+    assert _sample("scraper_response_bytes_sum", host=host) == len("<html></html>")
@@ -0,0 +1,98 @@
+"""Test FieldPlan: stessa semantica della ricerca ricorsiva per campo, una sola visita, limite di profondità."""
+
+import random
+from typing import Any
+
+import pytest
+
+from app.infrastructure.scraper.field_plan import FieldPlan
+from app.infrastructure.scraper.meta_spider import AD_FIELD_PLAN, _map_blocks_to_ad_intelligence
+
+
+def _reference_find(obj: Any, *keys: str) -> Any:
+    """Ricerca ricorsiva per singolo campo (implementazione storica di meta_spider._find_in_nested)."""
+    if isinstance(obj, dict):
+        for key in keys:
+            if key in obj:
+                return obj[key]
+        for value in obj.values():
+            found = _reference_find(value, *keys)
+            if found is not None:
+                return found
+    elif isinstance(obj, list):
+        for item in obj:
+            found = _reference_find(item, *keys)
+            if found is not None:
+                return found
+    return None
+
+
+KEYS = ("id", "ad_id", "text", "body", "image_url", "start_time", "other", "data", "node")
+
+
+def _random_blob(rng: random.Random, depth: int = 0) -> Any:
+    if depth > 4 or rng.random() < 0.2:
+        return rng.choice([None, 1, "x", 2.5, f"v{rng.randint(0, 99)}"])
+    if rng.random() < 0.3:
+        return [_random_blob(rng, depth + 1) for _ in range(rng.randint(0, 3))]
+    return {rng.choice(KEYS): _random_blob(rng, depth + 1) for _ in range(rng.randint(0, 4))}
+
+
+@pytest.mark.parametrize("seed", range(200))
+def test_plan_matches_per_field_recursive_search(seed: int) -> None:
+    """Su blob casuali (valori None, liste, chiavi ripetute a più livelli) ogni campo coincide con la ricerca storica."""
+    rng = random.Random(seed)
+    blob = _random_blob(rng)
+    found = AD_FIELD_PLAN.extract(blob)
+    for name, keys in AD_FIELD_PLAN.fields.items():
+        assert found.get(name) == _reference_find(blob, *keys)
+
+
+def test_key_priority_and_none_blocks_subtree() -> None:
+    """Chiave a priorità più alta vince nello stesso nodo; None ferma la ricerca in quel sotto-albero."""
+    plan = FieldPlan({"id": ("ad_id", "id"), "text": ("text",)})
+    blob = {"id": "low", "ad_id": "high", "children": [{"text": None, "inner": {"text": "hidden"}}, {"text": "t"}]}
+    assert plan.extract(blob) == {"id": "high", "text": "t"}
+
+
+def test_stops_when_all_fields_are_found() -> None:
+    """Trovati tutti i campi la visita termina: i nodi successivi non vengono letti."""
+
+    class Exploding(dict):
+        def values(self):
+            raise AssertionError("visited after all fields were found")
+
+    plan = FieldPlan({"id": ("id",), "text": ("text",)})
+    blob = [{"id": 1, "nested": {"text": "a"}}, Exploding(other=1)]
+    assert plan.extract(blob) == {"id": 1, "text": "a"}
+
+
+def test_max_depth_caps_recursion() -> None:
+    """Nodi oltre max_depth ignorati (nessun RecursionError su JSON molto profondi)."""
+    deep: Any = {"id": "deep"}
+    for _ in range(5000):
+        deep = {"child": deep}
+    assert FieldPlan({"id": ("id",)}).extract(deep) == {}
+    assert FieldPlan({"id": ("id",)}, max_depth=3).extract({"a": {"b": {"id": 1}}}) == {"id": 1}
+    assert FieldPlan({"id": ("id",)}, max_depth=1).extract({"a": {"b": {"id": 1}}}) == {}
+
+
+def test_requested_subset_and_unknown_field() -> None:
+    """Solo i campi richiesti vengono cercati; campo sconosciuto -> ValueError."""
+    plan = FieldPlan({"id": ("id",), "text": ("text",)})
+    assert plan.extract({"id": 1, "text": "a"}, ["text"]) == {"text": "a"}
+    with pytest.raises(ValueError):
+        plan.extract({}, ["missing"])
+
+
+def test_map_blocks_fills_fields_across_blobs() -> None:
+    """_map_blocks_to_ad_intelligence: campi mancanti nel primo blob presi dai successivi."""
+    blocks = [
+        {"entry": {"ad_id": 123, "caption": "  Ciao   mondo  "}},
+        {"media": [{"image_url": "https://cdn.example.com/a.jpg", "start_date": "2025-03-01"}], "id": "ignored"},
+    ]
+    ad = _map_blocks_to_ad_intelligence(blocks)
+    assert ad.ad_id == "123"
+    assert ad.copy_text == "Ciao mondo"
+    assert ad.creative_url == "https://cdn.example.com/a.jpg"
+    assert ad.start_date.isoformat() == "2025-03-01"
@@ -0,0 +1,112 @@
+"""Test head_extractor: parità con HtmlParser sulle pagine fixture, stop anticipato, hidden inputs."""
+
+from pathlib import Path
+
+import pytest
+
+from app.infrastructure.scraper.head_extractor import (
+    ALL_FIELDS,
+    FIELD_CANONICAL,
+    FIELD_HIDDEN_INPUTS,
+    FIELD_META,
+    FIELD_TITLE,
+    _HeadEventParser,
+    extract_head,
+)
+from app.infrastructure.scraper.html_parser import BACKENDS, HtmlParser
+from app.infrastructure.scraper.token_extractor import extract_hidden_inputs
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures" / "html"
+FIXTURE_PAGES = sorted(FIXTURES_DIR.glob("*.html"))
+
+
+def _first_content(parser: HtmlParser, attribute: str, value: str) -> str | None:
+    """Percorso soup: content del primo meta con attribute=value (case-insensitive sul valore)."""
+    for element in parser.find_by_tag("meta"):
+        if (element.get(attribute) or "").lower() == value:
+            return element.get("content")
+    return None
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+@pytest.mark.parametrize("page", FIXTURE_PAGES, ids=lambda p: p.stem)
+def test_head_fields_match_html_parser(page: Path, backend: str) -> None:
+    """Title, description, og:* e canonical coincidono con quelli letti dall'albero di HtmlParser."""
+    html = page.read_text(encoding="utf-8")
+    head = extract_head(html, fields=ALL_FIELDS)
+    parser = HtmlParser(html, backend=backend)
+    assert head.title == parser.get_title()
+    assert head.meta.get("description") == _first_content(parser, "name", "description")
+    for key in [k for k in head.meta if k.startswith("og:")]:
+        assert head.meta[key] == _first_content(parser, "property", key)
+    canonical = [el.get("href") for el in parser.find_by_tag("link") if "canonical" in (el.get("rel") or "")]
+    assert head.canonical == (canonical[0] if canonical else None)
+
+
+def test_landing_page_fields() -> None:
+    """Landing fixture: title con entità decodificate, meta name/property, canonical."""
+    head = extract_head((FIXTURES_DIR / "landing.html").read_text(encoding="utf-8"))
+    assert head.title == "Offerta Estate 2026 – Scarpe da corsa"
+    assert head.description == "Sconti fino al 50% sulle scarpe da corsa. Spedizione gratuita."
+    assert head.meta["og:image"] == "https://cdn.example.com/img/hero.jpg"
+    assert head.canonical == "https://shop.example.com/estate"
+
+
+def test_first_meta_wins_even_if_empty() -> None:
+    """Come lo spider storico: conta il primo meta description; content vuoto -> description None."""
+    head = extract_head((FIXTURES_DIR / "login_form.html").read_text(encoding="utf-8"))
+    assert head.meta["description"] == ""
+    assert head.description is None
+
+
+def test_hidden_inputs_single_pass() -> None:
+    """Hidden inputs: senza name/value ignorati, ultimo valore vince, type case-insensitive."""
+    html = (FIXTURES_DIR / "login_form.html").read_text(encoding="utf-8")
+    assert extract_hidden_inputs(html) == {
+        "lsd": "AVq1x_last",
+        "jazoest": "2931",
+        "__VIEWSTATE": "dDwtMTA4NzA+Ozs=",
+    }
+
+
+def test_head_fields_stop_at_end_of_head(mocker) -> None:
+    """Campi del head: il parsing si ferma a </head>, il body non genera eventi."""
+    spy = mocker.spy(_HeadEventParser, "handle_starttag")
+    body = "<div><p>x</p></div>" * 1000
+    html = f"<html><head><title>T</title></head><body>{body}<meta name='description' content='late'></body></html>"
+    head = extract_head(html)
+    assert head.title == "T"
+    assert head.meta == {}
+    assert spy.call_count <= 3
+
+
+def test_stops_as_soon_as_requested_fields_are_found(mocker) -> None:
+    """Con meta_names il parsing termina appena tutti i campi richiesti sono presenti, anche prima di </head>."""
+    spy = mocker.spy(_HeadEventParser, "handle_starttag")
+    html = "<head><title>T</title><meta name='description' content='d'>" + "<link rel='x'>" * 500 + "</head>"
+    head = extract_head(html, fields=(FIELD_TITLE, FIELD_META), meta_names=("description",))
+    assert (head.title, head.description) == ("T", "d")
+    assert spy.call_count == 3
+
+
+def test_hidden_inputs_scan_whole_document() -> None:
+    """FIELD_HIDDEN_INPUTS legge tutto il documento, head fields esclusi se non richiesti."""
+    html = "<head><title>T</title></head><body><form><input type='hidden' name='a' value='1'></form></body>"
+    head = extract_head(html, fields=(FIELD_HIDDEN_INPUTS,))
+    assert head.hidden_inputs == {"a": "1"}
+    assert head.title is None
+
+
+def test_unclosed_title_and_canonical_only() -> None:
+    """<title> non chiuso: testo fino a fine documento; canonical estraibile da solo."""
+    assert extract_head("<title> Aperto ").title == "Aperto"
+    html = "<link rel='Canonical' href='https://a.example.com/'><title>x</title>"
+    head = extract_head(html, fields=(FIELD_CANONICAL,))
+    assert head.canonical == "https://a.example.com/"
+    assert head.title is None
+
+
+def test_unknown_field_raises() -> None:
+    """Campo non supportato: ValueError."""
+    with pytest.raises(ValueError):
+        extract_head("<p></p>", fields=("scripts",))
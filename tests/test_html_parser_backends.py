@@ -0,0 +1,90 @@
+"""Test parità backend HtmlParser (html.parser, lxml via bs4, lxml.html nativo) sulle pagine in tests/fixtures/html."""
+
+from pathlib import Path
+
+import pytest
+
+from app.infrastructure.scraper.html_parser import BACKEND_HTML_PARSER, BACKEND_LXML, BACKENDS, HtmlParser
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures" / "html"
+FIXTURE_PAGES = sorted(FIXTURES_DIR.glob("*.html"))
+CLASS_NAMES = ("ad-card", "ad-copy", "ad-cta", "feature", "box", "price", "card-text", "cta", "btn", "missing")
+
+
+def _snapshot(html: str, backend: str) -> dict:
+    """Risultati dell'API pubblica di HtmlParser, ridotti a valori confrontabili tra backend."""
+    parser = HtmlParser(html, backend=backend)
+    text = parser.extract_text
+    return {
+        "title": parser.get_title(),
+        "description": [el.get("content") for el in parser.find_all_by_attribute("meta", "name", "description")],
+        "meta": [el.get("content") for el in parser.find_by_tag("meta")],
+        "links": [(el.get("href"), text(el)) for el in parser.find_all_by_tag("a")],
+        "items": [text(el) for el in parser.find_by_tag("li")],
+        "classes": {name: [text(el) for el in parser.find_by_class(name)] for name in CLASS_NAMES},
+        "div_box": [text(el) for el in parser.find_by_class("box", tag="div")],
+        "ad_ids": [el.get("data-ad-id") for el in parser.find_all_by_attribute("div", "data-ad-id", "1002")],
+        "by_class_attr": [text(el) for el in parser.find_all_by_attribute("div", "class", "ad-card")],
+        "canonical": [el.get("href") for el in parser.find_all_by_attribute("link", "rel", "canonical")],
+        "rel_tokens": [el.get("href") for el in parser.find_all_by_attribute("a", "rel", "nofollow noopener")],
+        "divs": [text(el) for el in parser.find_by_tag("div")],
+    }
+
+
+@pytest.mark.parametrize("backend", [b for b in BACKENDS if b != BACKEND_HTML_PARSER])
+@pytest.mark.parametrize("page", FIXTURE_PAGES, ids=lambda p: p.stem)
+def test_backend_matches_html_parser(page: Path, backend: str) -> None:
+    """Ogni backend restituisce gli stessi risultati di html.parser sulle pagine fixture."""
+    html = page.read_text(encoding="utf-8")
+    assert _snapshot(html, backend) == _snapshot(html, BACKEND_HTML_PARSER)
+
+
+PARITY_EDGE_CASES = """<html><head><title>Edge</title>
+<link rel="canonical alternate" href="https://shop.example.com/c"><style>p { color: red }</style></head>
+<body><div>Hi<script>var a=1</script><!-- nota --><template>T</template><noscript>N</noscript>there
+<a rel="nofollow  noopener" href="/spazi">x</a><a rel="nofollow noopener" href="/uno">y</a></div></body></html>"""
+
+
+@pytest.mark.parametrize("backend", [b for b in BACKENDS if b != BACKEND_HTML_PARSER])
+def test_backend_matches_html_parser_on_edge_cases(backend: str) -> None:
+    """Testo senza script/style/template; rel multi-valore confrontato per token come in bs4."""
+    snapshot = _snapshot(PARITY_EDGE_CASES, backend)
+    assert snapshot == _snapshot(PARITY_EDGE_CASES, BACKEND_HTML_PARSER)
+    assert snapshot["divs"] == ["HiNtherexy"]
+    assert snapshot["canonical"] == ["https://shop.example.com/c"]
+    assert snapshot["rel_tokens"] == ["/spazi", "/uno"]
+
+
+def test_html_parser_default_backend_unchanged() -> None:
+    """Senza backend esplicito HtmlParser resta su html.parser (elementi bs4 Tag)."""
+    assert HtmlParser("<p>x</p>").backend == BACKEND_HTML_PARSER
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_empty_document(backend: str) -> None:
+    """Documento vuoto: nessun elemento e nessun titolo, senza eccezioni."""
+    parser = HtmlParser("", backend=backend)
+    assert parser.get_title() is None
+    assert parser.find_by_tag("a") == []
+    assert parser.find_by_class("x") == []
+
+
+def test_native_backend_accepts_encoding_declaration() -> None:
+    """lxml.html rifiuta stringhe con dichiarazione di encoding: il parser le gestisce comunque."""
+    html = '<?xml version="1.0" encoding="utf-8"?><html><head><title>Caffè</title></head></html>'
+    assert HtmlParser(html, backend=BACKEND_LXML).get_title() == "Caffè"
+
+
+@pytest.mark.filterwarnings("ignore::bs4.XMLParsedAsHTMLWarning")
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_declaration_only_document(backend: str) -> None:
+    """Solo dichiarazione XML (nessun contenuto): come un documento vuoto su tutti i backend."""
+    parser = HtmlParser('<?xml version="1.0" encoding="utf-8"?>', backend=backend)
+    assert parser.get_title() is None
+    assert parser.find_by_tag("a") == []
+
+
+def test_unknown_backend_raises() -> None:
+    """Backend non supportato: ValueError."""
+    with pytest.raises(ValueError):
+        HtmlParser("<p></p>", backend="html5lib")
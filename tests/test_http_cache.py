@@ -0,0 +1,108 @@
+"""Test cache HTTP condizionale (ETag / Last-Modified) senza rete reale (requests-mock)."""
+
+import os
+import time
+
+import requests_mock
+from prometheus_client import REGISTRY
+
+from app.infrastructure.scraper.http_cache import CachedResponse, DiskHttpCache, cache_key
+from app.infrastructure.scraper.http_client import HttpClient
+from app.infrastructure.scraper.politeness import HostPoliteness
+from app.services.scraper_service import ScraperService
+
+HTML = "<html><head><title>Cached</title></head></html>"
+
+
+def _client(cache) -> HttpClient:
+    client = HttpClient(cache=cache)
+    client.session.politeness = HostPoliteness(min_gap=0.0, max_gap=0.0)
+    return client
+
+
+def _cache_count(result: str) -> float:
+    return REGISTRY.get_sample_value("scraper_http_cache_total", {"result": result}) or 0.0
+
+
+def test_disk_cache_roundtrip(tmp_path) -> None:
+    """DiskHttpCache: set/get della stessa voce; chiave assente -> None."""
+    cache = DiskHttpCache(str(tmp_path))
+    cache.set("https://example.com/", CachedResponse(body=HTML, etag='"v1"'))
+    entry = cache.get("https://example.com/")
+    assert entry is not None and entry.body == HTML and entry.etag == '"v1"'
+    assert cache.get("https://example.com/other") is None
+
+
+def test_disk_cache_expires_entries_after_ttl(tmp_path) -> None:
+    """Voce più vecchia di ttl_seconds: get -> None e file rimosso."""
+    cache = DiskHttpCache(str(tmp_path), ttl_seconds=60)
+    cache.set("https://example.com/old", CachedResponse(body=HTML, etag='"v1"'))
+    cache.set("https://example.com/new", CachedResponse(body=HTML, etag='"v2"'))
+    old = cache._path("https://example.com/old")
+    os.utime(old, (time.time() - 120, time.time() - 120))
+    assert cache.get("https://example.com/old") is None
+    assert not os.path.exists(old)
+    assert cache.get("https://example.com/new").etag == '"v2"'
+
+
+def test_disk_cache_evicts_oldest_beyond_max_entries(tmp_path) -> None:
+    """Oltre max_entries restano le voci più recenti, al massimo max_entries file su disco."""
+    cache = DiskHttpCache(str(tmp_path), max_entries=10)
+    for index in range(25):
+        key = f"https://example.com/{index}"
+        cache.set(key, CachedResponse(body=HTML))
+        mtime = time.time() - 1000 + index
+        os.utime(cache._path(key), (mtime, mtime))
+    files = [name for name in os.listdir(tmp_path) if name.endswith(".json")]
+    assert len(files) <= 10
+    assert cache.get("https://example.com/24") is not None
+    assert cache.get("https://example.com/0") is None
+    assert DiskHttpCache(str(tmp_path), max_entries=10)._entries == len(files)
+
+
+def test_second_fetch_is_conditional_and_304_served_from_cache(tmp_path) -> None:
+    """Prima GET salva validator; la seconda invia If-None-Match e su 304 restituisce il corpo in cache."""
+    client = _client(DiskHttpCache(str(tmp_path)))
+    url = "https://cache.example.com/page"
+    hits_before = _cache_count("hit")
+    with requests_mock.Mocker() as m:
+        m.get(url, [
+            {"status_code": 200, "text": HTML, "headers": {"ETag": '"v1"', "Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT"}},
+            {"status_code": 304, "text": ""},
+        ])
+        first = client.fetch(url)
+        second = client.fetch(url)
+        conditional = m.request_history[1].headers
+    assert first.not_modified is False and first.text == HTML
+    assert second.not_modified is True and second.text == HTML
+    assert conditional["If-None-Match"] == '"v1"'
+    assert conditional["If-Modified-Since"] == "Mon, 01 Jan 2024 00:00:00 GMT"
+    assert _cache_count("hit") == hits_before + 1
+
+
+def test_truncated_body_is_flagged_and_not_cached(tmp_path) -> None:
+    """Corpo oltre max_body_bytes: FetchResult.truncated e nessuna voce in cache (niente 304 sulla pagina tagliata)."""
+    cache = DiskHttpCache(str(tmp_path))
+    client = HttpClient(cache=cache, max_body_bytes=16)
+    client.session.politeness = HostPoliteness(min_gap=0.0, max_gap=0.0)
+    url = "https://cache.example.com/big"
+    with requests_mock.Mocker() as m:
+        m.get(url, text=HTML, headers={"ETag": '"v1"'})
+        result = client.fetch(url)
+        assert result.truncated and len(result.text) == 16
+        assert cache.get(cache_key(url, False)) is None
+        client.fetch(url)
+        assert "If-None-Match" not in m.request_history[1].headers
+
+
+def test_scrape_title_skips_parse_and_upsert_when_unchanged(tmp_path, mocker) -> None:
+    """skip_unchanged=True: su 304 nessun parse né save_ad, risultato None."""
+    client = _client(DiskHttpCache(str(tmp_path)))
+    url = "https://cache.example.com/scheduled"
+    client.cache.set(cache_key(url, head_only=True), CachedResponse(body=HTML, etag='"v1"'))
+    save_ad = mocker.patch("app.services.scraper_service.AdRepository.save_ad")
+    service = ScraperService(client)
+    with requests_mock.Mocker() as m:
+        m.get(url, status_code=304)
+        assert service.scrape_title(url, skip_unchanged=True) is None
+    save_ad.assert_not_called()
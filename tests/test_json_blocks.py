@@ -0,0 +1,71 @@
+"""Test scanner lineare dei blocchi JSON incorporati (json_blocks) e ordine dei blocchi in MetaSpider."""
+
+import json
+
+from app.infrastructure.scraper.json_blocks import (
+    KIND_LD_JSON,
+    KIND_NEXT_DATA,
+    KIND_SJS,
+    extract_json_blocks,
+)
+from app.infrastructure.scraper.meta_spider import _extract_json_blocks
+
+
+def test_shared_data_with_nested_braces_and_semicolons_in_strings() -> None:
+    """window._sharedData con "};" dentro le stringhe: decodificato per intero (la vecchia regex lo troncava)."""
+    state = {"entry": {"ads": [{"id": "1", "copy": "Promo {x};"}, {"id": "2", "copy": "};"}]}}
+    html = f"<script>window._sharedData = {json.dumps(state)};var x = 1;</script>"
+    blocks = extract_json_blocks(html)
+    assert [(block.kind, block.data) for block in blocks] == [("_sharedData", state)]
+    assert html[blocks[0].offset] == "{"
+
+
+def test_script_json_kinds() -> None:
+    """ld+json (attributi in qualsiasi forma), __NEXT_DATA__ e script data-sjs; altri script ignorati."""
+    html = (
+        "<SCRIPT Type='application/ld+json'>\n  {\"@type\": \"Ad\", \"id\": \"a\"}\n</SCRIPT>"
+        '<script id="__NEXT_DATA__" type="application/json">{"props": {"page": 1}}</script>'
+        '<script type="application/json" data-content-len="12" data-sjs>{"require": []}</script>'
+        '<script type="application/json">{"config": true}</script>'
+        "<script>var notJson = {a: 1};</script>"
+    )
+    kinds = [block.kind for block in extract_json_blocks(html)]
+    assert kinds == [KIND_LD_JSON, KIND_NEXT_DATA, KIND_SJS]
+
+
+def test_other_embedded_state_markers_and_kind_filter() -> None:
+    """Altri stati noti (window.__INITIAL_STATE__, ...) e filtro kinds."""
+    html = (
+        '<script>window.__INITIAL_STATE__={"a": 1};window.__APOLLO_STATE__ = {"b": [2]}</script>'
+        '<script type="application/ld+json">{"c": 3}</script>'
+    )
+    assert [block.data for block in extract_json_blocks(html)] == [{"a": 1}, {"b": [2]}, {"c": 3}]
+    only_ld = extract_json_blocks(html, kinds=frozenset({KIND_LD_JSON}))
+    assert [block.data for block in only_ld] == [{"c": 3}]
+
+
+def test_invalid_json_is_skipped_and_scan_continues() -> None:
+    """Blocco non JSON (es. funzione JS) saltato senza interrompere la scansione."""
+    html = (
+        "<script>window.__NUXT__=(function(a){return {a:a}}(1));</script>"
+        '<script type="application/ld+json">{broken</script>'
+        '<script type="application/ld+json">{"ok": true}</script>'
+    )
+    assert [block.data for block in extract_json_blocks(html)] == [{"ok": True}]
+
+
+def test_markers_inside_decoded_blocks_are_not_rescanned() -> None:
+    """Il testo di un blocco già decodificato non viene riletto: marker dentro stringhe JSON ignorati."""
+    inner = 'window._sharedData = {"fake": 1}; <script type="application/ld+json">{"fake": 2}</script>'
+    html = f"<script>window._sharedData = {json.dumps({'html': inner})};</script>"
+    assert [block.data for block in extract_json_blocks(html)] == [{"html": inner}]
+
+
+def test_meta_spider_orders_shared_data_before_ld_json() -> None:
+    """MetaSpider: _sharedData prima di ld+json, poi gli altri stati, a prescindere dall'ordine nel documento."""
+    html = (
+        '<script type="application/json" data-sjs>{"k": "sjs"}</script>'
+        '<script type="application/ld+json">{"k": "ld"}</script>'
+        '<script>window._sharedData = {"k": "shared"};</script>'
+    )
+    assert [block["k"] for block in _extract_json_blocks(html)] == ["shared", "ld", "sjs"]
@@ -132,7 +132,7 @@ def test_http_client_429_retry_then_raises_after_exhaustion(mocker) -> None:
 
     # Patch time.sleep per evitare attese reali (backoff simulato ma istantaneo in test)
     mocker.patch("app.infrastructure.scraper.http_client.time.sleep")
-    mocker.patch("app.infrastructure.scraper.http_client._human_delay")
+    mocker.patch("app.infrastructure.scraper.http_client.default_politeness.reserve", return_value=0.0)
 
     url = "https://example.com/rate-limited"
     client = HttpClient()
@@ -160,7 +160,7 @@ def test_http_client_429_does_not_crash_and_raises_after_retries(mocker) -> None
     import requests_mock
 
     mocker.patch("app.infrastructure.scraper.http_client.time.sleep")
-    mocker.patch("app.infrastructure.scraper.http_client._human_delay")
+    mocker.patch("app.infrastructure.scraper.http_client.default_politeness.reserve", return_value=0.0)
 
     url = "https://test.example.com/429"
     client = HttpClient()
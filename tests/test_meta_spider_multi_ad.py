@@ -0,0 +1,102 @@
+"""Test modalità multi-ad di MetaSpider: tutte le inserzioni della pagina, mapping lazy, batch verso l'engine."""
+
+import json
+from datetime import date, timedelta
+
+import pytest
+
+from app.infrastructure.scraper import meta_spider
+from app.infrastructure.scraper.async_http_client import AsyncHttpClient
+from app.infrastructure.scraper.engine import ScraperEngine
+from app.infrastructure.scraper.http_client import HttpClient
+from app.infrastructure.scraper.meta_spider import AD_BATCH_SIZE, MetaSpider, iter_ads
+
+
+def _ad(ad_id: int, **extra) -> dict:
+    return {
+        "ad_archive_id": str(ad_id),
+        "page_name": "Brand",
+        "snapshot": {
+            "body": {"text": f"  Offerta   {ad_id} }};  "},
+            "images": [{"original_image_url": f"https://cdn.example.com/{ad_id}.jpg"}],
+        },
+        "start_date": 1_700_000_000,
+        **extra,
+    }
+
+
+def _ad_library_page(ads: list[dict], shared: list[dict] | None = None) -> str:
+    payload = {"require": [["ScheduledServerJS", "handle", None, [{"__bbox": {"result": {"data": ads}}}]]]}
+    html = f'<html><body><script type="application/json" data-sjs>{json.dumps(payload)}</script>'
+    if shared is not None:
+        html += f"<script>window._sharedData = {json.dumps({'ads': shared})};</script>"
+    return html + "</body></html>"
+
+
+def test_iter_ads_yields_every_ad_once() -> None:
+    """Ogni oggetto con forma di inserzione diventa un AdIntelligence; duplicati tra blocchi scartati."""
+    html = _ad_library_page([_ad(1), _ad(2), _ad(3)], shared=[_ad(2), _ad(4)])
+    ads = list(iter_ads(html))
+    assert [ad.ad_id for ad in ads] == ["1", "2", "3", "4"]
+    assert ads[0].copy_text == "Offerta 1 };"
+    assert ads[0].creative_url == "https://cdn.example.com/1.jpg"
+    assert ads[0].start_date == date(2023, 11, 14)
+
+
+def test_invalid_ads_are_skipped() -> None:
+    """Record non validi (start_date futura) saltati senza interrompere lo stream."""
+    future = (date.today() + timedelta(days=30)).isoformat()
+    ads = list(iter_ads(_ad_library_page([_ad(1), _ad(2, start_date=future), _ad(3)])))
+    assert [ad.ad_id for ad in ads] == ["1", "3"]
+
+
+def test_mapping_is_lazy(mocker) -> None:
+    """Il mapping avviene solo per gli annunci effettivamente consumati."""
+    spy = mocker.spy(meta_spider, "_record_to_ad_intelligence")
+    stream = iter_ads(_ad_library_page([_ad(i) for i in range(100)]))
+    assert next(stream).ad_id == "0"
+    assert spy.call_count == 1
+
+
+def test_single_ad_page_falls_back_to_single_mode() -> None:
+    """Pagina senza oggetti con forma di inserzione: un solo annuncio dalla modalità singola (se ha un id)."""
+    html = '<script type="application/ld+json">{"@type": "Ad", "id": "ad-456", "start_date": "2024-01-01"}</script>'
+    assert [ad.ad_id for ad in iter_ads(html)] == ["ad-456"]
+    assert list(iter_ads("<html></html>")) == []
+
+
+def test_parse_batches_and_multi_ad_parse(mocker) -> None:
+    """parse_batches: batch da batch_size; parse in modalità multi_ad restituisce tutti gli annunci."""
+    html = _ad_library_page([_ad(i) for i in range(7)])
+    spider = MetaSpider(mocker.Mock(spec=HttpClient), multi_ad=True, batch_size=3)
+    batches = list(spider.parse_batches(html, "https://www.facebook.com/ads/library/"))
+    assert [len(batch) for batch in batches] == [3, 3, 1]
+    assert batches[0][0]["ad_intelligence"]["ad_id"] == "0"
+    assert batches[0][0]["url"] == "https://www.facebook.com/ads/library/"
+    result = spider.parse(html)
+    assert result["ads_found"] == 7
+
+
+@pytest.mark.parametrize("batch_size", [1, 4, 50])
+def test_engine_one_fetch_many_ads(mocker, batch_size: int) -> None:
+    """ScraperEngine con MetaSpider multi_ad: una sola fetch produce un risultato per inserzione."""
+    http_client = mocker.Mock(spec=HttpClient)
+    http_client.get.return_value = _ad_library_page([_ad(i) for i in range(10)])
+    engine = ScraperEngine(http_client)
+    engine.register_spider(MetaSpider(http_client, multi_ad=True, batch_size=batch_size))
+    results = engine.run("https://www.facebook.com/ads/library/?q=shoes")
+    assert http_client.get.call_count == 1
+    assert len(results) == 10
+    assert [r["data"]["ad_intelligence"]["ad_id"] for r in results] == [str(i) for i in range(10)]
+    assert all(r["source"] == "MetaSpider" for r in results)
+    assert engine.run("https://www.facebook.com/ads/library/?q=shoes") == []
+
+
+def test_constructor_keeps_base_spider_positional_order(mocker) -> None:
+    """Costruzione come il registry (http_client, async_http_client, ...): niente multi_ad implicito."""
+    http_client, async_http_client = mocker.Mock(spec=HttpClient), mocker.Mock(spec=AsyncHttpClient)
+    spider = MetaSpider(http_client, async_http_client, parse_cache=None, parser_pool=None)
+    assert spider.async_http_client is async_http_client
+    assert spider.multi_ad is False and spider.batch_size == AD_BATCH_SIZE
+    with pytest.raises(TypeError):
+        MetaSpider(http_client, None, None, None, True)
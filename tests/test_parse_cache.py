@@ -0,0 +1,109 @@
+"""Test parse cache: corpo invariato -> parse() saltato, chiave per spider/versione/hash, tier LRU e Redis."""
+
+from datetime import date
+
+from prometheus_client import REGISTRY
+
+from app.cache.redis_client import RedisCacheClient
+from app.core.config import Settings
+from app.infrastructure.scraper.http_client import HttpClient
+from app.infrastructure.scraper.meta_spider import MetaSpider
+from app.infrastructure.scraper.models import ScrapeResult
+from app.infrastructure.scraper.parse_cache import ParseCache, body_digest, build_parse_cache, parse_cache_key
+from app.infrastructure.scraper.spiders.meta_title_spider import MetaTitleSpider
+from app.infrastructure.scraper.spiders.title_spider import TitleSpider
+
+HTML = "<html><head><title>Prodotto</title><meta name='description' content='Descrizione'></head></html>"
+
+
+def _sample(name: str, labels: dict | None = None) -> float:
+    return REGISTRY.get_sample_value(name, labels or {}) or 0.0
+
+
+def _fake_redis(mocker) -> RedisCacheClient:
+    store: dict[str, str] = {}
+    client = mocker.Mock(spec=RedisCacheClient)
+    client.get.side_effect = store.get
+    client.set.side_effect = lambda key, value, ttl_seconds=0: store.__setitem__(key, value)
+    return client
+
+
+def test_unchanged_body_skips_parse(mocker) -> None:
+    """Stesso corpo: parse() eseguito una volta; finalize applica comunque l'url di ogni chiamata."""
+    spider = MetaTitleSpider(mocker.Mock(spec=HttpClient), parse_cache=ParseCache())
+    parse = mocker.spy(spider, "parse")
+    first = spider.process(HTML, "https://a.example.com/")
+    second = spider.process(HTML, "https://b.example.com/")
+    assert parse.call_count == 1
+    assert first["url"] == "https://a.example.com/"
+    assert second["url"] == "https://b.example.com/"
+    assert second["title"] == "Prodotto"
+    spider.process(HTML.replace("Prodotto", "Altro"), "https://a.example.com/")
+    assert parse.call_count == 2
+
+
+def test_cached_result_is_isolated_from_callers(mocker) -> None:
+    """Modifiche al risultato restituito non alterano la voce in cache."""
+    spider = MetaTitleSpider(mocker.Mock(spec=HttpClient), parse_cache=ParseCache())
+    spider.process(HTML, "https://a.example.com/")["title"] = "mutato"
+    assert spider.process(HTML, "https://a.example.com/")["title"] == "Prodotto"
+
+
+def test_key_depends_on_spider_class_and_version(mocker) -> None:
+    """Spider diversi, versione incrementata o modalità multi_ad -> chiavi distinte per lo stesso corpo."""
+    http_client = mocker.Mock(spec=HttpClient)
+    digest, size = body_digest(HTML)
+    assert size == len(HTML.encode())
+    title, meta = TitleSpider(http_client), MetaTitleSpider(http_client)
+    assert parse_cache_key(title, digest) != parse_cache_key(meta, digest)
+    bumped = TitleSpider(http_client)
+    bumped.version = "2"
+    assert parse_cache_key(title, digest) != parse_cache_key(bumped, digest)
+    single, multi = MetaSpider(http_client), MetaSpider(http_client, multi_ad=True)
+    assert parse_cache_key(single, digest) != parse_cache_key(multi, digest)
+
+
+def test_lru_evicts_least_recently_used() -> None:
+    """Oltre max_entries esce la voce usata meno di recente; max_entries=0 disattiva il tier in memoria."""
+    cache = ParseCache(max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == (True, 1)
+    cache.set("c", 3)
+    assert cache.get("b") == (False, None)
+    assert cache.get("a") == (True, 1)
+    disabled = ParseCache(max_entries=0)
+    disabled.set("a", 1)
+    assert disabled.get("a") == (False, None)
+
+
+def test_redis_tier_shares_results_across_instances(mocker) -> None:
+    """Tier Redis: un'altra istanza (replica) trova il risultato; ScrapeResult e date sopravvivono al JSON."""
+    redis_client = _fake_redis(mocker)
+    value = {"result": ScrapeResult(source="title", url=None, data={"title": "t"}), "start": date(2024, 1, 2)}
+    ParseCache(redis_client=redis_client).set("k", value)
+    replica = ParseCache(redis_client=redis_client)
+    assert replica.get("k") == (True, value)
+    redis_client.get.reset_mock()
+    assert replica.get("k") == (True, value)
+    redis_client.get.assert_not_called()
+
+
+def test_metrics_hits_misses_and_bytes_saved(mocker) -> None:
+    """Miss e hit conteggiati per tier; i byte del corpo non riparsato sommati in bytes_saved."""
+    spider = TitleSpider(mocker.Mock(spec=HttpClient), parse_cache=ParseCache())
+    misses = _sample("scraper_parse_cache_total", {"result": "miss", "tier": "none"})
+    hits = _sample("scraper_parse_cache_total", {"result": "hit", "tier": "memory"})
+    saved = _sample("scraper_parse_cache_bytes_saved_total")
+    spider.process(HTML, "https://a.example.com/")
+    spider.process(HTML, "https://a.example.com/")
+    assert _sample("scraper_parse_cache_total", {"result": "miss", "tier": "none"}) == misses + 1
+    assert _sample("scraper_parse_cache_total", {"result": "hit", "tier": "memory"}) == hits + 1
+    assert _sample("scraper_parse_cache_bytes_saved_total") == saved + len(HTML.encode())
+
+
+def test_build_parse_cache_from_settings() -> None:
+    """Factory: none -> None, memory -> solo LRU con max_entries da config."""
+    assert build_parse_cache(Settings(scraper_parse_cache_backend="none")) is None
+    cache = build_parse_cache(Settings(scraper_parse_cache_backend="memory", scraper_parse_cache_max_entries=7))
+    assert cache is not None and cache.max_entries == 7
@@ -0,0 +1,75 @@
+"""Test ParserPool: pagine piccole inline, pagine grandi in un worker, risultati identici, metriche per worker."""
+
+import json
+import os
+import pickle
+import time
+from collections.abc import Generator
+
+import pytest
+
+from app.core.config import Settings
+from app.infrastructure.scraper.http_client import HttpClient
+from app.infrastructure.scraper.meta_spider import MetaSpider
+from app.infrastructure.scraper.parser_pool import ParserPool, build_parser_pool
+from app.infrastructure.scraper.spiders.meta_title_spider import MetaTitleSpider
+
+HTML = "<html><head><title>Pagina</title><meta name='description' content='Descrizione'></head></html>"
+
+
+@pytest.fixture(scope="module")
+def pool() -> Generator[ParserPool, None, None]:
+    """Un worker riscaldato condiviso dal modulo (avvio spawn pagato una volta)."""
+    parser_pool = ParserPool(max_workers=1, inline_threshold_bytes=1024)
+    parser_pool.warm()
+    yield parser_pool
+    parser_pool.shutdown()
+
+
+def _ad_page(count: int) -> str:
+    ads = [{"ad_archive_id": str(i), "snapshot": {"body": {"text": f"Offerta {i}"}}} for i in range(count)]
+    return f"<html><body><script>window._sharedData = {json.dumps({'ads': ads})};</script></body></html>"
+
+
+def test_small_pages_stay_inline(mocker) -> None:
+    """Sotto soglia nessun worker viene avviato."""
+    parser_pool = ParserPool(max_workers=1, inline_threshold_bytes=1024)
+    spider = MetaTitleSpider(mocker.Mock(spec=HttpClient), parser_pool=parser_pool)
+    assert spider.process(HTML, "https://example.com/")["title"] == "Pagina"
+    assert parser_pool._executor is None
+
+
+def test_spider_pickles_without_clients(mocker) -> None:
+    """Lo stato inviato ai worker esclude client HTTP, cache e pool; la configurazione dello spider resta."""
+    spider = MetaSpider(mocker.Mock(spec=HttpClient), multi_ad=True, batch_size=7, parser_pool=ParserPool())
+    clone = pickle.loads(pickle.dumps(spider))
+    assert clone.http_client is None and clone.parser_pool is None
+    assert (clone.multi_ad, clone.batch_size, clone.version) == (True, 7, spider.version)
+
+
+def test_large_pages_parsed_in_worker(pool: ParserPool) -> None:
+    """Sopra soglia parse() gira in un altro processo con lo stesso risultato; stats per pid del worker."""
+    spider = MetaSpider(None, multi_ad=True, parser_pool=pool)
+    html = _ad_page(200)
+    assert len(html) > pool.inline_threshold_bytes
+    inline = MetaSpider(None, multi_ad=True).process(html, "https://example.com/")
+    assert spider.process(html, "https://example.com/") == inline
+    assert inline["ads_found"] == 200
+    # I done-callback del Future possono completare subito dopo il risveglio del chiamante
+    deadline = time.monotonic() + 5
+    while pool.queue_depth and time.monotonic() < deadline:
+        time.sleep(0.01)
+    stats = pool.stats()
+    assert stats and os.getpid() not in stats
+    assert sum(worker["tasks"] for worker in stats.values()) >= 1
+    assert pool.queue_depth == 0
+
+
+def test_build_parser_pool_from_settings() -> None:
+    """Factory: 0 worker -> None; altrimenti soglia e timeout da config."""
+    assert build_parser_pool(Settings(scraper_parser_pool_workers=0)) is None
+    parser_pool = build_parser_pool(
+        Settings(scraper_parser_pool_workers=2, scraper_parser_pool_inline_threshold_bytes=10)
+    )
+    assert parser_pool is not None
+    assert (parser_pool.max_workers, parser_pool.inline_threshold_bytes) == (2, 10)
@@ -0,0 +1,123 @@
+"""Test dedupe della pipeline: impronta stabile sui campi canonici, insieme limitato (LRU + TTL), tier Redis."""
+
+from prometheus_client import REGISTRY
+
+from app.cache.redis_client import RedisCacheClient
+from app.infrastructure.scraper.dedupe import DIGEST_SIZE, REDIS_KEY_PREFIX, SeenSet, fingerprint
+from app.infrastructure.scraper.engine import ScraperEngine
+from app.infrastructure.scraper.http_client import HttpClient
+from app.infrastructure.scraper.pipeline import ScraperPipeline
+from app.infrastructure.scraper.spiders.meta_title_spider import MetaTitleSpider
+
+RECORD = {"source": "landing", "url": "https://Shop.example.com:443/?b=2&a=1", "title": "Saldi", "description": "-40%"}
+
+
+def _redis(mocker, store: dict):
+    """RedisCacheClient finto: add() con semantica SET NX sul dict condiviso."""
+    client = mocker.Mock(spec=RedisCacheClient)
+
+    def add(key: str, value: str, ttl_seconds: int = 0) -> bool:
+        if key in store:
+            return False
+        store[key] = value
+        return True
+
+    client.add.side_effect = add
+    return client
+
+
+def test_fingerprint_ignores_volatile_fields_and_url_form() -> None:
+    """Stesso contenuto con timestamp diversi e url equivalente -> stessa impronta di DIGEST_SIZE byte."""
+    first = fingerprint({**RECORD, "collected_at": "2026-01-01T00:00:00", "fetched_at": "x"})
+    second = fingerprint({**RECORD, "url": "https://shop.example.com/?a=1&b=2", "collected_at": "2026-02-01"})
+    assert first == second
+    assert isinstance(first, bytes) and len(first) == DIGEST_SIZE
+    assert fingerprint({**RECORD, "title": "Altro"}) != first
+    assert fingerprint({**RECORD, "source": "meta"}) != first
+    assert fingerprint({"source": "landing", "data": {**RECORD, "source": None}}) == first
+
+
+def test_fingerprint_without_canonical_fields_uses_whole_record() -> None:
+    assert fingerprint({"source": "x", "price": 1}) != fingerprint({"source": "x", "price": 2})
+    assert fingerprint({"source": "x", "price": 1, "timestamp": 1}) == fingerprint({"source": "x", "price": 1})
+
+
+def test_pipeline_drops_duplicates_across_runs() -> None:
+    pipeline = ScraperPipeline()
+    assert pipeline.process({**RECORD, "collected_at": "t1"}) is not None
+    assert pipeline.process({**RECORD, "collected_at": "t2"}) is None
+    assert pipeline.process_batch([RECORD, {**RECORD, "title": "Nuovo"}]) == [{**RECORD, "title": "Nuovo"}]
+
+
+def test_seen_set_is_bounded_lru() -> None:
+    """Oltre max_entries escono le impronte meno recenti: memoria costante con scraping continuo."""
+    seen = SeenSet(max_entries=2)
+    a, b, c = (fingerprint({**RECORD, "title": title}) for title in "abc")
+    assert not seen.check_and_add(a)
+    assert not seen.check_and_add(b)
+    assert seen.check_and_add(a)  # a diventa la più recente
+    assert not seen.check_and_add(c)  # esce b
+    assert len(seen) == 2
+    assert seen.check_and_add(a)
+    assert not seen.check_and_add(b)
+
+
+def test_seen_set_entries_expire_after_ttl() -> None:
+    now = [0.0]
+    seen = SeenSet(ttl_seconds=10, clock=lambda: now[0])
+    digest = fingerprint(RECORD)
+    assert not seen.check_and_add(digest)
+    now[0] = 9.0
+    assert seen.check_and_add(digest)
+    now[0] = 11.0
+    assert not seen.check_and_add(digest)
+
+
+def test_redis_tier_shared_between_replicas(mocker) -> None:
+    """Due repliche (o un riavvio) con lo stesso Redis: il record visto da una è duplicato per l'altra."""
+    store: dict = {}
+    first = ScraperPipeline(SeenSet(redis_client=_redis(mocker, store)))
+    second = ScraperPipeline(SeenSet(redis_client=_redis(mocker, store)))
+    before = REGISTRY.get_sample_value("scraper_pipeline_dedupe_total", {"result": "duplicate", "tier": "redis"}) or 0.0
+    assert first.process(RECORD) is not None
+    assert second.process(RECORD) is None
+    assert list(store) == [REDIS_KEY_PREFIX + fingerprint(RECORD).hex()]
+    assert REGISTRY.get_sample_value(
+        "scraper_pipeline_dedupe_total", {"result": "duplicate", "tier": "redis"}
+    ) == before + 1
+
+
+def test_redis_unavailable_falls_back_to_memory(mocker) -> None:
+    client = mocker.Mock(spec=RedisCacheClient)
+    client.add.return_value = None
+    pipeline = ScraperPipeline(SeenSet(redis_client=client))
+    assert pipeline.process(RECORD) is not None
+    assert pipeline.process(RECORD) is None
+
+
+def test_engine_shares_injected_pipeline(mocker) -> None:
+    """Due engine con la stessa pipeline: il secondo run non ripete i record del primo."""
+    http_client = mocker.Mock(spec=HttpClient)
+    http_client.get.return_value = "<html><head><title>Offerta</title></head></html>"
+    pipeline = ScraperPipeline()
+    engines = [ScraperEngine(http_client, pipeline=pipeline) for _ in range(2)]
+    for engine in engines:
+        engine.register_spider(MetaTitleSpider(http_client))
+    assert len(engines[0].run("https://shop.example.com/")) == 1
+    assert engines[1].run("https://shop.example.com/") == []
+
+
+def test_fingerprint_ignores_unknown_ad_id_and_uses_ad_intelligence() -> None:
+    """Record MetaSpider in modalità singola senza ad_id: si distinguono per copy_text, creative_url e start_date."""
+
+    def meta(**intelligence) -> dict:
+        ad = {"ad_id": "unknown", "copy_text": "Saldi", "creative_url": None, "start_date": "2026-01-01", **intelligence}
+        return {"source": "MetaSpider", "data": {"ad_intelligence": ad, "json_blocks_found": 1}}
+
+    assert fingerprint(meta()) == fingerprint(meta())
+    assert fingerprint(meta(copy_text="Nuovi arrivi")) != fingerprint(meta())
+    assert fingerprint(meta(creative_url="https://cdn.example.com/a.jpg")) != fingerprint(meta())
+    assert fingerprint(meta(start_date="2026-02-01")) != fingerprint(meta())
+    assert fingerprint(meta(ad_id="123")) != fingerprint(meta())
+    pipeline = ScraperPipeline()
+    assert pipeline.process_batch([meta(), meta(copy_text="Altro")]) == [meta(), meta(copy_text="Altro")]
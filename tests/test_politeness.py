@@ -0,0 +1,58 @@
+"""Test HostPoliteness: distanziamento per-host senza attese tra host diversi."""
+
+import asyncio
+import time
+
+from app.infrastructure.scraper.politeness import HostPoliteness
+
+
+class FakeClock:
+    """Orologio controllabile per test deterministici."""
+
+    def __init__(self) -> None:
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_first_request_per_host_has_no_delay() -> None:
+    """Host diversi partono subito: nessuna attesa alla prima richiesta."""
+    politeness = HostPoliteness(min_gap=2.0, max_gap=2.0, clock=FakeClock())
+    assert politeness.reserve("https://a.example.com/1") == 0
+    assert politeness.reserve("https://b.example.com/1") == 0
+    assert politeness.reserve("https://c.example.com/1") == 0
+
+
+def test_same_host_requests_are_spaced_by_gap() -> None:
+    """Richieste consecutive allo stesso host: slot distanziati del gap minimo."""
+    clock = FakeClock()
+    politeness = HostPoliteness(min_gap=2.0, max_gap=2.0, clock=clock)
+    assert politeness.reserve("https://a.example.com/1") == 0
+    assert politeness.reserve("https://a.example.com/2") == 2.0
+    assert politeness.reserve("https://A.example.com/3") == 4.0
+    clock.now += 10
+    assert politeness.reserve("https://a.example.com/4") == 0
+
+
+def test_host_specific_gap_overrides_default() -> None:
+    """set_host_gap: gap personalizzato solo per l'host indicato."""
+    politeness = HostPoliteness(min_gap=1.0, max_gap=1.0, clock=FakeClock())
+    politeness.set_host_gap("slow.example.com", 5.0)
+    politeness.reserve("https://slow.example.com/")
+    politeness.reserve("https://fast.example.com/")
+    assert politeness.reserve("https://slow.example.com/") == 5.0
+    assert politeness.reserve("https://fast.example.com/") == 1.0
+
+
+def test_async_wait_does_not_delay_other_hosts() -> None:
+    """wait() su host diversi in parallelo: il tempo totale non somma i gap."""
+    politeness = HostPoliteness(min_gap=0.2, max_gap=0.2)
+
+    async def run() -> None:
+        urls = [f"https://host{i}.example.com/" for i in range(10)]
+        await asyncio.gather(*(politeness.wait(u) for u in urls))
+
+    start = time.monotonic()
+    asyncio.run(run())
+    assert time.monotonic() - start < 0.2
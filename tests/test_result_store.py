@@ -0,0 +1,102 @@
+"""Test ResultStore: ring limitato, spill su segmenti NDJSON gzip, lettura a cursore e ripresa dopo riavvio."""
+
+import gzip
+import json
+
+import pytest
+from prometheus_client import REGISTRY
+
+from app.infrastructure.scraper.result_store import SEGMENT_GLOB, SEQ_FILE, SEQ_RESERVE, ResultStore
+
+
+def _fill(store: ResultStore, count: int) -> None:
+    for index in range(1, count + 1):
+        store.add({"n": index})
+
+
+def test_ring_keeps_last_capacity_results() -> None:
+    """Senza spill: in memoria solo gli ultimi capacity risultati; seq continua a crescere."""
+    store = ResultStore(capacity=3, name="test_ring")
+    before = REGISTRY.get_sample_value(
+        "scraper_result_store_evicted_total", {"store": "test_ring", "outcome": "dropped"}
+    ) or 0.0
+    assert store.add(None) is None
+    _fill(store, 5)
+    assert store.all() == [{"n": 3}, {"n": 4}, {"n": 5}]
+    assert len(store) == 3
+    assert store.last_seq == 5
+    assert REGISTRY.get_sample_value(
+        "scraper_result_store_evicted_total", {"store": "test_ring", "outcome": "dropped"}
+    ) == before + 2
+
+
+def test_cursor_reads_across_segments_pending_and_ring(tmp_path) -> None:
+    """Con spill: tutti i risultati leggibili in ordine a pagine, dai segmenti gzip fino al ring."""
+    store = ResultStore(capacity=4, spill_dir=tmp_path, spill_batch=3, segment_records=5)
+    _fill(store, 20)
+    assert len(store.all()) == 4
+    assert len(store) == 20
+    seen, after = [], 0
+    while page := store.read(after, limit=7):
+        seen.extend(page)
+        after = page[-1][0]
+    assert [seq for seq, _ in seen] == list(range(1, 21))
+    assert [data["n"] for _, data in seen] == list(range(1, 21))
+    assert store.read(12, limit=2) == [(13, {"n": 13}), (14, {"n": 14})]
+    segments = sorted(tmp_path.glob("results-*.ndjson.gz"))
+    assert [path.name for path in segments] == ["results-000000000001.ndjson.gz", "results-000000000006.ndjson.gz",
+                                                "results-000000000011.ndjson.gz"]
+    with gzip.open(segments[0], "rt", encoding="utf-8") as fh:
+        assert json.loads(fh.readline()) == {"seq": 1, "data": {"n": 1}}
+
+
+def test_max_segments_bounds_disk(tmp_path) -> None:
+    store = ResultStore(capacity=2, spill_dir=tmp_path, spill_batch=2, segment_records=2, max_segments=2)
+    _fill(store, 12)
+    assert len(list(tmp_path.glob("results-*.ndjson.gz"))) == 2
+    assert [seq for seq, _ in store.read(0, limit=100)] == list(range(7, 13))
+
+
+def test_restart_resumes_segments_and_sequence(tmp_path) -> None:
+    """Dopo un riavvio i segmenti su disco restano leggibili e i nuovi seq proseguono."""
+    store = ResultStore(capacity=2, spill_dir=tmp_path, spill_batch=2, segment_records=4)
+    _fill(store, 9)
+    store.flush()
+    restarted = ResultStore(capacity=2, spill_dir=tmp_path, spill_batch=2, segment_records=4)
+    assert [seq for seq, _ in restarted.read(0, limit=100)] == list(range(1, 8))
+    # 8 e 9 erano solo nel ring (persi senza close): i loro seq non sono riassegnati
+    assert restarted.add({"n": 10}) > 9
+
+
+def test_close_persists_ring_and_exact_sequence(tmp_path) -> None:
+    """close() allo shutdown: ring e blocco in attesa su disco, dopo il riavvio i seq proseguono senza salti."""
+    store = ResultStore(capacity=3, spill_dir=tmp_path, spill_batch=4, segment_records=4)
+    _fill(store, 6)
+    store.close()
+    restarted = ResultStore(capacity=3, spill_dir=tmp_path, spill_batch=4, segment_records=4)
+    assert restarted.read(0, limit=100) == [(seq, {"n": seq}) for seq in range(1, 7)]
+    assert restarted.add({"n": 7}) == 7
+
+
+def test_seq_mark_reserved_in_blocks(tmp_path) -> None:
+    """L'high-water mark è scritto una volta ogni SEQ_RESERVE seq, non a ogni add."""
+    store = ResultStore(capacity=10, spill_dir=tmp_path)
+    store.add({"n": 1})
+    assert (tmp_path / SEQ_FILE).read_text() == str(SEQ_RESERVE)
+    _fill(store, SEQ_RESERVE)
+    assert (tmp_path / SEQ_FILE).read_text() == str(2 * SEQ_RESERVE)
+    assert ResultStore(capacity=10, spill_dir=tmp_path).add({"n": 0}) == 2 * SEQ_RESERVE + 1
+
+
+def test_clear_removes_segments_but_keeps_numbering(tmp_path) -> None:
+    store = ResultStore(capacity=1, spill_dir=tmp_path, spill_batch=1)
+    _fill(store, 3)
+    store.clear()
+    assert store.read(0) == [] and not list(tmp_path.glob(SEGMENT_GLOB))
+    assert store.add({"n": 4}) == 4
+    assert ResultStore(capacity=1, spill_dir=tmp_path).add({"n": 5}) > 4
+
+
+def test_invalid_capacity() -> None:
+    with pytest.raises(ValueError):
+        ResultStore(capacity=0)
@@ -0,0 +1,135 @@
+"""Test spider dichiarativi: selettori CSS/XPath compilati una volta, una visita dell'albero, output AdSchema."""
+
+from pathlib import Path
+
+import pytest
+import soupsieve
+from bs4 import BeautifulSoup
+
+from app.infrastructure.scraper import selector_spider
+from app.infrastructure.scraper.http_client import HttpClient
+from app.infrastructure.scraper.selector_spider import SelectorSpider, compile_selector, css, xpath
+from app.infrastructure.scraper.spiders.open_graph_spider import OpenGraphSpider
+from app.services.scraper_service import ScraperService
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures" / "html"
+
+
+class AdCardSpider(SelectorSpider):
+    source = "ad_cards"
+    selectors = {
+        "title": css(".ad-card .ad-advertiser"),
+        "description": css("p.ad-copy"),
+        "landing_url": css("a.ad-cta", attr="href"),
+    }
+
+
+class LandingXPathSpider(SelectorSpider):
+    source = "landing"
+    selectors = {
+        "title": xpath("//h1[contains(@class, 'hero-title')]"),
+        "description": xpath("//p[contains(@class, 'hero-copy')]/text()"),
+        "landing_url": xpath("//a[contains(@class, 'cta')]", attr="href"),
+        "creative_url": xpath("//img[@class='missing']/@src"),
+    }
+
+
+def _fixture(name: str) -> str:
+    return (FIXTURES_DIR / name).read_text(encoding="utf-8")
+
+
+@pytest.mark.parametrize("spider_class", [AdCardSpider, LandingXPathSpider])
+def test_css_and_xpath_spiders_map_onto_ad_schema(mocker, spider_class) -> None:
+    """Primo match per campo in ordine di documento; testo normalizzato; finalize -> dict AdSchema."""
+    page = "ad_listing.html" if spider_class is AdCardSpider else "landing.html"
+    result = spider_class(mocker.Mock(spec=HttpClient)).process(_fixture(page), "https://shop.example.com/estate")
+    assert set(result) == {"source", "title", "description", "landing_url", "creative_url", "collected_at"}
+    if spider_class is AdCardSpider:
+        assert result["title"] == "Brand Uno"
+        assert result["description"] == "Nuova collezione & saldi: fino al -40%!"
+        assert result["landing_url"] == "https://uno.example.com/?utm_source=ads"
+    else:
+        assert result["title"] == "Scarpe da corsa leggere"
+        assert result["description"] == "Corri di più, spendi meno."
+        assert result["landing_url"] == "https://shop.example.com/compra"
+        assert result["creative_url"] is None
+
+
+def test_css_matches_select_one(mocker) -> None:
+    """La visita unica restituisce gli stessi elementi di select_one per ogni selettore."""
+    html = _fixture("ad_listing.html")
+    soup = BeautifulSoup(html, "lxml")
+    found = AdCardSpider(mocker.Mock(spec=HttpClient)).parse(html)
+    assert found["title"] == soup.select_one(".ad-card .ad-advertiser").get_text(strip=True)
+    assert found["landing_url"] == soup.select_one("a.ad-cta")["href"]
+
+
+def test_one_tree_per_response(mocker) -> None:
+    """Tutti i campi valutati sullo stesso albero: un solo parsing per risposta."""
+    spy = mocker.spy(selector_spider, "BeautifulSoup")
+    html = _fixture("ad_listing.html")
+    assert AdCardSpider(mocker.Mock(spec=HttpClient)).parse(html)["title"] == "Brand Uno"
+    assert spy.call_count == 1
+
+
+def test_selectors_compiled_once_per_process(mocker) -> None:
+    """Compilazione alla definizione della classe e in cache: parse() non ricompila."""
+    spy = mocker.spy(soupsieve, "compile")
+    AdCardSpider(mocker.Mock(spec=HttpClient)).parse(_fixture("ad_listing.html"))
+    assert spy.call_count == 0
+    assert compile_selector("css", "p.ad-copy") is compile_selector("css", "p.ad-copy")
+
+
+def test_invalid_declarations_fail_at_class_definition() -> None:
+    """Campo non AdSchema o linguaggi misti -> ValueError quando la classe viene definita."""
+    with pytest.raises(ValueError):
+        type("Bad", (SelectorSpider,), {"selectors": {"price": css(".price")}})
+    with pytest.raises(ValueError):
+        type("Mixed", (SelectorSpider,), {"selectors": {"title": css("h1"), "description": xpath("//p")}})
+
+
+def test_open_graph_spider_registered_in_service(mocker) -> None:
+    """Spider 'opengraph' nel registry: og:* e meta description, landing_url dal canonical."""
+    http_client = mocker.Mock(spec=HttpClient)
+    http_client.get.return_value = _fixture("landing.html")
+    result = ScraperService(http_client).scrape("opengraph", "https://shop.example.com/estate?ref=1")
+    assert result["source"] == "opengraph"
+    assert result["title"] == "Offerta Estate 2026"
+    assert result["description"] == "Sconti fino al 50% sulle scarpe da corsa. Spedizione gratuita."
+    assert result["landing_url"] == "https://shop.example.com/estate"
+    assert result["creative_url"] == "https://cdn.example.com/img/hero.jpg"
+    assert isinstance(OpenGraphSpider(http_client).parse("<html></html>"), dict)
+
+
+FALLBACK_FIRST = """<html><head>
+<link rel="canonical" href="https://shop.example.com/c">
+<meta name="description" content="Generic description">
+<meta property="og:description" content="Og description">
+<meta property="og:url" content="https://shop.example.com/og">
+</head></html>"""
+
+
+def test_alternatives_follow_priority_not_document_order(mocker) -> None:
+    """og:* dopo meta description e link canonical nel documento: vincono comunque i valori og."""
+    result = OpenGraphSpider(mocker.Mock(spec=HttpClient)).parse(FALLBACK_FIRST)
+    assert result["description"] == "Og description"
+    assert result["landing_url"] == "https://shop.example.com/og"
+    only_fallbacks = OpenGraphSpider(mocker.Mock(spec=HttpClient)).parse(
+        '<html><head><meta name="description" content="Generic"><link rel="canonical" href="/c"></head></html>'
+    )
+    assert only_fallbacks["description"] == "Generic" and only_fallbacks["landing_url"] == "/c"
+
+
+def test_css_alternatives_follow_priority_in_single_visit(mocker) -> None:
+    class OgCssSpider(SelectorSpider):
+        selectors = {
+            "description": css(["meta[property='og:description']", "meta[name='description']"], attr="content"),
+            "landing_url": css(["meta[property='og:url']", "link[rel='canonical']"], attr="content"),
+        }
+
+    found = OgCssSpider(mocker.Mock(spec=HttpClient)).parse(FALLBACK_FIRST)
+    assert found["description"] == "Og description"
+    assert found["landing_url"] == "https://shop.example.com/og"
+    assert OgCssSpider(mocker.Mock(spec=HttpClient)).parse(
+        '<html><head><meta name="description" content="Generic"></head></html>'
+    )["description"] == "Generic"
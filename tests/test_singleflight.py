@@ -0,0 +1,118 @@
+"""Test SingleFlight: chiamate concorrenti identiche coalescenti in un'unica esecuzione."""
+
+import asyncio
+import threading
+import time
+
+from app.infrastructure.scraper.singleflight import SingleFlight
+from app.infrastructure.scraper.urls import canonical_url
+from app.services.scraper_service import ScraperService
+
+
+def test_concurrent_sync_calls_share_one_execution() -> None:
+    """Più thread con la stessa chiave: fn eseguita una volta, tutti ricevono il risultato."""
+    flight = SingleFlight()
+    calls = []
+
+    def fetch() -> dict:
+        calls.append(1)
+        time.sleep(0.1)
+        return {"title": "T"}
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(flight.do("k", fetch))) for _ in range(5)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(calls) == 1
+    assert results == [{"title": "T"}] * 5
+
+
+def test_async_calls_share_result_and_exception() -> None:
+    """Versione async: un'unica coroutine in volo; l'eccezione arriva a tutti i chiamanti."""
+    flight = SingleFlight()
+    calls = []
+
+    async def fetch() -> str:
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return "ok"
+
+    async def failing() -> str:
+        await asyncio.sleep(0.05)
+        raise RuntimeError("down")
+
+    async def run() -> None:
+        assert await asyncio.gather(*(flight.ado("a", fetch) for _ in range(4))) == ["ok"] * 4
+        outcomes = await asyncio.gather(*(flight.ado("b", failing) for _ in range(3)), return_exceptions=True)
+        assert all(isinstance(o, RuntimeError) for o in outcomes)
+
+    asyncio.run(run())
+    assert len(calls) == 1
+
+
+def test_cancelled_async_leader_hands_over_to_follower() -> None:
+    """Leader cancellato (es. client disconnesso): i follower non ricevono CancelledError, uno diventa leader."""
+    flight = SingleFlight()
+    calls = []
+
+    async def fetch() -> str:
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return "ok"
+
+    async def run() -> None:
+        leader = asyncio.create_task(flight.ado("a", fetch))
+        await asyncio.sleep(0)
+        followers = [asyncio.create_task(flight.ado("a", fetch)) for _ in range(3)]
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        assert await asyncio.gather(*followers) == ["ok"] * 3
+        assert leader.cancelled()
+
+    asyncio.run(run())
+    assert len(calls) == 2
+
+
+def test_cancelled_async_follower_does_not_cancel_leader() -> None:
+    flight = SingleFlight()
+
+    async def fetch() -> str:
+        await asyncio.sleep(0.05)
+        return "ok"
+
+    async def run() -> None:
+        leader = asyncio.create_task(flight.ado("a", fetch))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(flight.ado("a", fetch))
+        await asyncio.sleep(0.01)
+        follower.cancel()
+        assert await leader == "ok"
+        assert follower.cancelled()
+
+    asyncio.run(run())
+
+
+def test_canonical_url_normalizes_equivalent_urls() -> None:
+    """Url equivalenti (case host, porta default, fragment, ordine query) -> stessa chiave."""
+    assert canonical_url("HTTPS://Example.com:443?b=2&a=1#top") == canonical_url("https://example.com/?a=1&b=2")
+
+
+def test_scraper_service_coalesces_identical_scrapes(mocker) -> None:
+    """ScraperService.scrape: stessa (spider, url) in parallelo -> una sola run dello spider."""
+    service = ScraperService(http_client=mocker.Mock(), singleflight=SingleFlight())
+    started = []
+
+    def slow_run(self, url):
+        started.append(url)
+        time.sleep(0.1)
+        return {"title": "T", "url": url}
+
+    mocker.patch("app.infrastructure.scraper.spiders.meta_title_spider.MetaTitleSpider.run", slow_run)
+    threads = [threading.Thread(target=service.scrape, args=("meta", "https://x.example.com/#a")) for _ in range(3)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(started) == 1
@@ -0,0 +1,181 @@
+"""Test pipeline a stadi: code limitate con backpressure, worker per stage, errori isolati, ScraperEngine.run_many,
+job schedulati 'title'."""
+
+import threading
+import time
+
+import pytest
+from prometheus_client import REGISTRY
+
+from app.infrastructure.scraper.engine import ScraperEngine
+from app.infrastructure.scraper.http_client import FetchResult, HttpClient
+from app.infrastructure.scraper.spiders.meta_title_spider import MetaTitleSpider
+from app.infrastructure.scraper.spiders.title_spider import TitleSpider
+from app.infrastructure.scraper.staged_pipeline import Stage, StagedPipeline
+from app.services.scheduled_scraper_service import ScheduledScraperService
+
+URLS = [f"https://shop{index}.example.com/" for index in range(5)]
+
+
+def _page(url: str, head_only: bool = False) -> str:
+    return f"<html><head><title>{url}</title><meta name='description' content='Saldi'></head></html>"
+
+
+def test_stages_in_order_with_drops_and_errors() -> None:
+    """None scarta l'elemento, un'eccezione lo scarta senza fermare la pipeline (metrica error)."""
+
+    def check(item: int) -> int:
+        if item == 6:
+            raise RuntimeError("boom")
+        return item
+
+    stages = [
+        Stage("test_double", lambda item: item * 2, workers=2),
+        Stage("test_check", check),
+        Stage("test_odd", lambda item: item if item % 4 else None),
+    ]
+    before = REGISTRY.get_sample_value("scraper_stage_items_total", {"stage": "test_double", "outcome": "ok"}) or 0.0
+    assert sorted(StagedPipeline(stages).run(range(1, 7))) == [2, 10]
+    assert REGISTRY.get_sample_value("scraper_stage_items_total", {"stage": "test_double", "outcome": "ok"}) == before + 6
+    assert REGISTRY.get_sample_value("scraper_stage_items_total", {"stage": "test_check", "outcome": "error"}) >= 1
+    assert REGISTRY.get_sample_value("scraper_stage_items_total", {"stage": "test_odd", "outcome": "dropped"}) >= 3
+
+
+def test_backpressure_bounds_items_in_flight() -> None:
+    """Stage finale lento e code da 1: il produttore si ferma, in volo al più worker + code (non tutti gli elementi)."""
+    lock = threading.Lock()
+    in_flight = [0, 0]  # corrente, massimo
+
+    def enter(item: int) -> int:
+        with lock:
+            in_flight[0] += 1
+            in_flight[1] = max(in_flight[1], in_flight[0])
+        return item
+
+    def slow_exit(item: int) -> int:
+        time.sleep(0.01)
+        with lock:
+            in_flight[0] -= 1
+        return item
+
+    stages = [Stage("test_enter", enter, queue_size=1), Stage("test_slow", slow_exit, queue_size=1)]
+    assert len(StagedPipeline(stages).run(range(30))) == 30
+    assert in_flight[1] <= 3  # enter in corso (già contato) + coda dello stage lento + worker dello stage lento
+
+
+def test_workers_per_stage_run_in_parallel() -> None:
+    stages = [Stage("test_sleep", lambda item: time.sleep(0.1) or item, workers=4)]
+    started = time.perf_counter()
+    assert sorted(StagedPipeline(stages).run(range(4))) == [0, 1, 2, 3]
+    assert time.perf_counter() - started < 0.3
+
+
+class _Abort(BaseException):
+    """BaseException non Exception (come KeyboardInterrupt/SystemExit) sollevata da uno stage."""
+
+
+@pytest.mark.filterwarnings("ignore::pytest.PytestUnhandledThreadExceptionWarning")
+def test_base_exception_in_stage_does_not_hang_join() -> None:
+    """Worker terminato da una BaseException: lo stage si chiude, produttore e join() non restano bloccati."""
+
+    def abort_on_two(item: int) -> int:
+        if item == 2:
+            raise _Abort()
+        return item
+
+    stages = [Stage("test_abort", abort_on_two, queue_size=1), Stage("test_after", lambda item: item, queue_size=1)]
+    results: list = []
+    runner = threading.Thread(target=lambda: results.extend(StagedPipeline(stages).run(range(20))), daemon=True)
+    runner.start()
+    runner.join(timeout=2)
+    assert not runner.is_alive()
+    assert sorted(results) == [0, 1]
+
+
+def test_empty_stage_list_rejected() -> None:
+    with pytest.raises(ValueError):
+        StagedPipeline([])
+
+
+def test_run_many_matches_run_per_url(mocker) -> None:
+    """Stessi risultati di run() url per url (una fetch per url), salvati nel result_store e passati a persist."""
+    http_client = mocker.Mock(spec=HttpClient)
+    http_client.get.side_effect = _page
+    staged, serial = ScraperEngine(http_client), ScraperEngine(http_client)
+    for engine in (staged, serial):
+        engine.register_spider(TitleSpider(http_client))
+        engine.register_spider(MetaTitleSpider(http_client))
+    persisted: list = []
+    results = staged.run_many(URLS, persist=persisted.append)
+    expected = [result for url in URLS for result in serial.run(url)]
+    strip = lambda items: sorted((r["source"], r["data"]["title"]) for r in items)  # noqa: E731
+    assert strip(results) == strip(expected)
+    assert len(results) == 2 * len(URLS)
+    assert persisted == results
+    assert staged.result_store.all() == results
+    assert staged.last_run_fetches == len(URLS)
+
+
+def test_slow_persist_does_not_stall_fetches(mocker) -> None:
+    """Il primo salvataggio attende che tutte le fetch siano avvenute: le fetch non aspettano il persist."""
+    all_fetched = threading.Event()
+    calls = []
+
+    def get(url: str, head_only: bool = False) -> str:
+        calls.append(url)
+        if len(calls) == len(URLS):
+            all_fetched.set()
+        return _page(url)
+
+    def persist(result: dict) -> None:
+        assert all_fetched.wait(timeout=2)
+
+    http_client = mocker.Mock(spec=HttpClient)
+    http_client.get.side_effect = get
+    engine = ScraperEngine(http_client, stage_workers={"fetch": 1})
+    engine.register_spider(MetaTitleSpider(http_client))
+    assert len(engine.run_many(URLS, persist=persist)) == len(URLS)
+    assert all_fetched.is_set()
+
+
+def test_spider_error_in_parse_stage_excluded(mocker) -> None:
+    class BrokenSpider(TitleSpider):
+        def parse(self, response: str):
+            raise RuntimeError("broken selector")
+
+    http_client = mocker.Mock(spec=HttpClient)
+    http_client.get.side_effect = _page
+    engine = ScraperEngine(http_client)
+    engine.register_spider(BrokenSpider(http_client))
+    engine.register_spider(MetaTitleSpider(http_client))
+    assert len(engine.run_many(URLS[:2])) == 2
+    assert engine.last_run_errors["BrokenSpider"].startswith("error: RuntimeError")
+
+
+def test_scheduled_title_jobs_run_through_pipeline(mocker) -> None:
+    """I job schedulati accodano l'url: il primo save_ad attende tutte le fetch, risultati nel collector,
+    pagine non cambiate (304) saltate."""
+    all_fetched = threading.Event()
+    calls = []
+
+    def fetch(url: str, head_only: bool = False) -> FetchResult:
+        calls.append(url)
+        if len(calls) == len(URLS):
+            all_fetched.set()
+        return FetchResult(text=_page(url), status_code=304 if url == URLS[0] else 200, not_modified=url == URLS[0])
+
+    def save_ad(db, ad_data) -> None:
+        assert all_fetched.wait(timeout=2)
+
+    save_ad = mocker.patch("app.services.scraper_service.AdRepository.save_ad", side_effect=save_ad)
+    http_client = mocker.Mock(spec=HttpClient)
+    http_client.fetch.side_effect = fetch
+    service = ScheduledScraperService(http_client)
+    start = mocker.patch.object(service._scheduler, "start")
+    for url in URLS:
+        service.start_title_scraping(url, interval_seconds=60)
+    for call in start.call_args_list:
+        call.args[1]()
+    service.close()
+    assert sorted(result["url"] for result in service.collector.all()) == URLS[1:]
+    assert save_ad.call_count == len(URLS) - 1
@@ -0,0 +1,62 @@
+"""Test fetch in streaming: stop a </head> per spider head-only e limite sulla dimensione del corpo."""
+
+import asyncio
+
+import httpx
+import requests_mock
+
+from app.infrastructure.scraper.async_http_client import AsyncHttpClient
+from app.infrastructure.scraper.http_client import HttpClient
+from app.infrastructure.scraper.politeness import HostPoliteness
+from app.infrastructure.scraper.spiders.title_spider import TitleSpider
+from app.infrastructure.scraper.streaming import BodyAccumulator
+
+HEAD = '<html><head><title>Landing</title><meta name="description" content="Desc"></head>'
+PAGE = HEAD + "<body>" + "x" * 200_000 + "</body></html>"
+
+
+def _client(**kwargs) -> HttpClient:
+    client = HttpClient(**kwargs)
+    client.session.politeness = HostPoliteness(min_gap=0.0, max_gap=0.0)
+    return client
+
+
+def test_accumulator_finds_head_end_split_across_chunks() -> None:
+    """</head> spezzato tra due chunk: il corpo termina esattamente dopo il tag."""
+    accumulator = BodyAccumulator(head_only=True)
+    assert accumulator.feed(b"<html><head><title>t</title></HE") is False
+    assert accumulator.feed(b"AD><body>rest") is True
+    assert accumulator.body() == b"<html><head><title>t</title></HEAD>"
+
+
+def test_head_only_fetch_stops_at_head_end() -> None:
+    """head_only=True: testo restituito solo fino a </head>."""
+    with requests_mock.Mocker() as m:
+        m.get("https://stream.example.com/", text=PAGE)
+        text = _client().get("https://stream.example.com/", head_only=True)
+    assert text == HEAD
+
+
+def test_full_fetch_is_capped_at_max_body_bytes() -> None:
+    """Corpo oltre max_body_bytes: troncato al limite configurato."""
+    with requests_mock.Mocker() as m:
+        m.get("https://stream.example.com/big", text=PAGE)
+        text = _client(max_body_bytes=1000).get("https://stream.example.com/big")
+    assert len(text) == 1000
+
+
+def test_title_spider_run_uses_head_only_fetch() -> None:
+    """TitleSpider dichiara head_only: parse corretto sull'HTML parziale."""
+    with requests_mock.Mocker() as m:
+        m.get("https://stream.example.com/landing", text=PAGE)
+        result = TitleSpider(_client()).run("https://stream.example.com/landing")
+    assert result.data == {"title": "Landing", "meta_description": "Desc"}
+
+
+def test_async_head_only_fetch_stops_at_head_end() -> None:
+    """AsyncHttpClient: stessa terminazione anticipata su stream httpx."""
+    client = AsyncHttpClient(
+        transport=httpx.MockTransport(lambda r: httpx.Response(200, text=PAGE)),
+        politeness=HostPoliteness(min_gap=0.0, max_gap=0.0),
+    )
+    assert asyncio.run(client.get("https://stream.example.com/", head_only=True)) == HEAD
@@ -0,0 +1,68 @@
+"""Test normalizzazione del copy: parità con la pulizia storica a tre passate, NFC, vista minuscola, batch."""
+
+import random
+import re
+
+import pytest
+
+from app.core.text_normalization import EMPTY, normalize_copy, normalize_many, normalize_text
+from app.services.intelligence.intelligence_engine import IntelligenceEngine
+
+_LEGACY_EMOJI = re.compile(
+    r"[\U0001F300-\U0001F9FF\U0001F600-\U0001F64F\U0001F680-\U0001F6FF\U0001F1E0-\U0001F1FF\U00002600-\U000026FF\U00002700-\U000027BF]+"
+)
+
+
+def _legacy_clean(text: str) -> str:
+    """Pulizia storica di meta_spider (spazi, emoji con callback, di nuovo spazi)."""
+    cleaned = re.sub(r"\s+", " ", text).strip()
+    cleaned = _LEGACY_EMOJI.sub(lambda m: " " if len(m.group()) > 2 else m.group(), cleaned)
+    return re.sub(r"\s+", " ", cleaned).strip()
+
+
+ALPHABET = ["a", "B", "é", " ", "  ", "\n", "\t", " ", "😀", "🔥", "☀", "✅", ".", "!"]
+
+
+@pytest.mark.parametrize("seed", range(200))
+def test_matches_legacy_three_pass_cleaning(seed: int) -> None:
+    """Su stringhe casuali di spazi ed emoji (già NFC) il risultato coincide con la pulizia storica."""
+    rng = random.Random(seed)
+    text = "".join(rng.choice(ALPHABET) for _ in range(rng.randint(0, 40)))
+    assert normalize_text(text) == _legacy_clean(text)
+
+
+def test_emoji_runs_and_whitespace() -> None:
+    """1–2 emoji mantenute, 3+ ridotte a uno spazio; spazi multipli collassati."""
+    assert normalize_text("  Saldi 🔥🔥  oggi\n\n😀😀😀😀 solo ") == "Saldi 🔥🔥 oggi solo"
+    assert normalize_text("😀😀😀") == ""
+    assert normalize_text(None) == "" and normalize_text(123) == ""  # type: ignore[arg-type]
+
+
+def test_unicode_nfc_and_lower_view() -> None:
+    """Forme decomposte ricomposte (NFC); lower calcolata sul testo normalizzato."""
+    decomposed = "Cafe\u0301   OFFERTA"
+    normalized = normalize_copy(decomposed)
+    assert normalized.text == "Caf\u00e9 OFFERTA"
+    assert normalized.lower == "caf\u00e9 offerta"
+    assert normalize_copy("") is EMPTY
+
+
+def test_normalize_many_preserves_order_and_reuses_repeats() -> None:
+    """Stesso ordine dell'input; testi ripetuti condividono lo stesso risultato; None -> vuoto."""
+    results = normalize_many(["  A  b ", None, "C", "  A  b "])
+    assert [r.text for r in results] == ["A b", "", "C", "A b"]
+    assert results[0] is results[3]
+
+
+def test_intelligence_uses_normalized_lower_view() -> None:
+    """evaluate_many coincide con evaluate per elemento; parole chiave trovate anche oltre a spazi/maiuscole."""
+    engine = IntelligenceEngine()
+    items = [
+        {"ad_copy": "FREE\n\nshipping, BUY now"},
+        {"ad_copy": "Our Story and Mission"},
+        {"ad_copy": None},
+        {"ad_copy": "FREE\n\nshipping, BUY now"},
+    ]
+    batch = engine.evaluate_many(items)
+    assert batch == [engine.evaluate(item) for item in items]
+    assert [r["creative_type"] for r in batch] == ["direct_response", "branding", "unknown", "direct_response"]
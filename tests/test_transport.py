@@ -0,0 +1,116 @@
+"""Test TransportRegistry: pool condiviso tra client, headers per richiesta senza stato condiviso."""
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+import requests_mock
+
+from app.infrastructure.http_client import HttpClient as BaseHttpClient
+from app.infrastructure.scraper.circuit_breaker import HostCircuitBreaker, RetryBudget
+from app.infrastructure.scraper.http_client import HttpClient, RealisticSession
+from app.infrastructure.scraper.politeness import HostPoliteness
+from app.infrastructure.scraper.transport import POOL_MAXSIZE_PER_HOST, TransportRegistry
+
+
+def test_sessions_share_the_same_adapter() -> None:
+    """Sessioni diverse (cookie separati) montano lo stesso HTTPAdapter del registry."""
+    registry = TransportRegistry(pool_maxsize_per_host=4)
+    first = registry.new_session()
+    second = registry.new_session()
+    assert first.get_adapter("https://a.example.com") is second.get_adapter("https://b.example.com")
+    assert first.cookies is not second.cookies
+    assert registry.adapter()._pool_maxsize == 4
+
+
+def test_session_close_does_not_close_shared_pools() -> None:
+    """Chiudere una sessione non svuota i pool usati dalle altre."""
+    registry = TransportRegistry()
+    session = registry.new_session()
+    adapter = registry.adapter()
+    adapter.poolmanager.connection_from_url("https://example.com/")
+    session.close()
+    assert len(adapter.poolmanager.pools) == 1
+
+
+def test_both_http_clients_use_default_transport() -> None:
+    """I due HttpClient condividono il trasporto di processo."""
+    scraper_client = HttpClient()
+    base_client = BaseHttpClient()
+    assert scraper_client.session.session.get_adapter("https://x.com") is base_client._session.get_adapter("https://x.com")
+
+
+def test_http_client_get_sends_custom_headers_without_mutating_session() -> None:
+    """Headers custom inviati per richiesta; gli headers della sessione restano invariati."""
+    client = HttpClient(headers={"X-Custom": "1"})
+    client.session.politeness = HostPoliteness(min_gap=0.0, max_gap=0.0)
+    before = dict(client.session.headers)
+    with requests_mock.Mocker() as m:
+        m.get("https://headers.example.com/", text="ok")
+        assert client.get("https://headers.example.com/") == "ok"
+        sent = m.request_history[0].headers
+    assert sent["X-Custom"] == "1"
+    assert sent["Accept-Language"] == "en-US,en;q=0.9"
+    assert client.session.headers == before
+    assert "X-Custom" not in client.session.session.headers
+
+
+class _StatusHandler(BaseHTTPRequestHandler):
+    """Risponde con lo status nel path (/404, /503, /200) e un corpo non letto dal client in caso di errore."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self) -> None:
+        status = int(self.path.strip("/"))
+        body = b"x" * 64_000
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+class _QuietServer(ThreadingHTTPServer):
+    def handle_error(self, request, client_address) -> None:
+        """Connessioni chiuse dal client senza leggere il corpo: attese, niente traceback."""
+
+
+@pytest.fixture
+def status_server():
+    server = _QuietServer(("127.0.0.1", 0), _StatusHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_error_responses_return_connections_to_pool(status_server) -> None:
+    """Più errori (404, 503 a retry esauriti) del limite di connessioni per host: la GET successiva non si blocca."""
+    registry = TransportRegistry(pool_maxsize_per_host=POOL_MAXSIZE_PER_HOST, pool_timeout=2.0)
+    session = RealisticSession(
+        politeness=HostPoliteness(min_gap=0.0, max_gap=0.0),
+        transport=registry,
+        circuit_breaker=HostCircuitBreaker(failure_threshold=1000),
+        retry_budget=RetryBudget(),
+    )
+    for status in [404] * (POOL_MAXSIZE_PER_HOST + 2) + [503] * 3:
+        with pytest.raises(requests.HTTPError):
+            session.fetch_with_retry(f"{status_server}/{status}", max_retries=1, stream=True)
+    response = session.fetch_with_retry(f"{status_server}/200", max_retries=1, stream=True)
+    assert response.status_code == 200
+    response.close()
+    registry.close()
+
+
+def test_exhausted_pool_raises_instead_of_blocking(status_server) -> None:
+    """Connessioni mai restituite: allo scadere di pool_timeout requests.ConnectionError, non un blocco infinito."""
+    registry = TransportRegistry(pool_maxsize_per_host=1, pool_timeout=0.2)
+    session = registry.new_session()
+    leaked = session.get(f"{status_server}/200", stream=True)
+    with pytest.raises(requests.ConnectionError):
+        session.get(f"{status_server}/200", stream=True)
+    leaked.close()